@@ -0,0 +1,290 @@
+"""
+Benchmarks for the renderer.
+
+Renders representative frames through the rendering.draw_* functions into an
+offscreen surface, on SDL's dummy video driver, so the suite runs on
+headless machines. Besides the time per call, every scenario reports what
+one call allocates once the caches are warm:
+
+    surfaces  pygame.Surface objects created
+    texts     Font.render() calls (text rendered outside the text cache)
+    sysfonts  pygame.font.SysFont() calls (each one is a system font lookup)
+    py        peak Python memory allocated during the call, in KiB
+
+A well-behaved draw function allocates no surfaces, texts or fonts per
+frame, so any non-zero count is worth a look.
+
+Usage:
+    python benchmarks/bench_rendering.py                 # full run, writes benchmarks/results/rendering.json
+    python benchmarks/bench_rendering.py --quick         # fewer samples
+    python benchmarks/bench_rendering.py --filter frame  # only the whole-frame scenarios
+"""
+import random
+import tracemalloc
+
+import harness
+from harness import Scenario
+
+import pygame
+import rendering
+from entities import TempWall
+from game import Level, Player, SpellCircle, create_levels
+from simulation import DEFAULT_WIZARDS, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Allocations are counted on a simulated 60 FPS clock, after enough frames to
+# bake every step of the pulsing effects (the attunement aura needs ~120 frames
+# to have shown every size/alpha pair it rounds to)
+FRAME_MS = 16
+ALLOCATION_WARMUP_FRAMES = 300
+ALLOCATION_CALLS = 60
+
+# Temporary walls on the busy level, in the square sizes Barrier spells raise at different powers
+BUSY_TEMP_WALLS = 100
+BARRIER_SIZES = (50, 60, 70, 80, 90)
+
+# Spells whose area of effect is drawn (one per effect size and color)
+EFFECT_SPELLS = ('Lava', 'Steam', 'Storm', 'Fireball', 'Teleport', 'Barrier')
+
+SEED = 1
+
+
+class AllocationCounter:
+    """
+    Counts the renderer's surface, text and font allocations while active.
+
+    Used as a context manager: pygame.Surface, pygame.font.SysFont and
+    rendering.get_font are swapped for counting versions on entry and put
+    back on exit.
+
+    Attributes:
+        surfaces (int): pygame.Surface objects created
+        texts (int): Font.render() calls
+        sysfonts (int): pygame.font.SysFont() calls
+    """
+
+    def __init__(self):
+        """Initialize zeroed counts."""
+        self.surfaces = 0
+        self.texts = 0
+        self.sysfonts = 0
+
+    def __enter__(self):
+        counter = self
+        self._originals = (pygame.Surface, pygame.font.SysFont, rendering.get_font)
+        surface_class, sys_font, get_font = self._originals
+
+        class CountingSurface(surface_class):
+            def __init__(self, *args, **kwargs):
+                counter.surfaces += 1
+                super().__init__(*args, **kwargs)
+
+        class CountingFont:
+            def __init__(self, font):
+                self.font = font
+
+            def render(self, *args, **kwargs):
+                counter.texts += 1
+                return self.font.render(*args, **kwargs)
+
+            def __getattr__(self, name):
+                return getattr(self.font, name)
+
+        def counting_sys_font(*args, **kwargs):
+            counter.sysfonts += 1
+            return sys_font(*args, **kwargs)
+
+        pygame.Surface = CountingSurface
+        pygame.font.SysFont = counting_sys_font
+        rendering.get_font = lambda name, size: CountingFont(get_font(name, size))
+        return self
+
+    def __exit__(self, *exc_info):
+        pygame.Surface, pygame.font.SysFont, rendering.get_font = self._originals
+        return False
+
+
+def measure_allocations(scenario, calls=ALLOCATION_CALLS):
+    """
+    Count what one call of a scenario allocates.
+
+    Args:
+        scenario (Scenario): The scenario
+        calls (int): Calls to average over
+
+    Returns:
+        dict: Average surfaces, texts and sysfonts per call, and the largest
+            peak of Python memory one call allocated (py_peak_kib)
+    """
+    if scenario.setup is None:
+        call = scenario.func
+    else:
+        state = scenario.setup()
+        call = lambda: scenario.func(state)
+
+    # Animations follow pygame.time.get_ticks(), so step it one frame per call
+    ticks = [0]
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: ticks[0]
+
+    peak = 0
+    try:
+        for _ in range(ALLOCATION_WARMUP_FRAMES):
+            call()
+            ticks[0] += FRAME_MS
+
+        tracemalloc.start()
+        with AllocationCounter() as counter:
+            for _ in range(calls):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                call()
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+                ticks[0] += FRAME_MS
+    finally:
+        tracemalloc.stop()
+        pygame.time.get_ticks = get_ticks
+
+    return {
+        'surfaces': counter.surfaces / calls,
+        'texts': counter.texts / calls,
+        'sysfonts': counter.sysfonts / calls,
+        'py_peak_kib': peak / 1024,
+    }
+
+
+def annotate(scenario, result):
+    """Add the allocation counts to a result (harness annotate hook)."""
+    allocations = result['allocations'] = measure_allocations(scenario)
+    return (f"   surfaces {allocations['surfaces']:g}  texts {allocations['texts']:g}"
+            f"  sysfonts {allocations['sysfonts']:g}  py {allocations['py_peak_kib']:.1f} KiB")
+
+
+def make_players():
+    """
+    Get the default wizards in a few drawing states.
+
+    Returns:
+        dict: State name -> Player
+    """
+    idle = Player(*DEFAULT_WIZARDS[0])
+
+    casting = Player(*DEFAULT_WIZARDS[1])
+    casting.start_cast()
+    for _ in range(60):
+        casting.update()
+
+    attuned = Player(*DEFAULT_WIZARDS[2])
+    attuned.start_attunement()
+    attuned.attune_with(id(idle))
+    return {'idle': idle, 'casting': casting, 'attuned': attuned}
+
+
+def make_spell_circles():
+    """
+    Get spell circles in a few drawing states.
+
+    Returns:
+        dict: State name -> SpellCircle
+    """
+    empty = SpellCircle()
+
+    charging = SpellCircle()
+    for element, charge in (("Fire", 60), ("Water", 80), ("Air", 100)):
+        charging.add_element(element, charge)
+
+    active = SpellCircle()
+    active.active_spell = 'Storm'
+    active.active_spell_power = 90
+    active.spell_effect_timer = 180
+    return {'empty': empty, 'charging': charging, 'active': active}
+
+
+def make_busy_level(seed=SEED):
+    """
+    Build a combat level crowded with temporary walls.
+
+    Args:
+        seed (int): Random seed for the wall placement
+
+    Returns:
+        Level: The level
+    """
+    rng = random.Random(seed)
+    level = Level("Benchmark", 'combat', "Benchmark")
+    for _ in range(BUSY_TEMP_WALLS):
+        size = rng.choice(BARRIER_SIZES)
+        position = (rng.randrange(0, SCREEN_WIDTH - size), rng.randrange(60, SCREEN_HEIGHT - size))
+        level.spawn(TempWall, position, (size, size), 10**9)
+    return level
+
+
+def scenarios():
+    """
+    Get the suite's scenarios.
+
+    Returns:
+        list: Scenario objects
+    """
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rendering.init_rendering()
+
+    # Everything is drawn offscreen, into a surface in the display's pixel format
+    target = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+    levels = {level.level_type: level for level in create_levels()}
+    busy = make_busy_level()
+    players = make_players()
+    circles = make_spell_circles()
+
+    scenarios = []
+    for level_type, level in levels.items():
+        scenarios.append(Scenario(f"draw_level/{level_type}", lambda level=level: rendering.draw_level(target, level)))
+    scenarios.append(Scenario("draw_level/busy", lambda: rendering.draw_level(target, busy)))
+    scenarios.append(Scenario("draw_level/busy-dynamic-only",
+                              lambda: rendering.draw_level(target, busy, include_static=False)))
+
+    for state, player in players.items():
+        scenarios.append(Scenario(f"draw_player/{state}", lambda player=player: rendering.draw_player(target, player)))
+
+    for state, circle in circles.items():
+        scenarios.append(Scenario(f"draw_spell_circle/{state}",
+                                  lambda circle=circle: rendering.draw_spell_circle(target, circle)))
+
+    for spell_name in EFFECT_SPELLS:
+        circle = SpellCircle()
+        circle.active_spell = spell_name
+        circle.active_spell_power = 90
+        circle.set_target_position((500, 300))
+        scenarios.append(Scenario(f"draw_spell_effect/{spell_name}",
+                                  lambda circle=circle: rendering.draw_spell_effect(target, circle)))
+
+    for level_type, level in levels.items():
+        scenarios.append(Scenario(f"draw_objective_panel/{level_type}",
+                                  lambda level=level: rendering.draw_objective_panel(target, level)))
+
+    scenarios.append(Scenario("draw_main_menu", lambda: rendering.draw_main_menu(target, 0)))
+    scenarios.append(Scenario("draw_level_transition", lambda: rendering.draw_level_transition(target, 2, len(levels))))
+
+    # A whole playing frame, batched through a draw list the way main.py draws it
+    draw_list = rendering.DrawList()
+    frame_players = list(players.values())
+
+    def playing_frame(level, circle):
+        target.fill((0, 0, 0))
+        rendering.draw_level(target, level, draw_list=draw_list)
+        for player in frame_players:
+            rendering.draw_player(target, player, draw_list)
+        rendering.draw_objective_panel(target, level, draw_list)
+        rendering.draw_spell_circle(target, circle, draw_list)
+        rendering.draw_spell_effect(target, circle, draw_list)
+        rendering.draw_targeting_cursor(target, (400, 300), draw_list)
+        draw_list.flush(target)
+
+    scenarios.append(Scenario("frame/combat", lambda: playing_frame(levels['combat'], circles['charging'])))
+    scenarios.append(Scenario("frame/busy", lambda: playing_frame(busy, circles['active'])))
+    return scenarios
+
+
+if __name__ == "__main__":
+    harness.main('rendering', scenarios, "Benchmark the renderer on the SDL dummy video driver.", annotate)
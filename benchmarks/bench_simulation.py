@@ -0,0 +1,235 @@
+"""
+Benchmarks for the simulation hot paths.
+
+Drives Level.update, Level.is_position_blocked, Level.blocked_mask, SpellCircle and
+Player.update on synthetic levels: 10 to 10,000 enemies, every spell in the
+registry, and walls at several densities. Nothing is drawn, so the suite
+runs on machines without a display.
+
+Usage:
+    python benchmarks/bench_simulation.py                  # full run, writes benchmarks/results/simulation.json
+    python benchmarks/bench_simulation.py --quick          # fewer samples
+    python benchmarks/bench_simulation.py --filter spell/  # only the spell scenarios
+"""
+import random
+
+import numpy as np
+
+import harness
+from harness import Scenario
+
+from enemies import ENEMY_SIZE
+from game import Level, Player, SpellCircle
+from simulation import DEFAULT_WIZARDS, SCREEN_WIDTH, SCREEN_HEIGHT
+from spells import SPELLS, combination_key
+from entities import Wall
+
+# Scenario sizes
+ENEMY_COUNTS = (10, 100, 1000, 10000)
+WALL_COUNTS = (0, 10, 100, 1000)
+SPELL_ENEMIES = 100  # Enemies on the level each spell is cast at
+SPELL_BATCH = 100  # Casts per sample, each on its own fresh level
+
+# Size of the random walls and of the box checked by is_position_blocked (a wizard)
+WALL_SIZE = (30, 30)
+QUERY_SIZE = 50
+QUERIES_PER_CALL = 100
+BULK_POSITIONS = 1000  # Enemy-sized positions per blocked_mask call (a screen-wide push)
+
+SEED = 1
+
+
+def make_level(enemies=0, walls=0, level_type='combat', seed=SEED):
+    """
+    Build a level with extra randomly placed enemies and walls.
+
+    Args:
+        enemies (int): Enemies to add on top of the level's own
+        walls (int): Walls to add on top of the level's own
+        level_type (str): 'puzzle', 'combat' or 'survival'
+        seed (int): Random seed for the placement
+
+    Returns:
+        Level: The level, with the default wizards as its players
+    """
+    rng = random.Random(seed)
+    level = Level("Benchmark", level_type, "Benchmark")
+    level.rng.seed(seed)
+    level.players = [Player(element, position, color) for element, position, color in DEFAULT_WIZARDS]
+
+    for _ in range(enemies):
+        level.enemies.add((rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT)), health=100,
+                          speed=rng.choice((1, 2)))
+    for _ in range(walls):
+        position = (rng.randrange(0, SCREEN_WIDTH - WALL_SIZE[0]), rng.randrange(0, SCREEN_HEIGHT - WALL_SIZE[1]))
+        level.add_element(Wall(position, WALL_SIZE))
+    return level
+
+
+def query_positions(count=QUERIES_PER_CALL, seed=SEED):
+    """
+    Random wizard-sized positions to check for collisions.
+
+    Args:
+        count (int): Number of positions
+        seed (int): Random seed
+
+    Returns:
+        list: (x, y) positions
+    """
+    rng = random.Random(seed)
+    return [(rng.uniform(0, SCREEN_WIDTH - QUERY_SIZE), rng.uniform(0, SCREEN_HEIGHT - QUERY_SIZE))
+            for _ in range(count)]
+
+
+def level_update_scenarios():
+    """One level tick with growing enemy counts."""
+    scenarios = []
+    for count in ENEMY_COUNTS:
+        level = make_level(enemies=count)
+        scenarios.append(Scenario(f"Level.update/enemies-{count}", level.update))
+    return scenarios
+
+
+def collision_scenarios():
+    """Collision queries, bulk enemy checks and wizard movement with growing wall counts."""
+    queries = []
+    bulk = []
+    moves = []
+    positions = query_positions()
+    bulk_xs, bulk_ys = np.array(query_positions(BULK_POSITIONS), dtype=np.float64).T
+    for count in WALL_COUNTS:
+        level = make_level(walls=count)
+
+        def blocked(level=level):
+            is_position_blocked = level.is_position_blocked
+            for position in positions:
+                is_position_blocked(position, QUERY_SIZE)
+
+        queries.append(Scenario(f"Level.is_position_blocked/walls-{count}", blocked, ops=QUERIES_PER_CALL))
+        bulk.append(Scenario(f"Level.blocked_mask/walls-{count}",
+                             lambda level=level: level.blocked_mask(bulk_xs, bulk_ys, ENEMY_SIZE)))
+
+        # A wizard's movement as Simulation.step does it: move, revert if blocked, clamp
+        player = level.players[0]
+        player.set_velocity('right', True)
+        player.set_velocity('down', True)
+
+        def move(level=level, player=player):
+            player.update()
+            if level.is_position_blocked(player.position, player.size):
+                player.position = player.prev_position
+                player.velocity = (-player.velocity[0], player.velocity[1])
+            player.keep_in_bounds(SCREEN_WIDTH, SCREEN_HEIGHT)
+            if player.position[1] >= SCREEN_HEIGHT - player.size or player.position[1] <= 0:
+                player.velocity = (player.velocity[0], -player.velocity[1])
+
+        moves.append(Scenario(f"Player.update+collision/walls-{count}", move))
+    return queries + bulk + moves
+
+
+def player_scenarios():
+    """A charging wizard's own update, without collisions."""
+    player = Player(*DEFAULT_WIZARDS[0])
+    player.set_velocity('right', True)
+
+    def update():
+        if not player.is_casting or player.cast_time > 600:
+            player.start_cast("Air")
+        player.update()
+
+    return [Scenario("Player.update/casting", update)]
+
+
+def spell_circle_scenarios():
+    """Adding elements, counting down and looking up combinations."""
+    scenarios = []
+
+    circle = SpellCircle()
+
+    def add_elements():
+        circle.elements = []
+        circle.element_charges = []
+        circle.add_element("Fire", 80)
+        circle.add_element("Water", 90)
+        circle.add_element("Earth", 100)
+
+    scenarios.append(Scenario("SpellCircle.add_element", add_elements, ops=3))
+
+    idle = SpellCircle()
+    scenarios.append(Scenario("SpellCircle.update/idle", idle.update))
+
+    # Two elements waiting for the activation timer (reset so it never fires)
+    waiting = SpellCircle()
+    waiting.add_element("Fire")
+    waiting.add_element("Water")
+
+    def count_down():
+        waiting.activation_timer = 120
+        waiting.update()
+
+    scenarios.append(Scenario("SpellCircle.update/countdown", count_down))
+
+    # Every registered combination, plus one that matches nothing
+    circles = []
+    for elements in [spell.elements for spell in SPELLS.values()] + [("Earth", "Earth", "Earth")]:
+        lookup = SpellCircle()
+        lookup.elements = list(elements)
+        lookup.element_charges = [100] * len(elements)
+        lookup.combination_key = combination_key(elements)
+        circles.append(lookup)
+
+    def check_all():
+        for lookup in circles:
+            lookup._check_spell_combination()
+
+    scenarios.append(Scenario("SpellCircle._check_spell_combination", check_all, ops=len(circles)))
+    return scenarios
+
+
+def spell_scenarios():
+    """
+    Casting each spell: combination lookup, its effect on a level and the next tick.
+
+    The spell's elements are put in the circle directly, since add_element()
+    keeps one of each element and so cannot build spells like Fireball.
+    Spells without an effect on combat levels are cast on a survival level if
+    they have one there. A cast changes the level it hits, so each sample
+    builds SPELL_BATCH fresh levels (untimed) and casts once on each.
+    """
+    scenarios = []
+    for name, spell in SPELLS.items():
+        level_type = 'survival' if 'combat' not in spell.effects and 'survival' in spell.effects else 'combat'
+
+        def setup(spell=spell, level_type=level_type):
+            batch = []
+            for _ in range(SPELL_BATCH):
+                circle = SpellCircle()
+                circle.elements = list(spell.elements)
+                circle.element_charges = [100] * len(spell.elements)
+                circle.combination_key = spell.key
+                batch.append((circle, make_level(enemies=SPELL_ENEMIES, level_type=level_type)))
+            return batch
+
+        def cast(batch):
+            circle, level = batch.pop()
+            spell_name, spell_power = circle._check_spell_combination()
+            level.update(spell_name, spell_power, (500, 300))
+
+        scenarios.append(Scenario(f"spell/{name}", cast, setup=setup, number=SPELL_BATCH))
+    return scenarios
+
+
+def scenarios():
+    """
+    Get the suite's scenarios.
+
+    Returns:
+        list: Scenario objects
+    """
+    return (level_update_scenarios() + collision_scenarios() + player_scenarios()
+            + spell_circle_scenarios() + spell_scenarios())
+
+
+if __name__ == "__main__":
+    harness.main('simulation', scenarios, "Benchmark the simulation hot paths.")
@@ -0,0 +1,277 @@
+"""
+Shared timing harness for the benchmark suites.
+
+A suite is a list of Scenario objects. Each scenario is timed in a number
+of samples; a sample calls the scenario's function enough times in a row to
+run for at least MIN_SAMPLE_SECONDS, so the timer's own cost disappears in
+the noise. Scenarios that change the state they run on give a setup function
+instead, which builds fresh state (untimed) before every sample.
+
+Results are printed as a table and written as JSON, one record per scenario:
+
+    {"name": "Level.update/enemies-1000", "ops_per_sec": 61000.0,
+     "latency_us": {"median": 16.4, "mean": 16.6, "min": 16.1, "p95": 17.9, "stdev": 0.5},
+     "samples_us": [...], "number": 640, "ops": 1}
+
+latency_us is the time of one operation (one tick, one query, ...) and
+samples_us holds the per-operation time of every sample, for comparisons.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(REPO_ROOT, 'src')
+
+# Where suites write their results by default
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+
+# Benchmarks never open a window or an audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+# The game modules live in src/
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# Samples per scenario, and the shortest a calibrated sample may run
+DEFAULT_REPEAT = 20
+MIN_SAMPLE_SECONDS = 0.01
+
+
+class _NullWriter:
+    """File-like sink for the game's console messages while timing."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class Scenario:
+    """
+    One timed benchmark.
+
+    Attributes:
+        name (str): Unique name, "<code under test>/<variant>"
+        func (callable): The code to time; called with setup()'s result if there is a setup
+        setup (callable or None): Builds fresh state before every sample (not timed)
+        number (int or None): Calls per sample (None to calibrate to MIN_SAMPLE_SECONDS)
+        ops (int): Operations each call performs (e.g. queries per batch)
+    """
+
+    def __init__(self, name, func, setup=None, number=None, ops=1):
+        """
+        Initialize a scenario.
+
+        Args:
+            name (str): Unique name, "<code under test>/<variant>"
+            func (callable): The code to time
+            setup (callable, optional): Builds fresh state before every sample
+            number (int, optional): Calls per sample (calibrated if None)
+            ops (int): Operations each call performs
+        """
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.number = number
+        self.ops = ops
+
+    def time_sample(self, number):
+        """
+        Time one sample.
+
+        Args:
+            number (int): Calls to make
+
+        Returns:
+            float: Seconds taken by the calls (setup excluded)
+        """
+        func = self.func
+        if self.setup is None:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            return time.perf_counter() - start
+
+        state = self.setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func(state)
+        return time.perf_counter() - start
+
+    def calibrate(self):
+        """
+        Find how many calls make a sample last at least MIN_SAMPLE_SECONDS.
+
+        Returns:
+            int: Calls per sample
+        """
+        if self.number is not None:
+            return self.number
+        number = 1
+        while self.time_sample(number) < MIN_SAMPLE_SECONDS:
+            number *= 2
+        return number
+
+
+def summarize(samples_us):
+    """
+    Summarize per-operation sample times.
+
+    Args:
+        samples_us (list): Per-operation time of each sample in microseconds
+
+    Returns:
+        dict: median, mean, min, p95 and stdev in microseconds
+    """
+    ordered = sorted(samples_us)
+    return {
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'min': ordered[0],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def run_scenario(scenario, repeat=DEFAULT_REPEAT):
+    """
+    Time a scenario.
+
+    Args:
+        scenario (Scenario): The scenario
+        repeat (int): Samples to take
+
+    Returns:
+        dict: Result record (see the module docstring)
+    """
+    with contextlib.redirect_stdout(_NullWriter()):
+        number = scenario.calibrate()
+        samples_us = [scenario.time_sample(number) / (number * scenario.ops) * 1e6 for _ in range(repeat)]
+
+    latency = summarize(samples_us)
+    return {
+        'name': scenario.name,
+        'ops_per_sec': 1e6 / latency['median'] if latency['median'] > 0 else 0.0,
+        'latency_us': latency,
+        'samples_us': samples_us,
+        'number': number,
+        'ops': scenario.ops,
+    }
+
+
+def run_scenarios(scenarios, repeat=DEFAULT_REPEAT, name_filter=None, annotate=None):
+    """
+    Time scenarios one after another, printing a line per result.
+
+    Args:
+        scenarios (list): Scenario objects
+        repeat (int): Samples per scenario
+        name_filter (str, optional): Only run scenarios whose name contains this
+        annotate (callable, optional): Called as annotate(scenario, result) after timing, to add
+            suite-specific fields to the result; returns text appended to its printed line
+
+    Returns:
+        list: Result records
+    """
+    results = []
+    print(f"{'scenario':48} {'ops/s':>12} {'median us':>11} {'p95 us':>11}")
+    for scenario in scenarios:
+        if name_filter and name_filter not in scenario.name:
+            continue
+        result = run_scenario(scenario, repeat)
+        extra = annotate(scenario, result) if annotate is not None else ''
+        latency = result['latency_us']
+        print(f"{scenario.name:48} {result['ops_per_sec']:12,.0f} {latency['median']:11.2f} {latency['p95']:11.2f}{extra}")
+        results.append(result)
+    return results
+
+
+def git_commit():
+    """
+    Get the commit the working tree is on.
+
+    Returns:
+        str or None: Commit hash, with "-dirty" appended if there are uncommitted
+            changes (None outside a git checkout)
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + '-dirty' if status else commit
+
+
+def environment():
+    """
+    Describe the machine and library versions the results were measured with.
+
+    Returns:
+        dict: Python, NumPy and pygame versions, platform and machine
+    """
+    info = {'python': platform.python_version(), 'platform': platform.platform(), 'machine': platform.machine()}
+    for module in ('numpy', 'pygame'):
+        try:
+            info[module] = __import__(module).__version__
+        except ImportError:
+            info[module] = None
+    return info
+
+
+def write_results(path, suite, results):
+    """
+    Write a suite's results as JSON.
+
+    Args:
+        path (str): File to write
+        suite (str): Suite name
+        results (list): Result records
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    report = {
+        'suite': suite,
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=1)
+    print(f"Wrote {len(results)} results to {path}")
+
+
+def main(suite, scenarios, description, annotate=None):
+    """
+    Command-line entry point shared by the suites.
+
+    Args:
+        suite (str): Suite name (also names the default output file)
+        scenarios (callable): Returns the suite's Scenario list
+        description (str): Help text
+        annotate (callable, optional): Adds suite-specific fields to each result (see run_scenarios)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--filter", default=None, help="only run scenarios whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="samples per scenario")
+    parser.add_argument("--quick", action="store_true", help="take 5 samples per scenario (a rough check)")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, suite + '.json'),
+                        help="JSON file to write the results to")
+    args = parser.parse_args()
+
+    results = run_scenarios(scenarios(), 5 if args.quick else args.repeat, args.filter, annotate)
+    write_results(args.output, suite, results)
@@ -0,0 +1,515 @@
+"""
+Benchmark history, comparisons and regression budgets.
+
+Every benchmark run is appended to a local history file
+(benchmarks/results/history.jsonl, one JSON line per suite run) keyed by the
+git commit it was measured on ("-dirty" is appended when the working tree
+had uncommitted changes).
+
+Commands:
+    run       Run the suites (each in a fresh process) and record the results
+    record    Add existing result files (from bench_*.py --output) to the history
+    list      Show the commits in the history and how many runs each has
+    compare   Compare two commits scenario by scenario
+    check     Exit with status 1 if a tracked scenario is over its budget
+
+compare estimates each scenario's change in latency with a 95% confidence
+interval. Samples taken within one run are not independent - the machine's
+state (clock speed, other processes, cache layout) shifts between runs far
+more than between samples - so each run counts as one observation, its
+median, and the interval is Welch's t-interval over the run medians. That
+needs at least two runs of each commit (run --runs 3 is a good default).
+A change is significant when the whole interval lies on one side of zero and
+the change is at least MIN_EFFECT. With a single run on either side the
+interval falls back to the individual samples; it cannot account for
+run-to-run noise, so its verdict is only a hint, shown with a "?", and
+check does not fail on it.
+
+check reads benchmarks/budgets.json, which maps scenario name patterns
+(fnmatch style, e.g. "spell/*") to budgets. A scenario is tracked if any
+pattern matches it; when several match, later entries override earlier ones.
+Budget keys:
+    max_regression  Largest allowed significant slowdown against the base commit (0.1 = 10%)
+    max_us          Largest allowed median latency in microseconds (machine dependent)
+    max_surfaces, max_texts, max_sysfonts
+                    Largest allowed allocations per call (rendering suite)
+
+Typical use on a branch:
+    git checkout main && python benchmarks/history.py run --runs 3
+    git checkout my-branch && python benchmarks/history.py run --runs 3
+    python benchmarks/history.py check --base main
+"""
+import argparse
+import fnmatch
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import harness
+
+# Local history of every recorded run
+HISTORY_FILE = os.path.join(harness.RESULTS_DIR, 'history.jsonl')
+
+# Regression budgets checked by the check command
+BUDGETS_FILE = os.path.join(harness.REPO_ROOT, 'benchmarks', 'budgets.json')
+
+# Suite name -> benchmark script
+SUITES = {
+    'simulation': os.path.join(harness.REPO_ROOT, 'benchmarks', 'bench_simulation.py'),
+    'rendering': os.path.join(harness.REPO_ROOT, 'benchmarks', 'bench_rendering.py'),
+}
+
+# Smallest relative change reported as significant
+MIN_EFFECT = 0.02
+
+# Two-sided 95% critical values of Student's t distribution for small degrees of freedom
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228}
+
+# Allocation budget keys -> field in the results' allocation counts
+ALLOCATION_BUDGETS = {'max_surfaces': 'surfaces', 'max_texts': 'texts', 'max_sysfonts': 'sysfonts'}
+
+
+def load_history(path=HISTORY_FILE):
+    """
+    Read every recorded run.
+
+    Args:
+        path (str): History file
+
+    Returns:
+        list: Run entries, oldest first (empty if there is no history yet)
+    """
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def record(report, path=HISTORY_FILE):
+    """
+    Append a suite run to the history.
+
+    Only the per-sample times and allocation counts are kept from each result;
+    the summaries can be recomputed from them.
+
+    Args:
+        report (dict): A results file's contents (see harness.write_results)
+        path (str): History file
+    """
+    results = {}
+    for result in report['results']:
+        results[result['name']] = {'samples_us': result['samples_us']}
+        if 'allocations' in result:
+            results[result['name']]['allocations'] = result['allocations']
+
+    entry = {key: report[key] for key in ('suite', 'commit', 'timestamp', 'environment')}
+    entry['results'] = results
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+
+def commits(history):
+    """
+    Get the commits in the history.
+
+    Args:
+        history (list): Run entries
+
+    Returns:
+        list: Commit keys, in the order they were first recorded
+    """
+    return list(dict.fromkeys(entry['commit'] for entry in history))
+
+
+def resolve_commit(history, ref):
+    """
+    Find the history key of a commit given as a hash prefix or any git ref.
+
+    Args:
+        history (list): Run entries
+        ref (str): Commit hash (or prefix, optionally with "-dirty") or git ref such as "main"
+
+    Returns:
+        str: The commit's key in the history
+
+    Raises:
+        ValueError: If the commit has no recorded runs
+    """
+    keys = commits(history)
+    matches = [key for key in keys if key.startswith(ref)]
+    if len(matches) == 1:
+        return matches[0]
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--verify', ref + '^{commit}'], cwd=harness.REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    if commit in keys:
+        return commit
+
+    if len(matches) > 1:
+        raise ValueError(f"{ref} is ambiguous: {', '.join(matches)}")
+    raise ValueError(f"No recorded runs for {ref}")
+
+
+def pooled_results(history, commit, suite=None):
+    """
+    Pool every run of a commit.
+
+    Args:
+        history (list): Run entries
+        commit (str): Commit key
+        suite (str, optional): Only use runs of this suite
+
+    Returns:
+        dict: Scenario name -> {'samples_us': every sample, 'run_medians': median of each run,
+            'allocations': latest counts or None}
+    """
+    pooled = {}
+    for entry in history:
+        if entry['commit'] != commit or (suite and entry['suite'] != suite):
+            continue
+        for name, result in entry['results'].items():
+            scenario = pooled.setdefault(name, {'samples_us': [], 'run_medians': [], 'allocations': None})
+            scenario['samples_us'].extend(result['samples_us'])
+            scenario['run_medians'].append(statistics.median(result['samples_us']))
+            scenario['allocations'] = result.get('allocations', scenario['allocations'])
+    return pooled
+
+
+def t_critical(df):
+    """
+    Get the two-sided 95% critical value of Student's t distribution.
+
+    Small degrees of freedom come from the T_95 table (rounded down, which
+    widens the interval); larger ones use the Cornish-Fisher expansion around
+    the normal quantile, which is within 0.1% of the exact value there.
+
+    Args:
+        df (float): Degrees of freedom (at least 1)
+
+    Returns:
+        float: Critical value
+    """
+    if df < 11:
+        return T_95[max(1, int(df))]
+    z = statistics.NormalDist().inv_cdf(0.975)
+    if math.isinf(df):
+        return z
+    return z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+
+
+def compare_samples(base, head):
+    """
+    Estimate the change in mean latency between two sets of observations.
+
+    Args:
+        base (list): Base latencies (run medians or individual samples)
+        head (list): Head latencies
+
+    Returns:
+        dict: base and head means and medians, the relative change of the mean,
+            its confidence interval (low, high), and a verdict: 'slower',
+            'faster' or 'same'
+    """
+    base_mean, head_mean = statistics.fmean(base), statistics.fmean(head)
+    base_var = statistics.variance(base) / len(base) if len(base) > 1 else 0.0
+    head_var = statistics.variance(head) / len(head) if len(head) > 1 else 0.0
+    se = math.sqrt(base_var + head_var)
+
+    # Welch-Satterthwaite degrees of freedom
+    denominator = 0.0
+    if len(base) > 1:
+        denominator += base_var ** 2 / (len(base) - 1)
+    if len(head) > 1:
+        denominator += head_var ** 2 / (len(head) - 1)
+    df = (se ** 4) / denominator if denominator > 0 else math.inf
+
+    diff = head_mean - base_mean
+    margin = t_critical(max(df, 1.0)) * se
+    change = diff / base_mean
+    low, high = (diff - margin) / base_mean, (diff + margin) / base_mean
+
+    verdict = 'same'
+    if low > 0 and change >= MIN_EFFECT:
+        verdict = 'slower'
+    elif high < 0 and change <= -MIN_EFFECT:
+        verdict = 'faster'
+
+    return {
+        'base_mean': base_mean,
+        'head_mean': head_mean,
+        'base_median': statistics.median(base),
+        'head_median': statistics.median(head),
+        'change': change,
+        'interval': (low, high),
+        'verdict': verdict,
+    }
+
+
+def compare(history, base, head, suite=None):
+    """
+    Compare every scenario two commits share.
+
+    Args:
+        history (list): Run entries
+        base (str): Base commit key
+        head (str): Head commit key
+        suite (str, optional): Only compare this suite
+
+    Returns:
+        dict: Scenario name -> compare_samples() result, plus 'runs': (base runs, head runs)
+    """
+    base_results = pooled_results(history, base, suite)
+    head_results = pooled_results(history, head, suite)
+
+    comparisons = {}
+    for name, head_result in head_results.items():
+        base_result = base_results.get(name)
+        if base_result is None:
+            continue
+        runs = (len(base_result['run_medians']), len(head_result['run_medians']))
+        if min(runs) >= 2:
+            comparison = compare_samples(base_result['run_medians'], head_result['run_medians'])
+        else:
+            # One run cannot show run-to-run noise, so this verdict is only a hint
+            comparison = compare_samples(base_result['samples_us'], head_result['samples_us'])
+            if comparison['verdict'] != 'same':
+                comparison['verdict'] += '?'
+        comparison['runs'] = runs
+        comparisons[name] = comparison
+    return comparisons
+
+
+def short_commit(commit):
+    """
+    Shorten a commit key for display.
+
+    Args:
+        commit (str): Commit key (hash, optionally with "-dirty")
+
+    Returns:
+        str: The first 12 hex digits, keeping any "-dirty" suffix
+    """
+    digest, dirty, _ = commit.partition('-dirty')
+    return digest[:12] + dirty
+
+
+def load_budgets(path=BUDGETS_FILE):
+    """
+    Read the regression budgets.
+
+    Args:
+        path (str): Budgets file
+
+    Returns:
+        dict: Scenario name pattern -> budget dict, in file order
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def budget_for(budgets, name):
+    """
+    Get the budget of a scenario.
+
+    Args:
+        budgets (dict): Scenario name pattern -> budget dict
+        name (str): Scenario name
+
+    Returns:
+        dict or None: The merged budget of every matching pattern (None if the scenario is not tracked)
+    """
+    budget = None
+    for pattern, limits in budgets.items():
+        if fnmatch.fnmatchcase(name, pattern):
+            budget = {**(budget or {}), **limits}
+    return budget
+
+
+def check(history, budgets, head, base=None, suite=None):
+    """
+    Check every tracked scenario of a commit against its budget.
+
+    Args:
+        history (list): Run entries
+        budgets (dict): Scenario name pattern -> budget dict
+        head (str): Commit key to check
+        base (str, optional): Commit key to measure regressions against (skipped if None)
+        suite (str, optional): Only check this suite
+
+    Returns:
+        list: (scenario name, problem) pairs, empty if everything is within budget
+    """
+    head_results = pooled_results(history, head, suite)
+    comparisons = compare(history, base, head, suite) if base is not None else {}
+
+    # A tracked scenario that the base measured but the head's run of the same suite no longer does
+    failures = []
+    if base is not None:
+        head_suites = {entry['suite'] for entry in history if entry['commit'] == head}
+        for head_suite in sorted(head_suites):
+            if suite and head_suite != suite:
+                continue
+            for name in sorted(pooled_results(history, base, head_suite)):
+                if name not in head_results and budget_for(budgets, name) is not None:
+                    failures.append((name, "tracked scenario is missing from the head's results"))
+
+    for name, result in sorted(head_results.items()):
+        budget = budget_for(budgets, name)
+        if budget is None:
+            continue
+
+        median = statistics.median(result['samples_us'])
+        if 'max_us' in budget and median > budget['max_us']:
+            failures.append((name, f"median {median:.2f} us is over the {budget['max_us']} us budget"))
+
+        comparison = comparisons.get(name)
+        if comparison is not None and 'max_regression' in budget:
+            if comparison['verdict'] == 'slower' and comparison['change'] > budget['max_regression']:
+                low, high = comparison['interval']
+                failures.append((name, f"{comparison['change']:+.1%} slower (95% CI {low:+.1%} to {high:+.1%}), "
+                                       f"budget {budget['max_regression']:.0%}"))
+
+        allocations = result['allocations'] or {}
+        for key, field in ALLOCATION_BUDGETS.items():
+            if key in budget and allocations.get(field, 0) > budget[key]:
+                failures.append((name, f"{allocations[field]:g} {field} per call, budget {budget[key]}"))
+    return failures
+
+
+def run_suites(suites, runs, extra_args, path=HISTORY_FILE):
+    """
+    Run benchmark suites in fresh processes and record each run.
+
+    Args:
+        suites (list): Suite names
+        runs (int): Times to run each suite
+        extra_args (list): Arguments passed on to the suites (e.g. ['--quick'])
+        path (str): History file
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        for run in range(runs):
+            for suite in suites:
+                print(f"== {suite} (run {run + 1} of {runs})")
+                output = os.path.join(directory, suite + '.json')
+                subprocess.run([sys.executable, SUITES[suite], '--output', output] + extra_args, check=True)
+                with open(output) as f:
+                    record(json.load(f), path)
+
+
+def print_comparison(comparisons):
+    """Print compare() results as a table."""
+    print(f"{'scenario':48} {'base us':>10} {'head us':>10} {'change':>8} {'95% CI':>18} {'runs':>6}  verdict")
+    for name, c in comparisons.items():
+        low, high = c['interval']
+        runs = '{}/{}'.format(*c['runs'])
+        print(f"{name:48} {c['base_median']:10.2f} {c['head_median']:10.2f} {c['change']:+8.1%} "
+              f"{f'{low:+.1%} .. {high:+.1%}':>18} {runs:>6}  {c['verdict']}")
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Record, compare and check benchmark results across commits.")
+    parser.add_argument("--history", default=HISTORY_FILE, help="history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suites and record the results")
+    run_parser.add_argument("--suite", choices=sorted(SUITES), action="append",
+                            help="suite to run (repeatable; default: all)")
+    run_parser.add_argument("--runs", type=int, default=3, help="times to run each suite")
+    run_parser.add_argument("--quick", action="store_true", help="pass --quick to the suites")
+    run_parser.add_argument("--filter", default=None, help="pass --filter to the suites")
+
+    record_parser = commands.add_parser("record", help="add result files to the history")
+    record_parser.add_argument("files", nargs="+", help="results written by a bench_*.py script")
+
+    commands.add_parser("list", help="show the recorded commits")
+
+    compare_parser = commands.add_parser("compare", help="compare two commits")
+    compare_parser.add_argument("base", nargs="?", help="base commit or ref (default: the previous recorded commit)")
+    compare_parser.add_argument("head", nargs="?", help="head commit or ref (default: the working tree's commit)")
+    compare_parser.add_argument("--suite", choices=sorted(SUITES), help="only compare this suite")
+    compare_parser.add_argument("--all", action="store_true", help="show unchanged scenarios too")
+
+    check_parser = commands.add_parser("check", help="fail if a tracked scenario is over its budget")
+    check_parser.add_argument("--base", help="commit or ref to measure regressions against "
+                                             "(default: the previous recorded commit)")
+    check_parser.add_argument("--head", help="commit or ref to check (default: the working tree's commit)")
+    check_parser.add_argument("--suite", choices=sorted(SUITES), help="only check this suite")
+    check_parser.add_argument("--budgets", default=BUDGETS_FILE, help="budgets file")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        extra_args = (['--quick'] if args.quick else []) + (['--filter', args.filter] if args.filter else [])
+        run_suites(args.suite or list(SUITES), args.runs, extra_args, args.history)
+        return
+
+    if args.command == "record":
+        for path in args.files:
+            with open(path) as f:
+                record(json.load(f), args.history)
+        print(f"Recorded {len(args.files)} run(s) in {args.history}")
+        return
+
+    history = load_history(args.history)
+    if not history:
+        sys.exit(f"No benchmark history in {args.history} (run: python benchmarks/history.py run)")
+
+    if args.command == "list":
+        for commit in commits(history):
+            entries = [entry for entry in history if entry['commit'] == commit]
+            suites = ', '.join(f"{suite} x{sum(e['suite'] == suite for e in entries)}"
+                               for suite in dict.fromkeys(e['suite'] for e in entries))
+            print(f"{short_commit(commit):18} {entries[-1]['timestamp']}  {suites}")
+        return
+
+    # Resolve the commits to compare: head defaults to the working tree, base to the commit recorded before it
+    try:
+        head_ref = args.head or harness.git_commit()
+        head = resolve_commit(history, head_ref) if head_ref else commits(history)[-1]
+        base_ref = args.base
+        if base_ref is None:
+            earlier = commits(history)[:commits(history).index(head)]
+            base = earlier[-1] if earlier else None
+        else:
+            base = resolve_commit(history, base_ref)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    if args.command == "compare":
+        if base is None:
+            sys.exit("No earlier commit to compare with")
+        print(f"base {short_commit(base)}  head {short_commit(head)}")
+        comparisons = compare(history, base, head, args.suite)
+        if not args.all:
+            comparisons = {name: c for name, c in comparisons.items() if c['verdict'] != 'same'}
+        print_comparison(comparisons)
+        verdicts = [c['verdict'] for c in comparisons.values()]
+        print(f"{verdicts.count('slower')} significantly slower, {verdicts.count('faster')} faster")
+        if any(verdict.endswith('?') for verdict in verdicts):
+            print("'?': only one run of a commit, so run-to-run noise is unknown - record more runs to confirm")
+        return
+
+    # check
+    failures = check(history, load_budgets(args.budgets), head, base, args.suite)
+    print(f"Checked {short_commit(head)}" + (f" against {short_commit(base)}" if base else " (no base commit, budgets only)"))
+    for name, problem in failures:
+        print(f"FAIL {name}: {problem}")
+    if failures:
+        sys.exit(1)
+    print("All tracked scenarios are within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import pygame
+import json
+import os
+import sys
+
+# The element orbs are drawn by the game's own rendering code
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rendering
+
+# Width of the atlas texture and the empty pixels kept between sprites
+ATLAS_WIDTH = 256
+PADDING = 1
+
+def load_image_sprites(images_dir):
+    """Load every PNG in the images directory, named after its file.
+
+    Args:
+        images_dir: Directory with the source sprite images
+
+    Returns:
+        Dict of sprite name -> pygame Surface
+    """
+    sprites = {}
+    for filename in sorted(os.listdir(images_dir)):
+        name, extension = os.path.splitext(filename)
+        if extension.lower() == '.png':
+            sprites[name] = pygame.image.load(os.path.join(images_dir, filename))
+    return sprites
+
+def bake_element_orbs():
+    """Bake the spell circle's element orbs.
+
+    Returns:
+        Dict of sprite name -> pygame Surface
+    """
+    radius = rendering.ELEMENT_ORB_RADIUS
+    sprites = {}
+    for element, color in rendering.ELEMENT_COLORS.items():
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        rendering.draw_element_orb(surface, (radius, radius), color, radius)
+        sprites[rendering.element_orb_name(element)] = surface
+    return sprites
+
+def pack(sizes, width=ATLAS_WIDTH, padding=PADDING):
+    """Pack rectangles into rows (shelves), tallest first.
+
+    Args:
+        sizes: Dict of sprite name -> (width, height)
+        width: Width of the atlas
+        padding: Empty pixels between sprites
+
+    Returns:
+        Tuple (rects, height): dict of sprite name -> (x, y, width, height) and the atlas height
+    """
+    rects = {}
+    x = y = shelf_height = 0
+    for name in sorted(sizes, key=lambda name: (-sizes[name][1], name)):
+        w, h = sizes[name]
+        if w > width:
+            raise ValueError(f"Sprite {name} is wider than the atlas ({w} > {width})")
+
+        # Start a new shelf when this row is full
+        if x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+
+        rects[name] = (x, y, w, h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    return rects, y + shelf_height
+
+def build_atlas():
+    """Pack every sprite into atlas.png with an atlas.json index."""
+    assets_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Collect the sprites
+    sprites = load_image_sprites(os.path.join(assets_dir, 'images'))
+    sprites.update(bake_element_orbs())
+
+    # Lay them out and copy them into one transparent surface
+    rects, height = pack({name: sprite.get_size() for name, sprite in sprites.items()})
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    for name, sprite in sprites.items():
+        # MAX onto the cleared atlas copies pixels exactly, without alpha blending
+        atlas.blit(sprite, rects[name][:2], special_flags=pygame.BLEND_RGBA_MAX)
+
+    # Save the texture and its index
+    pygame.image.save(atlas, os.path.join(assets_dir, 'atlas.png'))
+    with open(os.path.join(assets_dir, 'atlas.json'), 'w') as f:
+        json.dump({'size': [ATLAS_WIDTH, height], 'sprites': rects}, f, indent=2, sort_keys=True)
+    print(f"Packed {len(sprites)} sprites into a {ATLAS_WIDTH}x{height} atlas")
+
+if __name__ == "__main__":
+    pygame.init()
+    build_atlas()
+    pygame.quit()
@@ -84,4 +84,5 @@ def create_wizard_sprites():
 if __name__ == "__main__":
     create_wizard_sprites()
     print("Wizard sprites generation complete.")
+    print("Run build_atlas.py to pack them into the sprite atlas.")
     pygame.quit() 
\ No newline at end of file
@@ -2,7 +2,6 @@ import pygame
 import numpy as np
 import os
 import wave
-import struct
 
 # Initialize pygame mixer
 pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
@@ -48,10 +47,8 @@ def save_wav(buf, filename):
         # Set WAV file parameters
         wav_file.setparams((nchannels, sampwidth, framerate, nframes, 'NONE', 'not compressed'))
         
-        # Convert the numpy array to bytes and write to file
-        for i in range(nframes):
-            wav_file.writeframes(struct.pack('<h', buf[i][0]))  # Left channel
-            wav_file.writeframes(struct.pack('<h', buf[i][1]))  # Right channel
+        # Convert the numpy array to interleaved little-endian bytes and write it in one go
+        wav_file.writeframes(np.ascontiguousarray(buf, dtype='<i2').tobytes())
 
 def generate_cast_sound():
     """Generate a sound for casting a spell element."""
@@ -0,0 +1,171 @@
+"""
+Keyboard bindings for the wizards.
+
+Every gameplay key maps to a (player_index, action, arg) binding in one table,
+so a key event is dispatched with a single dict lookup no matter how many keys
+or players are bound. Keys can be rebound at runtime, and extra players only
+need their own entries in the table.
+"""
+import pygame
+
+from simulation import ACTION_CAST, ACTION_ATTUNE, ACTION_MOVE
+
+# Spell casting keys
+FIRE_CAST_KEY = pygame.K_1    # Player 1 (Fire)
+WATER_CAST_KEY = pygame.K_4   # Player 2 (Water)
+EARTH_CAST_KEY = pygame.K_7   # Player 3 (Earth)
+# Alternate Air casting keys
+FIRE_AIR_KEY = pygame.K_2     # Player 1 alternate (Air)
+WATER_AIR_KEY = pygame.K_5    # Player 2 alternate (Air)
+EARTH_AIR_KEY = pygame.K_8    # Player 3 alternate (Air)
+# Tertiary element casting keys
+FIRE_WATER_KEY = pygame.K_3   # Player 1 tertiary (Water)
+WATER_EARTH_KEY = pygame.K_6  # Player 2 tertiary (Earth)
+EARTH_FIRE_KEY = pygame.K_9   # Player 3 tertiary (Fire)
+# Attunement keys
+FIRE_ATTUNE_KEY = pygame.K_e  # Player 1 attunement
+WATER_ATTUNE_KEY = pygame.K_y # Player 2 attunement
+EARTH_ATTUNE_KEY = pygame.K_o # Player 3 attunement
+
+# Movement keys
+# Player 1 (Fire): WASD
+P1_UP = pygame.K_w
+P1_DOWN = pygame.K_s
+P1_LEFT = pygame.K_a
+P1_RIGHT = pygame.K_d
+
+# Player 2 (Water): TFGH
+P2_UP = pygame.K_t
+P2_DOWN = pygame.K_g
+P2_LEFT = pygame.K_f
+P2_RIGHT = pygame.K_h
+
+# Player 3 (Earth): IJKL
+P3_UP = pygame.K_i
+P3_DOWN = pygame.K_k
+P3_LEFT = pygame.K_j
+P3_RIGHT = pygame.K_l
+
+# Tracing and profiling keys (work in every game state)
+TRACE_TOGGLE_KEY = pygame.K_F9  # Start/stop recording frame phase timings
+TRACE_SAVE_KEY = pygame.K_F10   # Save the recorded timings as a Chrome trace
+PERF_HUD_KEY = pygame.K_F3      # Show/hide the performance overlay
+
+
+def player_bindings(player_index, casts, attune, up, down, left, right):
+    """
+    Build the bindings for one player.
+
+    Args:
+        player_index (int): Index of the player in Simulation.players
+        casts (dict): Keycode -> element charged while the key is held
+        attune (int): Keycode for attunement
+        up, down, left, right (int): Movement keycodes
+
+    Returns:
+        dict: Keycode -> (player_index, action, arg)
+    """
+    bindings = {key: (player_index, ACTION_CAST, element) for key, element in casts.items()}
+    bindings[attune] = (player_index, ACTION_ATTUNE, None)
+    for key, direction in ((up, 'up'), (down, 'down'), (left, 'left'), (right, 'right')):
+        bindings[key] = (player_index, ACTION_MOVE, direction)
+    return bindings
+
+
+# Default key layout for the three wizards
+DEFAULT_BINDINGS = {}
+DEFAULT_BINDINGS.update(player_bindings(0, {FIRE_CAST_KEY: "Fire", FIRE_AIR_KEY: "Air", FIRE_WATER_KEY: "Water"},
+                                        FIRE_ATTUNE_KEY, P1_UP, P1_DOWN, P1_LEFT, P1_RIGHT))
+DEFAULT_BINDINGS.update(player_bindings(1, {WATER_CAST_KEY: "Water", WATER_AIR_KEY: "Air", WATER_EARTH_KEY: "Earth"},
+                                        WATER_ATTUNE_KEY, P2_UP, P2_DOWN, P2_LEFT, P2_RIGHT))
+DEFAULT_BINDINGS.update(player_bindings(2, {EARTH_CAST_KEY: "Earth", EARTH_AIR_KEY: "Air", EARTH_FIRE_KEY: "Fire"},
+                                        EARTH_ATTUNE_KEY, P3_UP, P3_DOWN, P3_LEFT, P3_RIGHT))
+
+
+class InputBindings:
+    """
+    Maps keycodes to player actions and feeds key events into a SimulationInput.
+
+    Attributes:
+        bindings (dict): Keycode -> (player_index, action, arg)
+    """
+
+    def __init__(self, bindings=None):
+        """
+        Initialize the binding table.
+
+        Args:
+            bindings (dict, optional): Keycode -> (player_index, action, arg), defaults to DEFAULT_BINDINGS
+        """
+        self.bindings = dict(DEFAULT_BINDINGS if bindings is None else bindings)
+
+    def bind(self, key, player_index, action, arg=None):
+        """
+        Bind a key to a player action, replacing whatever the key did before.
+
+        Args:
+            key (int): Pygame keycode
+            player_index (int): Index of the player in Simulation.players
+            action (str): ACTION_CAST, ACTION_ATTUNE or ACTION_MOVE
+            arg: Element for casts, direction for movement, None for attunement
+        """
+        self.bindings[key] = (player_index, action, arg)
+
+    def unbind(self, key):
+        """
+        Remove a key binding (no-op if the key is not bound).
+
+        Args:
+            key (int): Pygame keycode
+        """
+        self.bindings.pop(key, None)
+
+    def rebind(self, old_key, new_key):
+        """
+        Move the action bound to one key onto another key.
+
+        Args:
+            old_key (int): Keycode currently bound
+            new_key (int): Keycode to bind the action to instead
+
+        Returns:
+            bool: True if old_key was bound
+        """
+        binding = self.bindings.pop(old_key, None)
+        if binding is None:
+            return False
+        self.bindings[new_key] = binding
+        return True
+
+    def keys_for(self, player_index):
+        """
+        Get every key bound to a player.
+
+        Args:
+            player_index (int): Index of the player in Simulation.players
+
+        Returns:
+            dict: Keycode -> (action, arg) for that player
+        """
+        return {key: binding[1:] for key, binding in self.bindings.items() if binding[0] == player_index}
+
+    def dispatch(self, event, inputs):
+        """
+        Record a key press or release for the bound player action, if any.
+
+        Args:
+            event (pygame.event.Event): A KEYDOWN or KEYUP event
+            inputs (SimulationInput): Input frame to record the transition in
+
+        Returns:
+            bool: True if the key was bound
+        """
+        binding = self.bindings.get(event.key)
+        if binding is None:
+            return False
+
+        if event.type == pygame.KEYDOWN:
+            inputs.press(*binding)
+        else:
+            inputs.release(*binding)
+        return True
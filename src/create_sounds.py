@@ -1,5 +1,4 @@
 import wave
-import struct
 import numpy as np
 import os
 
@@ -12,18 +11,17 @@ def save_wave(file_path, samples, sample_rate=44100):
     # Ensure the samples are in the valid range [-1, 1]
     samples = np.clip(samples, -1, 1)
     
-    # Convert to 16-bit PCM
-    samples = (samples * 32767).astype(np.int16)
+    # Convert to 16-bit PCM (WAV data is always little-endian)
+    samples = (samples * 32767).astype('<i2')
     
     # Create a new WAV file
-    with wave.open(file_path, 'w') as wav_file:
+    with wave.open(file_path, 'wb') as wav_file:
         wav_file.setnchannels(1)  # Mono
         wav_file.setsampwidth(2)  # 16-bit
         wav_file.setframerate(sample_rate)
         
-        # Write the audio data
-        for sample in samples:
-            wav_file.writeframes(struct.pack('h', sample))
+        # Write the whole buffer in one go
+        wav_file.writeframes(samples.tobytes())
     
     print(f"Created sound file: {file_path}")
 
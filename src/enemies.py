@@ -0,0 +1,199 @@
+"""
+Structure-of-arrays storage for level enemies.
+
+Enemies live in parallel NumPy arrays instead of one dict per enemy, so a spell
+hitting thousands of them is a single vectorized distance/falloff/damage pass
+and dead enemies are removed in bulk.
+"""
+import numpy as np
+
+# Collision size used when moving enemies around walls
+ENEMY_SIZE = 50
+
+
+class EnemyStore:
+    """
+    Holds every enemy of a level in parallel arrays.
+
+    Only the first `count` entries of each array are live; the arrays grow by
+    doubling so spawning stays amortized O(1).
+
+    Attributes:
+        count (int): Number of live enemies
+        x (ndarray): X positions
+        y (ndarray): Y positions
+        health (ndarray): Remaining health
+        speed (ndarray): Movement speed in pixels per tick
+        original_speed (ndarray): Speed to restore when a stun wears off
+        stun_timer (ndarray): Ticks of stun remaining (0 = not stunned)
+        updated_at (ndarray): Tick each enemy was last moved on (see schedule())
+        ticks (int): Ticks scheduled so far
+        cursor (int): Index the next round-robin batch starts at
+    """
+
+    # Gameplay state (what replay digests compare)
+    FIELDS = ('x', 'y', 'health', 'speed', 'original_speed', 'stun_timer')
+
+    # Every per-enemy array, including the update scheduling bookkeeping
+    ARRAYS = FIELDS + ('updated_at',)
+
+    def __init__(self, capacity=16):
+        """
+        Initialize an empty enemy store.
+
+        Args:
+            capacity (int): Number of enemies to reserve space for
+        """
+        self.count = 0
+        self.ticks = 0
+        self.cursor = 0
+        for field in self.ARRAYS:
+            setattr(self, field, np.zeros(capacity, dtype=np.float64))
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Double the capacity of every array, keeping the live entries."""
+        capacity = max(16, len(self.x) * 2)
+        for field in self.ARRAYS:
+            old = getattr(self, field)
+            new = np.zeros(capacity, dtype=np.float64)
+            new[:self.count] = old[:self.count]
+            setattr(self, field, new)
+
+    def add(self, position, health=100, speed=1):
+        """
+        Spawn a new enemy.
+
+        Args:
+            position (tuple): (x, y) spawn position
+            health (float): Starting health
+            speed (float): Movement speed in pixels per tick
+
+        Returns:
+            int: Index of the new enemy
+        """
+        if self.count == len(self.x):
+            self._grow()
+
+        i = self.count
+        self.x[i], self.y[i] = position
+        self.health[i] = health
+        self.speed[i] = speed
+        self.original_speed[i] = speed
+        self.stun_timer[i] = 0
+        self.updated_at[i] = self.ticks
+        self.count += 1
+        return i
+
+    def live(self, field):
+        """
+        Get a view of the live part of one array.
+
+        Args:
+            field (str): One of ARRAYS
+
+        Returns:
+            ndarray: Writable view of the first `count` entries
+        """
+        return getattr(self, field)[:self.count]
+
+    def schedule(self, limit):
+        """
+        Advance one tick and pick the enemies to move on it.
+
+        With more than `limit` enemies, only `limit` of them are picked, in
+        round-robin order starting where the previous tick stopped. Each picked
+        enemy is given the number of ticks since it was last picked, so the
+        ones that waited catch up instead of falling behind.
+
+        Args:
+            limit (int): Most enemies to pick
+
+        Returns:
+            tuple: (picked, elapsed) - a slice or index array of the picked
+                enemies, and the ticks each of them has to catch up on
+        """
+        self.ticks += 1
+        if self.count <= limit:
+            picked = slice(0, self.count)
+            self.cursor = 0
+        else:
+            start = self.cursor % self.count
+            picked = (start + np.arange(limit)) % self.count
+            self.cursor = (start + limit) % self.count
+
+        elapsed = self.ticks - self.updated_at[picked]
+        self.updated_at[picked] = self.ticks
+        return picked, elapsed
+
+    def positions(self):
+        """
+        Get enemy positions as tuples (for display and debugging).
+
+        Returns:
+            list: (x, y) tuples of every live enemy
+        """
+        return list(zip(self.live('x').tolist(), self.live('y').tolist()))
+
+    def distances_to(self, center):
+        """
+        Get the distance of every enemy to a point.
+
+        Args:
+            center (tuple): (x, y) point
+
+        Returns:
+            ndarray: Distance per live enemy
+        """
+        return np.hypot(self.live('x') - center[0], self.live('y') - center[1])
+
+    def apply_radial(self, center, radius, damage=0, slow=0, min_speed=0):
+        """
+        Apply an area-of-effect hit with linear distance falloff.
+
+        Enemies within `radius` of `center` lose `damage * falloff` health and
+        `slow * falloff` speed (never dropping below `min_speed`), where falloff
+        is 1 at the center and 0 at the edge.
+
+        Args:
+            center (tuple): (x, y) center of the effect
+            radius (float): Radius of the effect
+            damage (float): Damage at the center
+            slow (float): Speed reduction at the center
+            min_speed (float): Lowest speed the slow can reduce an enemy to
+
+        Returns:
+            ndarray: Boolean mask of the enemies that were hit
+        """
+        if self.count == 0 or radius <= 0:
+            return np.zeros(self.count, dtype=bool)
+
+        distance = self.distances_to(center)
+        hit = distance <= radius
+        falloff = 1 - distance[hit] / radius
+
+        if damage:
+            self.live('health')[hit] -= damage * falloff
+        if slow:
+            speed = self.live('speed')
+            speed[hit] = np.maximum(min_speed, speed[hit] - slow * falloff)
+        return hit
+
+    def remove_dead(self):
+        """
+        Remove every enemy whose health dropped to zero, in one compaction pass.
+
+        Returns:
+            int: Number of enemies removed
+        """
+        alive = self.live('health') > 0
+        remaining = int(np.count_nonzero(alive))
+        removed = self.count - remaining
+        if removed:
+            for field in self.ARRAYS:
+                array = getattr(self, field)
+                array[:remaining] = array[:self.count][alive]
+            self.count = remaining
+        return removed
@@ -0,0 +1,281 @@
+"""
+Level entity classes.
+
+Walls, gaps, visual effects, tornadoes and barriers are small __slots__
+objects with plain numeric fields instead of dicts with string keys, and
+Level keeps them in one typed list per kind. Enemies are not entities: they
+live in the parallel arrays of enemies.EnemyStore.
+
+For code written against the old dict elements, every entity also answers
+elem['position'], elem.get('type') and 'max_radius' in elem.
+
+Short-lived entities (temporary walls, effects, tornadoes and barriers) are
+recycled through an EntityPool instead of being allocated for every spell, so
+long sessions do not churn the allocator and the garbage collector.
+"""
+
+
+class Entity:
+    """
+    Base class for level entities.
+
+    Class attributes:
+        type (str): Element type name ('wall', 'gap', 'effect', 'tornado' or 'barrier')
+        static (bool): True for permanent geometry that never moves or expires
+        solid (bool): True if the entity blocks movement
+    """
+
+    __slots__ = ('x', 'y', '_index')  # _index: position in the Level's typed list (for swap-remove)
+
+    type = None
+    static = False
+    solid = False
+
+    @property
+    def position(self):
+        """(x, y) position of the entity."""
+        return (self.x, self.y)
+
+    @position.setter
+    def position(self, position):
+        self.x, self.y = position
+
+    # Mapping-style access, so entities can stand in for the old element dicts
+
+    def get(self, key, default=None):
+        """
+        Get a field by name, like dict.get().
+
+        Args:
+            key (str): Field name
+            default: Value to return if the entity has no such field
+
+        Returns:
+            The field value or default
+        """
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}"
+                           for cls in type(self).__mro__ for name in getattr(cls, '__slots__', ())
+                           if not name.startswith('_'))
+        return f"{type(self).__name__}({fields})"
+
+
+class Box(Entity):
+    """An entity with a rectangular footprint."""
+
+    __slots__ = ('w', 'h')
+
+    @property
+    def size(self):
+        """(width, height) of the entity."""
+        return (self.w, self.h)
+
+
+class Wall(Box):
+    """A permanent wall."""
+
+    __slots__ = ()
+
+    type = 'wall'
+    static = True
+    solid = True
+    temp = False
+
+    def __init__(self, position, size):
+        """
+        Initialize a wall.
+
+        Args:
+            position (tuple): (x, y) top-left corner
+            size (tuple): (width, height)
+        """
+        self.x, self.y = position
+        self.w, self.h = size
+
+
+class TempWall(Wall):
+    """A wall raised by a spell that disappears when its timer runs out."""
+
+    __slots__ = ('timer',)
+
+    static = False
+    temp = True
+
+    def __init__(self, position, size, timer):
+        """
+        Initialize a temporary wall.
+
+        Args:
+            position (tuple): (x, y) top-left corner
+            size (tuple): (width, height)
+            timer (int): Ticks until the wall disappears
+        """
+        super().__init__(position, size)
+        self.timer = timer
+
+
+class Gap(Box):
+    """A gap in the floor (puzzle levels)."""
+
+    __slots__ = ()
+
+    type = 'gap'
+    static = True
+
+    def __init__(self, position, size):
+        """
+        Initialize a gap.
+
+        Args:
+            position (tuple): (x, y) top-left corner
+            size (tuple): (width, height)
+        """
+        self.x, self.y = position
+        self.w, self.h = size
+
+
+class Barrier(Box):
+    """A barrier that follows a player and pushes enemies away."""
+
+    __slots__ = ('duration', 'player_id')
+
+    type = 'barrier'
+
+    def __init__(self, position, size, duration, player_id):
+        """
+        Initialize a barrier.
+
+        Args:
+            position (tuple): (x, y) top-left corner
+            size (tuple): (width, height)
+            duration (int): Ticks until the barrier disappears
+            player_id (int): id() of the player the barrier follows
+        """
+        self.x, self.y = position
+        self.w, self.h = size
+        self.duration = duration
+        self.player_id = player_id
+
+
+class Effect(Entity):
+    """A short-lived visual spell effect."""
+
+    __slots__ = ('effect_type', 'timer', 'color', 'radius', 'max_radius')
+
+    type = 'effect'
+
+    def __init__(self, effect_type, position, timer, color, radius=0, max_radius=None):
+        """
+        Initialize a visual effect.
+
+        Args:
+            effect_type (str): 'explosion', 'wave' or 'earthquake'
+            position (tuple): (x, y) center
+            timer (int): Ticks until the effect disappears
+            color (tuple): RGB color
+            radius (float): Current radius
+            max_radius (float, optional): Radius an expanding effect grows to
+        """
+        self.effect_type = effect_type
+        self.x, self.y = position
+        self.timer = timer
+        self.color = color
+        self.radius = radius
+        self.max_radius = max_radius
+
+
+class Tornado(Entity):
+    """A wandering tornado that pulls in and damages enemies."""
+
+    __slots__ = ('radius', 'damage', 'pull', 'timer', 'color')
+
+    type = 'tornado'
+
+    def __init__(self, position, radius, damage, pull, timer, color):
+        """
+        Initialize a tornado.
+
+        Args:
+            position (tuple): (x, y) center
+            radius (float): Radius enemies are caught in
+            damage (float): Damage per tick to caught enemies
+            pull (float): Pull strength toward the center
+            timer (int): Ticks until the tornado dies down
+            color (tuple): RGB color
+        """
+        self.x, self.y = position
+        self.radius = radius
+        self.damage = damage
+        self.pull = pull
+        self.timer = timer
+        self.color = color
+
+
+class EntityPool:
+    """
+    Free list of retired entities of one class.
+
+    acquire() re-initializes a retired entity when one is available and only
+    allocates when the free list is empty. Callers must not keep references to
+    an entity after releasing it, since it will be handed out again.
+
+    Attributes:
+        cls (type): Entity class the pool produces
+        max_free (int): Most retired entities kept for reuse
+        free (list): Retired entities ready for reuse
+    """
+
+    def __init__(self, cls, max_free=1024):
+        """
+        Initialize an empty pool.
+
+        Args:
+            cls (type): Entity class the pool produces
+            max_free (int): Most retired entities kept for reuse
+        """
+        self.cls = cls
+        self.max_free = max_free
+        self.free = []
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, *args, **kwargs):
+        """
+        Get an entity, reusing a retired one if possible.
+
+        Args:
+            *args, **kwargs: Arguments for the entity class constructor
+
+        Returns:
+            Entity: A freshly initialized entity
+        """
+        if self.free:
+            entity = self.free.pop()
+            entity.__init__(*args, **kwargs)
+            return entity
+        return self.cls(*args, **kwargs)
+
+    def release(self, entity):
+        """
+        Return an entity that is no longer in use.
+
+        Args:
+            entity (Entity): The retired entity
+        """
+        if len(self.free) < self.max_free:
+            self.free.append(entity)
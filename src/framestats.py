@@ -0,0 +1,159 @@
+"""
+Rolling frame timing statistics for the performance overlay.
+
+main.py records every frame's timings (frame time, busy time and the
+simulation, drawing and present phases) into a FrameStats; the overlay
+reads running averages, percentiles and a bottleneck guess from it.
+"""
+
+
+class RollingHistogram:
+    """
+    Histogram of the most recent samples, for cheap running percentiles.
+
+    Samples fall into fixed-width bins (values past the last bin share an
+    overflow bin). The bin of every sample in the window is kept in a ring,
+    so adding a sample once the window is full also removes the oldest one
+    in O(1), and a percentile is one pass over the bins.
+
+    Attributes:
+        window (int): Number of most recent samples covered
+        bin_width (float): Width of each bin
+        bins (list): Sample count per bin (the last one is the overflow bin)
+        count (int): Samples currently in the window
+    """
+
+    def __init__(self, window=600, bin_width=0.25, max_value=100.0):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            window (int): Number of most recent samples covered
+            bin_width (float): Width of each bin
+            max_value (float): Values at or above this go to the overflow bin
+        """
+        self.window = window
+        self.bin_width = bin_width
+        self.bins = [0] * (int(max_value / bin_width) + 1)
+        self._ring = [0] * window
+        self._next = 0
+        self.count = 0
+
+    def add(self, value):
+        """
+        Add a sample, dropping the oldest one if the window is full.
+
+        Args:
+            value (float): The sample (e.g. a frame time in ms)
+        """
+        index = min(max(int(value / self.bin_width), 0), len(self.bins) - 1)
+        if self.count == self.window:
+            self.bins[self._ring[self._next]] -= 1
+        else:
+            self.count += 1
+        self.bins[index] += 1
+        self._ring[self._next] = index
+        self._next = (self._next + 1) % self.window
+
+    def percentile(self, p):
+        """
+        Get an approximate percentile of the samples in the window.
+
+        Args:
+            p (float): Percentile, 0-100
+
+        Returns:
+            float: Upper edge of the bin holding the percentile (0 if there are no samples)
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, -(-self.count * p // 100))  # ceil(count * p / 100)
+        seen = 0
+        for index, n in enumerate(self.bins):
+            seen += n
+            if seen >= target:
+                return (index + 1) * self.bin_width
+        return len(self.bins) * self.bin_width
+
+
+class FrameStats:
+    """
+    Rolling frame timing statistics for the performance overlay.
+
+    Attributes:
+        frame_times (RollingHistogram): Frame times in ms, for percentiles
+        window (int): Number of most recent frames the averages cover
+    """
+
+    # Per-frame timings averaged over the window (all in ms)
+    FIELDS = ('frame', 'busy', 'wait', 'sim', 'draw', 'present')
+
+    def __init__(self, window=600):
+        """
+        Initialize empty statistics.
+
+        Args:
+            window (int): Number of most recent frames covered (600 = 10 seconds at 60 FPS)
+        """
+        self.window = window
+        self.frame_times = RollingHistogram(window)
+        self._samples = []  # Ring of per-frame timing tuples
+        self._sums = [0.0] * len(self.FIELDS)
+        self._next = 0
+
+    def add_frame(self, frame_ms, busy_ms, sim_ms, draw_ms, present_ms):
+        """
+        Record one frame.
+
+        Args:
+            frame_ms (float): Time since the previous frame (Clock.tick())
+            busy_ms (float): Time spent working rather than waiting (Clock.get_rawtime())
+            sim_ms (float): Time spent stepping the simulation
+            draw_ms (float): Time spent drawing
+            present_ms (float): Time spent pushing the frame to the display
+        """
+        sample = (frame_ms, busy_ms, max(frame_ms - busy_ms, 0.0), sim_ms, draw_ms, present_ms)
+        if len(self._samples) < self.window:
+            self._samples.append(sample)
+        else:
+            old = self._samples[self._next]
+            self._sums = [total - value for total, value in zip(self._sums, old)]
+            self._samples[self._next] = sample
+            self._next = (self._next + 1) % self.window
+        self._sums = [total + value for total, value in zip(self._sums, sample)]
+        self.frame_times.add(frame_ms)
+
+    def mean(self, field):
+        """
+        Get the average of a timing over the window.
+
+        Args:
+            field (str): One of FIELDS
+
+        Returns:
+            float: Average in ms (0 if no frames were recorded)
+        """
+        if not self._samples:
+            return 0.0
+        return self._sums[self.FIELDS.index(field)] / len(self._samples)
+
+    @property
+    def fps(self):
+        """Average frames per second over the window."""
+        frame = self.mean('frame')
+        return 1000.0 / frame if frame > 0 else 0.0
+
+    def bottleneck(self):
+        """
+        Guess what is limiting the frame rate.
+
+        Returns:
+            str: 'frame cap' when frames mostly wait, otherwise the biggest of
+                'simulation', 'rendering' and 'present/vsync'
+        """
+        if not self._samples:
+            return 'n/a'
+        if self.mean('wait') > 1.0:
+            return 'frame cap'
+        costs = {'simulation': self.mean('sim'), 'rendering': self.mean('draw'), 'present/vsync': self.mean('present')}
+        return max(costs, key=costs.get)
@@ -1,4 +1,25 @@
+import logging
+import math
+import random
+
 import pygame
+import numpy as np
+from enemies import EnemyStore, ENEMY_SIZE
+from entities import Wall, TempWall, Gap, Barrier, Effect, Tornado, EntityPool
+from spatial import SpatialHash
+from spells import SPELLS, combination_key, find_spell
+
+# Level element types indexed in the collision grid
+INDEXED_TYPES = ('wall', 'gap', 'barrier')
+
+# Short-lived entity classes recycled through pools
+POOLED_CLASSES = (TempWall, Effect, Tornado, Barrier)
+
+# Most enemies moved per tick; crowded levels move them in round-robin batches
+MAX_ENEMY_UPDATES_PER_TICK = 1000
+
+# Gameplay messages (debug level - never printed on the input or tick path)
+logger = logging.getLogger(__name__)
 
 class Player:
     """
@@ -85,7 +106,7 @@ class Player:
         Start attuning with other wizards.
         """
         self.is_attuned = True
-        print(f"{self.element} Wizard is now attuned and can boost other wizards.")
+        logger.debug("%s Wizard is now attuned and can boost other wizards.", self.element)
         
     def stop_attunement(self):
         """
@@ -345,6 +366,7 @@ class SpellCircle:
         spell_effect_timer (int): Timer for how long a spell effect is shown
         game_progress (GameProgress): Reference to the game progress tracker
         target_position (tuple): Mouse cursor position for targeted spell casting
+        combination_key (tuple): Spell registry key of the current elements
     """
     
     def __init__(self, game_progress=None):
@@ -362,6 +384,7 @@ class SpellCircle:
         self.spell_effect_timer = 0
         self.game_progress = game_progress
         self.target_position = (400, 300)  # Default to center of screen
+        self.combination_key = ()
         
     def add_element(self, element, charge_level=100, wizard_id=None):
         """
@@ -377,7 +400,7 @@ class SpellCircle:
         if element in self.elements:
             # If the same element exists, apply resonance bonus
             resonance_bonus = 1.5
-            print(f"Resonance bonus applied for {element}!")
+            logger.debug("Resonance bonus applied for %s!", element)
             
         # Apply charge level with resonance bonus
         boosted_charge = min(100, charge_level * resonance_bonus)
@@ -390,6 +413,9 @@ class SpellCircle:
             # Update the charge level for the existing element
             index = self.elements.index(element)
             self.element_charges[index] = boosted_charge
+        
+        # Keep the registry lookup key in step with the elements
+        self.combination_key = combination_key(self.elements)
             
         # Reset the activation timer (2 seconds at 60 FPS = 120 frames)
         self.activation_timer = 120
@@ -434,14 +460,16 @@ class SpellCircle:
                         self.spell_effect_timer = 180  # 3 seconds at 60 FPS
                         self.elements = []  # Clear the elements after casting
                         self.element_charges = []  # Clear charges too
+                        self.combination_key = ()
                         return (spell_name, spell_power, self.target_position)
                     else:
                         # If spell is not unlocked, show a visual cue
-                        print(f"Spell {spell_name} is not unlocked yet!")
+                        logger.debug("Spell %s is not unlocked yet!", spell_name)
                 
                 # Clear the elements if no valid combo or spell not unlocked
                 self.elements = []
                 self.element_charges = []
+                self.combination_key = ()
         
         return None
     
@@ -458,77 +486,12 @@ class SpellCircle:
             
         avg_charge = sum(self.element_charges) / len(self.element_charges)
         
-        # Get sorted elements for consistent checking
-        elements_with_charges = list(zip(self.elements, self.element_charges))
-        sorted_pairs = sorted(elements_with_charges, key=lambda pair: pair[0])
-        sorted_elements = [pair[0] for pair in sorted_pairs]
-        
-        # Count occurrences of each element
-        element_counts = {}
-        for element in sorted_elements:
-            if element in element_counts:
-                element_counts[element] += 1
-            else:
-                element_counts[element] = 1
-        
-        # Check for multi-cast spells (same element twice or more)
-        if len(sorted_elements) >= 2:
-            # Fire + Fire = Fireball
-            if element_counts.get('Fire', 0) >= 2:
-                return ('Fireball', avg_charge * 1.5)  # Boosted power
-            
-            # Water + Water = Tidal Wave
-            if element_counts.get('Water', 0) >= 2:
-                return ('Tidal Wave', avg_charge * 1.5)
-            
-            # Earth + Earth = Earthquake
-            if element_counts.get('Earth', 0) >= 2:
-                return ('Earthquake', avg_charge * 1.5)
-            
-            # Air + Air = Tornado
-            if element_counts.get('Air', 0) >= 2:
-                return ('Tornado', avg_charge * 1.5)
-        
-        # Check for unique element combinations (original spells)
-        unique_elements = set(sorted_elements)
-        
-        # Two-element combinations
-        if len(unique_elements) == 2:
-            if 'Earth' in unique_elements and 'Fire' in unique_elements:
-                return ('Lava', avg_charge)
-            elif 'Fire' in unique_elements and 'Water' in unique_elements:
-                return ('Steam', avg_charge)
-            elif 'Earth' in unique_elements and 'Water' in unique_elements:
-                return ('Mud', avg_charge)
-            elif 'Air' in unique_elements and 'Fire' in unique_elements:
-                return ('Breeze', avg_charge)
-            elif 'Air' in unique_elements and 'Earth' in unique_elements:
-                return ('Sandstorm', avg_charge)
-            elif 'Air' in unique_elements and 'Water' in unique_elements:
-                return ('Typhoon', avg_charge)
-            # New spell combination for teleportation
-            elif 'Air' in unique_elements and 'Fire' in unique_elements and element_counts.get('Air', 0) >= 1 and element_counts.get('Fire', 0) >= 2:
-                return ('Teleport', avg_charge)
-            # New spell combination for barrier
-            elif 'Water' in unique_elements and 'Earth' in unique_elements and element_counts.get('Water', 0) >= 2 and element_counts.get('Earth', 0) >= 1:
-                return ('Barrier', avg_charge)
-            
-        # Three-element combinations
-        elif len(unique_elements) == 3:
-            if 'Earth' in unique_elements and 'Fire' in unique_elements and 'Water' in unique_elements:
-                return ('Storm', avg_charge)
-            if 'Air' in unique_elements and 'Fire' in unique_elements and 'Water' in unique_elements:
-                return ('Inferno', avg_charge * 1.8)
-            if 'Air' in unique_elements and 'Earth' in unique_elements and 'Water' in unique_elements:
-                return ('Tsunami', avg_charge * 1.8)
-            if 'Air' in unique_elements and 'Earth' in unique_elements and 'Fire' in unique_elements:
-                return ('Volcano', avg_charge * 1.8)
-        
-        # Four-element combinations
-        elif len(unique_elements) == 4:
-            return ('Cataclysm', avg_charge * 2.0)  # Ultimate spell with all elements
+        # Look the combination up in the spell registry
+        spell = find_spell(self.combination_key)
+        if spell is None:
+            return None
             
-        return None
+        return (spell.name, avg_charge * spell.power_multiplier)
 
 class Level:
     """
@@ -539,7 +502,17 @@ class Level:
         level_type (str): Type of level ('puzzle', 'combat', or 'survival')
         objective (str): Description of what the player needs to do
         target_spell (str): The spell needed to complete the objective (if applicable)
-        elements (list): List of level elements like enemies or obstacles
+        elements (list): Every level entity, concatenated from the typed lists (read-only view)
+        walls (list): Permanent Wall entities
+        temp_walls (list): TempWall entities raised by spells
+        gaps (list): Gap entities
+        effects (list): Effect entities (visual only)
+        tornadoes (list): Tornado entities
+        barriers (list): Barrier entities following players
+        pools (dict): Entity class -> EntityPool of retired short-lived entities
+        enemies (EnemyStore): The level's enemies, stored as parallel arrays
+        static_version (int): Bumped whenever permanent walls or gaps change (for render caching)
+        rng (random.Random): Random number generator for spawns and effects
         is_completed (bool): Whether the level has been completed
         timer (int): For survival levels, counts down time remaining
         enemy_spawn_timer (int): For combat/survival levels, timer for spawning enemies
@@ -559,11 +532,31 @@ class Level:
         self.level_type = level_type
         self.objective = objective
         self.target_spell = target_spell
-        self.elements = []
+        self.walls = []
+        self.temp_walls = []
+        self.gaps = []
+        self.effects = []
+        self.tornadoes = []
+        self.barriers = []
         self.is_completed = False
         self.timer = 0
         self.enemy_spawn_timer = 0
         self.players = []  # Initialize empty players list
+        self.collision_grid = SpatialHash()  # Walls, gaps and barriers for collision queries
+        self.enemies = EnemyStore()  # Enemies in structure-of-arrays form
+        self.static_version = 0  # Changes when permanent walls or gaps change
+        self.rng = random.Random()  # Spawn and effect randomness (seeded by Simulation for replays)
+        
+        # Typed list each entity class is kept in
+        self._lists_by_class = {
+            Wall: self.walls,
+            TempWall: self.temp_walls,
+            Gap: self.gaps,
+            Effect: self.effects,
+            Tornado: self.tornadoes,
+            Barrier: self.barriers,
+        }
+        self.pools = {cls: EntityPool(cls) for cls in POOLED_CLASSES}  # Retired short-lived entities
         
         # Set up level elements based on type
         if level_type == 'puzzle':
@@ -579,48 +572,23 @@ class Level:
     def _setup_puzzle(self):
         """Set up elements for a puzzle level."""
         # Add a gap in the middle that needs to be filled
-        self.elements.append({
-            'type': 'gap',
-            'position': (400, 300),
-            'size': (150, 50)
-        })
+        self.add_element(Gap((400, 300), (150, 50)))
         
         # Add some walls to create a more interesting layout
-        self.elements.append({
-            'type': 'wall',
-            'position': (200, 200),
-            'size': (30, 200)
-        })
-        
-        self.elements.append({
-            'type': 'wall',
-            'position': (600, 200),
-            'size': (30, 200)
-        })
+        self.add_element(Wall((200, 200), (30, 200)))
+        
+        self.add_element(Wall((600, 200), (30, 200)))
     
     def _setup_combat(self):
         """Set up elements for a combat level."""
         # Add some enemies
         for i in range(3):
-            self.elements.append({
-                'type': 'enemy',
-                'position': (600, 150 + i * 120),
-                'health': 100,
-                'speed': 1
-            })
+            self.enemies.add((600, 150 + i * 120), health=100, speed=1)
         
         # Add obstacles for strategic positioning
-        self.elements.append({
-            'type': 'wall',
-            'position': (400, 150),
-            'size': (50, 50)
-        })
-        
-        self.elements.append({
-            'type': 'wall',
-            'position': (400, 400),
-            'size': (50, 50)
-        })
+        self.add_element(Wall((400, 150), (50, 50)))
+        
+        self.add_element(Wall((400, 400), (50, 50)))
         
         self.enemy_spawn_timer = 300  # 5 seconds at 60 FPS
     
@@ -631,34 +599,54 @@ class Level:
         
         # Add some initial enemies
         for i in range(2):
-            self.elements.append({
-                'type': 'enemy',
-                'position': (600, 200 + i * 200),
-                'health': 100,
-                'speed': 2
-            })
+            self.enemies.add((600, 200 + i * 200), health=100, speed=2)
         
         # Add protective barriers players can hide behind
-        self.elements.append({
-            'type': 'wall',
-            'position': (200, 150),
-            'size': (80, 20)
-        })
-        
-        self.elements.append({
-            'type': 'wall',
-            'position': (200, 350),
-            'size': (80, 20)
-        })
-        
-        self.elements.append({
-            'type': 'wall',
-            'position': (350, 250),
-            'size': (20, 100)
-        })
+        self.add_element(Wall((200, 150), (80, 20)))
+        
+        self.add_element(Wall((200, 350), (80, 20)))
+        
+        self.add_element(Wall((350, 250), (20, 100)))
         
         self.enemy_spawn_timer = 180  # 3 seconds at 60 FPS
     
+    @property
+    def elements(self):
+        """Every level entity as one list (a compatibility view - add and remove through the Level)."""
+        return self.gaps + self.walls + self.temp_walls + self.barriers + self.effects + self.tornadoes
+    
+    def entity_counts(self):
+        """
+        Count the level's entities by kind (without building the elements list).
+    
+        Returns:
+            dict: Kind -> number of entities, enemies included
+        """
+        return {
+            'walls': len(self.walls),
+            'temp walls': len(self.temp_walls),
+            'gaps': len(self.gaps),
+            'barriers': len(self.barriers),
+            'effects': len(self.effects),
+            'tornadoes': len(self.tornadoes),
+            'enemies': len(self.enemies),
+        }
+    
+    def add_element(self, elem):
+        """
+        Add an entity to its typed list, indexing walls, gaps and barriers for collision queries.
+        
+        Args:
+            elem (Entity): The level entity to add
+        """
+        entities = self._lists_by_class[type(elem)]
+        elem._index = len(entities)
+        entities.append(elem)
+        if elem.type in INDEXED_TYPES:
+            self.collision_grid.insert(elem, elem.x, elem.y, elem.w, elem.h)
+        if elem.static:
+            self.static_version += 1
+    
     def is_position_blocked(self, position, size):
         """
         Check if a position is blocked by any obstacle.
@@ -670,51 +658,224 @@ class Level:
         Returns:
             bool: True if the position is blocked
         """
-        # Create a test object
-        test_obj = {
-            'position': position,
-            'size': size
-        }
-        
-        # Check collision with each wall element
-        for elem in self.elements:
-            if elem['type'] == 'wall':
-                # Simple AABB collision check
-                x1, y1 = test_obj['position']
-                x2, y2 = elem['position']
-                
-                # Check size format
-                w1, h1 = test_obj['size'] if isinstance(test_obj['size'], tuple) else (test_obj['size'], test_obj['size'])
-                w2, h2 = elem['size']
-                
-                # Check for collision
-                if (x1 < x2 + w2 and
-                    x1 + w1 > x2 and
-                    y1 < y2 + h2 and
-                    y1 + h1 > y2):
-                    return True
-                    
-        # Also check screen boundaries
         x, y = position
         w, h = size if isinstance(size, tuple) else (size, size)
         
+        # Check screen boundaries first, they are the cheapest test
         if x < 0 or y < 0 or x + w > 800 or y + h > 600:
             return True
+        
+        # Only walls near the position can block it
+        for elem in self.collision_grid.query(x, y, w, h):
+            if elem.solid:
+                return True
             
         return False
     
-    def update(self, active_spell=None, spell_power=100, target_position=None):
+    def blocked_mask(self, xs, ys, size):
         """
-        Update the level state based on elapsed time and player actions.
+        Check many positions at once (the bulk version of is_position_blocked).
+        
+        Each nearby wall is only tested against the positions that overlap it
+        along x (a run of the x-sorted positions), so a screen-wide batch costs
+        far less than every wall against every position.
         
         Args:
-            active_spell (str or None): The currently active spell
-            spell_power (float): The power level of the active spell (0-100)
+            xs, ys (ndarray): X and Y positions to check
+            size (int or tuple): Size of the objects
+            
+        Returns:
+            ndarray: Boolean mask, True where the position is blocked
+        """
+        w, h = size if isinstance(size, tuple) else (size, size)
+        
+        # Screen boundaries
+        blocked = (xs < 0) | (ys < 0) | (xs + w > 800) | (ys + h > 600)
+        if len(xs) == 0:
+            return blocked
+        
+        # Only walls near the batch can block it
+        x0, y0 = xs.min(), ys.min()
+        walls = [(elem.x, elem.y, elem.w, elem.h)
+                 for elem in self.collision_grid.query(x0, y0, xs.max() + w - x0, ys.max() + h - y0) if elem.solid]
+        if not walls:
+            return blocked
+        wall_x, wall_y, wall_w, wall_h = np.array(walls, dtype=np.float64).T
+        
+        # Sort the positions by x, so the positions a wall overlaps along x are one
+        # run, and test each wall only against its run
+        order = np.argsort(xs)
+        sorted_xs = xs[order]
+        sorted_ys = ys[order]
+        starts = np.searchsorted(sorted_xs + w, wall_x, side='right').tolist()
+        stops = np.searchsorted(sorted_xs, wall_x + wall_w, side='left').tolist()
+        bottoms = (wall_y + wall_h).tolist()
+        hit = np.zeros(len(xs), dtype=bool)
+        for start, stop, top, bottom in zip(starts, stops, wall_y.tolist(), bottoms):
+            if start < stop:
+                run = sorted_ys[start:stop]
+                hit[start:stop] |= (run < bottom) & (run + h > top)
+        blocked[order] |= hit
+        return blocked
+    
+    def _move_enemies(self, indices, new_xs, new_ys):
+        """
+        Move enemies to new positions, skipping every move that would end blocked.
+        
+        Args:
+            indices (ndarray): Indices of the enemies to move
+            new_xs, new_ys (ndarray): Their new positions
+            
+        Returns:
+            bool: True if any enemy moved
+        """
+        free = ~self.blocked_mask(new_xs, new_ys, ENEMY_SIZE)
+        self.enemies.live('x')[indices[free]] = new_xs[free]
+        self.enemies.live('y')[indices[free]] = new_ys[free]
+        return bool(free.any())
+    
+    def _apply_tornadoes(self):
+        """
+        Pull and damage enemies with every active tornado in one batched pass.
+        
+        The pulls of all tornadoes are summed into one displacement per enemy,
+        and the resulting moves are checked against walls in bulk.
+        
+        Returns:
+            bool: True if any tornado is active
+        """
+        if not self.tornadoes:
+            return False
+        
+        enemies = self.enemies
+        if len(enemies):
+            xs, ys = enemies.live('x'), enemies.live('y')
+            shift_x = np.zeros(len(enemies))
+            shift_y = np.zeros(len(enemies))
+            damage = np.zeros(len(enemies))
+            
+            for elem in self.tornadoes:
+                tornado_x, tornado_y = elem.x, elem.y
+                tornado_radius = elem.radius
+                
+                # Enemies near this tornado
+                distance = enemies.distances_to((tornado_x, tornado_y))
+                caught = distance <= tornado_radius
+                
+                # Pull enemies toward tornado center, stronger closer to center
+                pulled = caught & (distance > 0)  # Avoid division by zero
+                pull = elem.pull * (1 - distance[pulled] / tornado_radius) / distance[pulled]
+                shift_x[pulled] += (tornado_x - xs[pulled]) * pull
+                shift_y[pulled] += (tornado_y - ys[pulled]) * pull
+                damage[caught] += elem.damage
+            
+            # Move every pulled enemy whose destination is free
+            moving = np.flatnonzero((shift_x != 0) | (shift_y != 0))
+            self._move_enemies(moving, xs[moving] + shift_x[moving], ys[moving] + shift_y[moving])
+            
+            # Apply damage and remove enemies with no health
+            enemies.live('health')[:] -= damage
+            enemies.remove_dead()
+        
+        # Move the tornadoes slightly in a random direction
+        for elem in self.tornadoes:
+            elem.x += self.rng.uniform(-1, 1)
+            elem.y += self.rng.uniform(-1, 1)
+        return True
+    
+    def _apply_barrier_pushes(self):
+        """
+        Push enemies out of every barrier in one batched pass.
+        
+        Returns:
+            bool: True if any enemy was pushed
+        """
+        enemies = self.enemies
+        if not self.barriers or not len(enemies):
+            return False
+        
+        xs, ys = enemies.live('x'), enemies.live('y')
+        shift_x = np.zeros(len(enemies))
+        shift_y = np.zeros(len(enemies))
+        push_strength = 5
+        
+        for elem in self.barriers:
+            barrier_x, barrier_y = elem.x, elem.y
+            barrier_w, barrier_h = elem.w, elem.h
+            
+            # Check which enemies (40x40) collide with the barrier
+            blocked = ((xs < barrier_x + barrier_w) & (xs + 40 > barrier_x) &
+                       (ys < barrier_y + barrier_h) & (ys + 40 > barrier_y))
+            if not blocked.any():
+                continue
+            
+            # Push enemies away from the barrier center along the normalized direction
+            dx = xs[blocked] - (barrier_x + barrier_w / 2)
+            dy = ys[blocked] - (barrier_y + barrier_h / 2)
+            length = np.maximum(1, np.hypot(dx, dy))
+            shift_x[blocked] += dx / length * push_strength
+            shift_y[blocked] += dy / length * push_strength
+        
+        moving = np.flatnonzero((shift_x != 0) | (shift_y != 0))
+        if len(moving) == 0:
+            return False
+        return self._move_enemies(moving, xs[moving] + shift_x[moving], ys[moving] + shift_y[moving])
+    
+    def spawn(self, cls, *args, **kwargs):
+        """
+        Create a short-lived entity from its pool and add it to the level.
+        
+        Args:
+            cls (type): One of POOLED_CLASSES
+            *args, **kwargs: Arguments for the entity class constructor
+            
+        Returns:
+            Entity: The new entity
+        """
+        elem = self.pools[cls].acquire(*args, **kwargs)
+        self.add_element(elem)
+        return elem
+    
+    def remove_element(self, elem):
+        """
+        Remove an entity from its typed list and the collision index.
+        
+        Removal is O(1): the last entity of the list takes the removed one's
+        slot. Pooled entities go back to their pool for reuse.
+        
+        Args:
+            elem (Entity): The level entity to remove
+        """
+        entities = self._lists_by_class[type(elem)]
+        last = entities.pop()
+        if last is not elem:
+            entities[elem._index] = last
+            last._index = elem._index
+        
+        self.collision_grid.remove(elem)
+        if elem.static:
+            self.static_version += 1
+        
+        pool = self.pools.get(type(elem))
+        if pool is not None:
+            pool.release(elem)
+    
+    def apply_spell(self, active_spell, spell_power=100, target_position=None):
+        """
+        Apply the one-shot effect of an activated spell.
+        
+        Args:
+            active_spell (str): The activated spell
+            spell_power (float): The power level of the spell (0-100)
             target_position (tuple): The (x, y) position to target the spell effect
             
         Returns:
             bool: True if level state changed (completed, enemy died, etc.)
         """
+        # Spells have no effect once the level is done
+        if self.is_completed:
+            return False
+        
         # Use center of screen if no target position provided
         if target_position is None:
             target_position = (400, 300)
@@ -724,385 +885,61 @@ class Level:
         # Calculate power multiplier (0.5 - 1.5 based on spell power)
         power_multiplier = 0.5 + (spell_power / 100)
         
-        # Check for level completion
+        if self.level_type == 'puzzle' and active_spell == self.target_spell:
+            # In puzzle levels, casting the target spell completes the level
+            # For puzzles, we might require a minimum power level
+            if spell_power >= 60:  # At least 60% charge required
+                self.is_completed = True
+                state_changed = True
+            else:
+                # Not enough power - show some feedback in the console
+                logger.debug("Spell not powerful enough (%.1f%%). Need at least 60%%.", spell_power)
+        
+        # Apply the spell's effect for this level type through the effect table
+        spell = SPELLS.get(active_spell)
+        effect = spell.effects.get(self.level_type) if spell else None
+        if effect is not None:
+            apply_effect = self.SPELL_EFFECTS[effect]
+            if apply_effect(self, spell.params_for(self.level_type), power_multiplier, target_position):
+                state_changed = True
+        
+        return state_changed
+    
+    def tick(self):
+        """
+        Advance the level world by one simulation tick.
+        
+        Runs every tick whether or not a spell was cast: objective timers and
+        spawning, timed elements, tornadoes, stuns, enemy movement and barriers.
+        Only the active lists are walked (never self.elements), so a tick costs
+        time in proportion to what is actually alive. Stuns and enemy movement
+        are capped at MAX_ENEMY_UPDATES_PER_TICK enemies: beyond that, each tick
+        moves the next batch in round-robin order and every enemy catches up on
+        the ticks it waited, so a crowded level costs a bounded amount per tick
+        while its enemies keep their average speed. Tornado pulls and barrier
+        pushes only run while those are active and still cover every enemy.
+        
+        Returns:
+            bool: True if level state changed (completed, enemy spawned or died, etc.)
+        """
+        state_changed = False
+        enemies = self.enemies
+        
+        # Check for level completion and spawn enemies
         if not self.is_completed:
-            if self.level_type == 'puzzle' and active_spell == self.target_spell:
-                # In puzzle levels, casting the target spell completes the level
-                # For puzzles, we might require a minimum power level
-                if spell_power >= 60:  # At least 60% charge required
-                    self.is_completed = True
-                    state_changed = True
-                else:
-                    # Not enough power - show some feedback in the console
-                    print(f"Spell not powerful enough ({spell_power:.1f}%). Need at least 60%.")
-            
-            elif self.level_type == 'combat':
+            if self.level_type == 'combat':
                 # In combat levels, check if all enemies are defeated
-                if not any(elem['type'] == 'enemy' for elem in self.elements):
+                if len(enemies) == 0:
                     self.is_completed = True
                     state_changed = True
                 
                 # Update enemy spawn timer
                 self.enemy_spawn_timer -= 1
-                if self.enemy_spawn_timer <= 0 and len([e for e in self.elements if e['type'] == 'enemy']) < 5:
+                if self.enemy_spawn_timer <= 0 and len(enemies) < 5:
                     # Spawn a new enemy
-                    import random
-                    self.elements.append({
-                        'type': 'enemy',
-                        'position': (random.randint(500, 700), random.randint(100, 500)),
-                        'health': 100,
-                        'speed': 1
-                    })
+                    enemies.add((self.rng.randint(500, 700), self.rng.randint(100, 500)), health=100, speed=1)
                     self.enemy_spawn_timer = 300  # Reset timer
                     state_changed = True
-                
-                # Check for spell damage to enemies - scale damage by spell power
-                if active_spell == 'Lava':
-                    # Lava damages enemies (base damage scaled by power)
-                    damage = 2 * power_multiplier
-                    # Get the spell's area of effect radius based on power
-                    aoe_radius = 100 * power_multiplier
-                    
-                    for elem in self.elements:
-                        if elem['type'] == 'enemy':
-                            # Calculate distance from spell target to enemy
-                            enemy_x, enemy_y = elem['position']
-                            import math
-                            distance = math.sqrt((enemy_x - target_position[0])**2 + (enemy_y - target_position[1])**2)
-                            
-                            # Only affect enemies within the area of effect
-                            if distance <= aoe_radius:
-                                # Apply damage with distance falloff (more damage closer to center)
-                                falloff = 1 - (distance / aoe_radius)
-                                actual_damage = damage * falloff
-                                elem['health'] -= actual_damage
-                                if elem['health'] <= 0:
-                                    self.elements.remove(elem)
-                                    state_changed = True
-                
-                elif active_spell == 'Steam':
-                    # Steam slows enemies (slow effect scaled by power)
-                    slow_factor = 0.4 * power_multiplier
-                    # Get the spell's area of effect radius
-                    aoe_radius = 120 * power_multiplier
-                    
-                    for elem in self.elements:
-                        if elem['type'] == 'enemy':
-                            # Calculate distance from spell target to enemy
-                            enemy_x, enemy_y = elem['position']
-                            import math
-                            distance = math.sqrt((enemy_x - target_position[0])**2 + (enemy_y - target_position[1])**2)
-                            
-                            # Only affect enemies within the area of effect
-                            if distance <= aoe_radius:
-                                # Apply slow effect with distance falloff
-                                falloff = 1 - (distance / aoe_radius)
-                                elem['speed'] = max(0.2, elem['speed'] - (slow_factor * falloff))
-                
-                elif active_spell == 'Mud':
-                    # Mud slows and damages enemies
-                    damage = 1 * power_multiplier
-                    slow_factor = 0.3 * power_multiplier
-                    # Get the spell's area of effect radius
-                    aoe_radius = 110 * power_multiplier
-                    
-                    for elem in self.elements:
-                        if elem['type'] == 'enemy':
-                            # Calculate distance from spell target to enemy
-                            enemy_x, enemy_y = elem['position']
-                            import math
-                            distance = math.sqrt((enemy_x - target_position[0])**2 + (enemy_y - target_position[1])**2)
-                            
-                            # Only affect enemies within the area of effect
-                            if distance <= aoe_radius:
-                                # Apply effects with distance falloff
-                                falloff = 1 - (distance / aoe_radius)
-                                elem['health'] -= damage * falloff
-                                elem['speed'] = max(0.1, elem['speed'] - (slow_factor * falloff))
-                                if elem['health'] <= 0:
-                                    self.elements.remove(elem)
-                                    state_changed = True
-                
-                elif active_spell == 'Storm':
-                    # Storm damages all enemies at once (powerful combo spell)
-                    damage = 5 * power_multiplier
-                    # Larger area of effect for this powerful spell
-                    aoe_radius = 200 * power_multiplier
-                    
-                    enemies_to_remove = []
-                    for i, elem in enumerate(self.elements):
-                        if elem['type'] == 'enemy':
-                            # Calculate distance from spell target to enemy
-                            enemy_x, enemy_y = elem['position']
-                            import math
-                            distance = math.sqrt((enemy_x - target_position[0])**2 + (enemy_y - target_position[1])**2)
-                            
-                            # Only affect enemies within the area of effect
-                            if distance <= aoe_radius:
-                                # Apply damage with distance falloff
-                                falloff = 1 - (distance / aoe_radius)
-                                elem['health'] -= damage * falloff
-                                if elem['health'] <= 0:
-                                    enemies_to_remove.append(i)
-                    
-                    # Remove dead enemies (in reverse order to avoid index issues)
-                    for i in sorted(enemies_to_remove, reverse=True):
-                        self.elements.pop(i)
-                        state_changed = True
-
-                # Implement teleport spell effect
-                elif active_spell == 'Teleport':
-                    # Teleport moves all players to the target position
-                    if self.players:  # Make sure we have players
-                        # Spread the players around the target point
-                        angles = [0, 120, 240]  # Spread players evenly
-                        distance = 40 * power_multiplier  # Distance from target, scales with power
-                        
-                        for i, player in enumerate(self.players):
-                            if i < len(angles):
-                                angle_rad = angles[i] * 3.14159 / 180
-                                import math
-                                new_x = target_position[0] + distance * math.cos(angle_rad)
-                                new_y = target_position[1] + distance * math.sin(angle_rad)
-                                # Make sure the position is valid
-                                if not self.is_position_blocked((new_x, new_y), player.size):
-                                    player.position = (new_x, new_y)
-                                    print(f"Teleported {player.element} Wizard to ({new_x:.1f}, {new_y:.1f})")
-                        state_changed = True
-
-                # Implement barrier spell effect
-                elif active_spell == 'Barrier':
-                    # Create a barrier wall at the target position
-                    barrier_size = int(60 + (40 * power_multiplier))  # Size scales with power
-                    
-                    # Create a barrier element
-                    self.elements.append({
-                        'type': 'wall',
-                        'position': (target_position[0] - barrier_size/2, target_position[1] - barrier_size/2),
-                        'size': (barrier_size, barrier_size),
-                        'temp': True,  # This is a temporary wall
-                        'timer': int(300 * power_multiplier)  # 5 seconds * power multiplier
-                    })
-                    print(f"Created barrier at ({target_position[0]}, {target_position[1]})")
-                    state_changed = True
-                
-                # Implementation for multi-cast spells
-                elif active_spell == 'Fireball':
-                    # Fireball: Powerful fire attack that damages enemies in a larger area
-                    damage = 10 * power_multiplier  # High base damage
-                    radius = 150 * power_multiplier  # Large area of effect
-                    
-                    enemies_to_remove = []
-                    for i, elem in enumerate(self.elements):
-                        if elem['type'] == 'enemy':
-                            # Calculate distance from fireball center
-                            enemy_x, enemy_y = elem['position']
-                            import math
-                            distance = math.sqrt((enemy_x - target_position[0])**2 + (enemy_y - target_position[1])**2)
-                            
-                            # If within radius, apply damage (more damage closer to center)
-                            if distance <= radius:
-                                # Damage falls off with distance
-                                distance_factor = 1 - (distance / radius)
-                                actual_damage = damage * distance_factor
-                                elem['health'] -= actual_damage
-                                
-                                if elem['health'] <= 0:
-                                    enemies_to_remove.append(i)
-                    
-                    # Remove dead enemies
-                    for i in sorted(enemies_to_remove, reverse=True):
-                        self.elements.pop(i)
-                        state_changed = True
-                    
-                    # Add a visual effect element
-                    self.elements.append({
-                        'type': 'effect',
-                        'effect_type': 'explosion',
-                        'position': target_position,
-                        'radius': radius,
-                        'timer': 60,  # 1 second
-                        'color': (255, 100, 0)  # Orange-red
-                    })
-                
-                elif active_spell == 'Tidal Wave':
-                    # Tidal Wave: Pushes enemies away and damages them
-                    damage = 5 * power_multiplier
-                    push_strength = 20 * power_multiplier
-                    
-                    if self.players:
-                        # Get the position of the Water wizard to launch from
-                        water_wizard = next((p for p in self.players if p.element == 'Water'), self.players[0])
-                        center_x, center_y = water_wizard.position
-                        
-                        for elem in self.elements:
-                            if elem['type'] == 'enemy':
-                                # Calculate direction from wave center to enemy
-                                enemy_x, enemy_y = elem['position']
-                                import math
-                                distance = math.sqrt((enemy_x - center_x)**2 + (enemy_y - center_y)**2)
-                                
-                                if distance > 0:  # Avoid division by zero
-                                    # Unit direction vector
-                                    dir_x = (enemy_x - center_x) / distance
-                                    dir_y = (enemy_y - center_y) / distance
-                                    
-                                    # Push enemy and apply damage
-                                    new_x = enemy_x + (dir_x * push_strength)
-                                    new_y = enemy_y + (dir_y * push_strength)
-                                    
-                                    # Apply damage
-                                    elem['health'] -= damage
-                                    
-                                    # Update position if not blocked
-                                    if not self.is_position_blocked((new_x, new_y), elem.get('size', 50)):
-                                        elem['position'] = (new_x, new_y)
-                                        state_changed = True
-                        
-                        # Remove enemies with no health
-                        self.elements = [e for e in self.elements if e['type'] != 'enemy' or e['health'] > 0]
-                        
-                        # Add a visual effect
-                        self.elements.append({
-                            'type': 'effect',
-                            'effect_type': 'wave',
-                            'position': (center_x, center_y),
-                            'radius': 0,  # Start small
-                            'max_radius': 200,  # Grow to this size
-                            'timer': 60,  # 1 second
-                            'color': (0, 100, 255)  # Blue
-                        })
-                
-                elif active_spell == 'Earthquake':
-                    # Earthquake: Stuns enemies and damages them over time
-                    damage = 3 * power_multiplier
-                    stun_duration = int(120 * power_multiplier)  # 2 seconds at 60 FPS
-                    
-                    if self.players:
-                        # Get the position of the Earth wizard to launch from
-                        earth_wizard = next((p for p in self.players if p.element == 'Earth'), self.players[0])
-                        
-                        for elem in self.elements:
-                            if elem['type'] == 'enemy':
-                                # Apply damage
-                                elem['health'] -= damage
-                                
-                                # Stun the enemy
-                                elem['stunned'] = True
-                                elem['stun_timer'] = stun_duration
-                                
-                                # Stop movement while stunned
-                                elem['original_speed'] = elem.get('speed', 1)
-                                elem['speed'] = 0
-                                
-                                state_changed = True
-                        
-                        # Remove enemies with no health
-                        self.elements = [e for e in self.elements if e['type'] != 'enemy' or e['health'] > 0]
-                        
-                        # Add a visual effect
-                        self.elements.append({
-                            'type': 'effect',
-                            'effect_type': 'earthquake',
-                            'position': (400, 300),  # Center of screen
-                            'timer': 90,  # 1.5 seconds
-                            'color': (139, 69, 19)  # Brown
-                        })
-                
-                elif active_spell == 'Tornado':
-                    # Tornado: Pulls enemies toward the center and damages them
-                    damage = 1 * power_multiplier  # Lower damage but continuous
-                    pull_strength = 5 * power_multiplier
-                    tornado_duration = int(180 * power_multiplier)  # 3 seconds at 60 FPS
-                    
-                    # Create a persistent tornado effect
-                    if self.players:
-                        # Get the position of an Air-casting wizard
-                        air_wizard = next((p for p in self.players if p.casting_element == 'Air'), self.players[0])
-                        center_x, center_y = air_wizard.position
-                        
-                        # Create the tornado element
-                        self.elements.append({
-                            'type': 'tornado',
-                            'position': (center_x, center_y),
-                            'radius': 120 * power_multiplier,
-                            'damage': damage,
-                            'pull': pull_strength,
-                            'timer': tornado_duration,
-                            'color': (200, 200, 200)  # Light gray
-                        })
-                        
-                        state_changed = True
-                    
-                # Let's also handle any temporary elements like barriers or effects
-                elements_to_remove = []
-                for i, elem in enumerate(self.elements):
-                    # Handle temporary walls like barriers
-                    if elem.get('type') == 'wall' and elem.get('temp', False):
-                        elem['timer'] = elem.get('timer', 0) - 1
-                        if elem['timer'] <= 0:
-                            elements_to_remove.append(i)
-                    
-                    # Handle effect elements
-                    elif elem.get('type') == 'effect':
-                        elem['timer'] = elem.get('timer', 0) - 1
-                        if elem['timer'] <= 0:
-                            elements_to_remove.append(i)
-                        
-                        # Handle expanding effects
-                        if elem.get('effect_type') == 'wave' and 'max_radius' in elem:
-                            elem['radius'] = min(elem.get('max_radius', 100), 
-                                              elem.get('radius', 0) + elem.get('max_radius', 100) / elem.get('timer', 60))
-                    
-                    # Handle tornado elements
-                    elif elem.get('type') == 'tornado':
-                        elem['timer'] = elem.get('timer', 0) - 1
-                        if elem['timer'] <= 0:
-                            elements_to_remove.append(i)
-                        else:
-                            # Apply tornado effects to enemies
-                            tornado_x, tornado_y = elem['position']
-                            tornado_radius = elem['radius']
-                            
-                            for enemy in [e for e in self.elements if e['type'] == 'enemy']:
-                                enemy_x, enemy_y = enemy['position']
-                                import math
-                                distance = math.sqrt((enemy_x - tornado_x)**2 + (enemy_y - tornado_y)**2)
-                                
-                                if distance <= tornado_radius:
-                                    # Pull enemy toward tornado center
-                                    pull = elem['pull'] * (1 - distance/tornado_radius)  # Stronger pull closer to center
-                                    
-                                    # Calculate direction toward tornado center
-                                    if distance > 0:  # Avoid division by zero
-                                        dir_x = (tornado_x - enemy_x) / distance
-                                        dir_y = (tornado_y - enemy_y) / distance
-                                        
-                                        # Update enemy position
-                                        new_x = enemy_x + (dir_x * pull)
-                                        new_y = enemy_y + (dir_y * pull)
-                                        
-                                        if not self.is_position_blocked((new_x, new_y), enemy.get('size', 50)):
-                                            enemy['position'] = (new_x, new_y)
-                                    
-                                    # Apply damage
-                                    enemy['health'] -= elem['damage']
-                            
-                            # Remove enemies with no health
-                            self.elements = [e for e in self.elements if e['type'] != 'enemy' or e['health'] > 0]
-                            
-                            # Move the tornado slightly in a random direction
-                            import random
-                            tornado_x += random.uniform(-1, 1)
-                            tornado_y += random.uniform(-1, 1)
-                            elem['position'] = (tornado_x, tornado_y)
-                        
-                            state_changed = True
-                    
-                # Remove expired elements
-                for i in sorted(elements_to_remove, reverse=True):
-                    self.elements.pop(i)
-                    state_changed = True
             
             elif self.level_type == 'survival':
                 # In survival levels, check if timer ran out
@@ -1115,139 +952,312 @@ class Level:
                 self.enemy_spawn_timer -= 1
                 if self.enemy_spawn_timer <= 0:
                     # Spawn a new enemy
-                    import random
-                    self.elements.append({
-                        'type': 'enemy',
-                        'position': (random.randint(500, 700), random.randint(100, 500)),
-                        'health': 100,
-                        'speed': 2
-                    })
+                    enemies.add((self.rng.randint(500, 700), self.rng.randint(100, 500)), health=100, speed=2)
                     self.enemy_spawn_timer = 120  # Shorter timer for survival
                     state_changed = True
-                
-                # Check for spell effects on enemies
-                if active_spell == 'Steam':
-                    # Steam slows down enemies
-                    for elem in self.elements:
-                        if elem['type'] == 'enemy':
-                            elem['speed'] = 0.5  # Slowed
-                elif active_spell == 'Lava':
-                    # Lava damages enemies
-                    for elem in self.elements:
-                        if elem['type'] == 'enemy':
-                            elem['health'] -= 1
-                            if elem['health'] <= 0:
-                                self.elements.remove(elem)
-                
-                # Teleport spell effect for both combat and survival levels
-                elif active_spell == 'Teleport':
-                    # Teleport all players to random safe positions
-                    for player in self.players:
-                        # Find a new random position
-                        for _ in range(10):  # Try up to 10 times to find a safe position
-                            new_x = random.randint(50, 750)
-                            new_y = random.randint(50, 550)
-                            new_position = (new_x, new_y)
-                            
-                            # Check if the position is blocked by any level element
-                            if not self.is_position_blocked(new_position, (40, 40)):
-                                # Set the player's position to the new safe position
-                                player.position = new_position
-                                break
-                    
-                    # Teleport spell also damages nearby enemies
-                    teleport_range = 150 * power_multiplier
-                    for player in self.players:
-                        for elem in self.elements[:]:  # Use a copy to safely remove elements
-                            if elem['type'] == 'enemy':
-                                # Calculate distance from player to enemy
-                                dx = player.position[0] - elem['position'][0]
-                                dy = player.position[1] - elem['position'][1]
-                                distance = (dx**2 + dy**2)**0.5
-                                
-                                # If enemy is within teleport range, damage it
-                                if distance < teleport_range:
-                                    elem['health'] -= 10 * power_multiplier
-                                    if elem['health'] <= 0:
-                                        self.elements.remove(elem)
-                                        state_changed = True
-                
-                # Barrier spell effect for both combat and survival levels
-                elif active_spell == 'Barrier':
-                    # Create barriers around each player
-                    barrier_duration = int(300 * power_multiplier)  # 5 seconds (60 FPS) scaled by power
-                    barrier_size = int(80 * power_multiplier)
-                    
-                    for player in self.players:
-                        # Create a barrier element with the player's position
-                        barrier = {
-                            'type': 'barrier',
-                            'position': (player.position[0] - barrier_size // 2, player.position[1] - barrier_size // 2),
-                            'size': (barrier_size, barrier_size),
-                            'duration': barrier_duration,
-                            'player_id': id(player)  # Store the player ID to follow the player
-                        }
-                        self.elements.append(barrier)
-                        state_changed = True
-        
-        # Update enemy positions (they move toward the players)
-        for elem in self.elements:
-            if elem['type'] == 'enemy':
-                # Simple AI: move toward center-left of screen
-                target_x, target_y = 200, 300
-                dx = target_x - elem['position'][0]
-                dy = target_y - elem['position'][1]
-                
-                # Normalize and apply speed
-                distance = max(1, (dx**2 + dy**2)**0.5)  # avoid division by zero
-                elem['position'] = (
-                    elem['position'][0] + (dx / distance) * elem['speed'],
-                    elem['position'][1] + (dy / distance) * elem['speed']
-                )
-                state_changed = True
+        
+        # Count down temporary walls
+        expired = []
+        for elem in self.temp_walls:
+            elem.timer -= 1
+            if elem.timer <= 0:
+                expired.append(elem)
+        
+        # Count down visual effects
+        for elem in self.effects:
+            elem.timer -= 1
+            if elem.timer <= 0:
+                expired.append(elem)
+            
+            # Handle expanding effects
+            elif elem.effect_type == 'wave' and elem.max_radius is not None:
+                elem.radius = min(elem.max_radius, elem.radius + elem.max_radius / elem.timer)
+        
+        # Count down tornadoes, then let the remaining ones pull and damage enemies
+        for elem in self.tornadoes:
+            elem.timer -= 1
+            if elem.timer <= 0:
+                expired.append(elem)
+        
+        # Remove expired elements
+        for elem in expired:
+            self.remove_element(elem)
+            state_changed = True
+        
+        if self._apply_tornadoes():
+            state_changed = True
+        
+        if len(enemies):
+            # Enemies to update this tick (all of them unless the level is crowded),
+            # with the ticks each one has to catch up on
+            picked, elapsed = enemies.schedule(MAX_ENEMY_UPDATES_PER_TICK)
+            
+            # Count down stuns and give recovered enemies their speed back
+            stun_timer = enemies.live('stun_timer')[picked]
+            speed = enemies.live('speed')[picked]
+            stunned = stun_timer > 0
+            if stunned.any():
+                stun_timer[stunned] -= elapsed[stunned]
+                recovered = stunned & (stun_timer <= 0)
+                speed[recovered] = enemies.live('original_speed')[picked][recovered]
+                enemies.live('stun_timer')[picked] = stun_timer
+                enemies.live('speed')[picked] = speed
+            
+            # Update enemy positions (they move toward the players)
+            # Simple AI: move toward center-left of screen
+            target_x, target_y = 200, 300
+            xs, ys = enemies.live('x')[picked], enemies.live('y')[picked]
+            dx = target_x - xs
+            dy = target_y - ys
+            
+            # Normalize and apply speed
+            distance = np.maximum(1, np.hypot(dx, dy))  # avoid division by zero
+            step = speed * elapsed
+            enemies.live('x')[picked] = xs + (dx / distance) * step
+            enemies.live('y')[picked] = ys + (dy / distance) * step
+            state_changed = True
         
         # Update barriers
-        for elem in self.elements[:]:  # Use a copy to safely remove elements
-            if elem['type'] == 'barrier':
-                # Reduce duration
-                elem['duration'] -= 1
+        for elem in self.barriers[:]:  # Use a copy to safely remove elements
+            # Reduce duration
+            elem.duration -= 1
+            
+            # Remove if duration expired
+            if elem.duration <= 0:
+                self.remove_element(elem)
+                state_changed = True
+            else:
+                # Update barrier position to follow player
+                for player in self.players:
+                    if id(player) == elem.player_id:
+                        elem.x = player.position[0] - elem.w // 2
+                        elem.y = player.position[1] - elem.w // 2
+                        self.collision_grid.move(elem, elem.x, elem.y, elem.w, elem.h)
+        
+        # Check if barriers block enemies
+        if self._apply_barrier_pushes():
+            state_changed = True
+        
+        return state_changed
+    
+    def update(self, active_spell=None, spell_power=100, target_position=None):
+        """
+        Apply a spell (if any) and advance the level by one tick.
+        
+        Simulation calls apply_spell() when a spell fires and tick() every
+        tick; this combines the two for code that drives a level directly.
+        
+        Args:
+            active_spell (str or None): The currently active spell
+            spell_power (float): The power level of the active spell (0-100)
+            target_position (tuple): The (x, y) position to target the spell effect
+            
+        Returns:
+            bool: True if level state changed (completed, enemy died, etc.)
+        """
+        state_changed = False
+        if active_spell is not None:
+            state_changed = self.apply_spell(active_spell, spell_power, target_position)
+        if self.tick():
+            state_changed = True
+        return state_changed
                 
-                # Remove if duration expired
-                if elem['duration'] <= 0:
-                    self.elements.remove(elem)
-                    state_changed = True
-                else:
-                    # Update barrier position to follow player
-                    for player in self.players:
-                        if id(player) == elem['player_id']:
-                            barrier_size = elem['size'][0]
-                            elem['position'] = (player.position[0] - barrier_size // 2, player.position[1] - barrier_size // 2)
+    # Spell effect handlers. Each takes the spell's stats for this level type
+    # (see SpellDefinition.params_for), the power multiplier and the target
+    # position, and returns True if the level state changed.
+    
+    def _effect_radial(self, params, power_multiplier, target_position):
+        """Damage and/or slow enemies around the target with distance falloff."""
+        self.enemies.apply_radial(target_position, params['radius'] * power_multiplier,
+                                  damage=params['damage'] * power_multiplier,
+                                  slow=params['slow'] * power_multiplier,
+                                  min_speed=params['min_speed'])
+        return self.enemies.remove_dead() > 0
+    
+    def _effect_explosion(self, params, power_multiplier, target_position):
+        """Radial damage plus an explosion visual (Fireball)."""
+        state_changed = self._effect_radial(params, power_multiplier, target_position)
+        
+        # Add a visual effect element
+        self.spawn(Effect, 'explosion', target_position,
+                   timer=60,  # 1 second
+                   color=(255, 100, 0),  # Orange-red
+                   radius=params['radius'] * power_multiplier)
+        return state_changed
+    
+    def _effect_regroup(self, params, power_multiplier, target_position):
+        """Teleport the players around the target point."""
+        if not self.players:  # Make sure we have players
+            return False
+        
+        # Spread the players around the target point
+        angles = [0, 120, 240]  # Spread players evenly
+        distance = params['radius'] * power_multiplier  # Distance from target, scales with power
+        
+        for i, player in enumerate(self.players):
+            if i < len(angles):
+                angle_rad = angles[i] * 3.14159 / 180
+                new_x = target_position[0] + distance * math.cos(angle_rad)
+                new_y = target_position[1] + distance * math.sin(angle_rad)
+                # Make sure the position is valid
+                if not self.is_position_blocked((new_x, new_y), player.size):
+                    player.position = (new_x, new_y)
+                    logger.debug("Teleported %s Wizard to (%.1f, %.1f)", player.element, new_x, new_y)
+        return True
+    
+    def _effect_scatter(self, params, power_multiplier, target_position):
+        """Teleport the players to random safe positions, damaging enemies near where they land."""
+        # Teleport all players to random safe positions
+        for player in self.players:
+            # Find a new random position
+            for _ in range(10):  # Try up to 10 times to find a safe position
+                new_x = self.rng.randint(50, 750)
+                new_y = self.rng.randint(50, 550)
+                new_position = (new_x, new_y)
                 
-                # Check if barriers block enemies
-                for enemy in self.elements[:]:
-                    if enemy['type'] == 'enemy':
-                        # Check if enemy collides with any barrier
-                        barrier_rect = pygame.Rect(elem['position'][0], elem['position'][1], 
-                                                  elem['size'][0], elem['size'][1])
-                        enemy_rect = pygame.Rect(enemy['position'][0], enemy['position'][1], 40, 40)
-                        
-                        if barrier_rect.colliderect(enemy_rect):
-                            # Push enemy away from barrier
-                            dx = enemy['position'][0] - (elem['position'][0] + elem['size'][0]/2)
-                            dy = enemy['position'][1] - (elem['position'][1] + elem['size'][1]/2)
-                            
-                            # Normalize the direction vector
-                            length = max(1, (dx**2 + dy**2)**0.5)
-                            dx /= length
-                            dy /= length
-                            
-                            # Push enemy away
-                            push_strength = 5
-                            enemy['position'] = (enemy['position'][0] + dx * push_strength,
-                                                enemy['position'][1] + dy * push_strength)
+                # Check if the position is blocked by any level element
+                if not self.is_position_blocked(new_position, (40, 40)):
+                    # Set the player's position to the new safe position
+                    player.position = new_position
+                    break
         
+        # Teleport spell also damages nearby enemies
+        state_changed = False
+        teleport_range = params['radius'] * power_multiplier
+        for player in self.players:
+            # If enemy is within teleport range of the player, damage it
+            in_range = self.enemies.distances_to(player.position) < teleport_range
+            self.enemies.live('health')[in_range] -= params['damage'] * power_multiplier
+            if self.enemies.remove_dead():
+                state_changed = True
         return state_changed
-                
+    
+    def _effect_wall(self, params, power_multiplier, target_position):
+        """Raise a temporary wall at the target position."""
+        # Create a barrier wall at the target position
+        barrier_size = int(params['radius'] + (40 * power_multiplier))  # Size scales with power
+        
+        # Create a barrier element
+        self.spawn(TempWall, (target_position[0] - barrier_size/2, target_position[1] - barrier_size/2),
+                   (barrier_size, barrier_size),
+                   timer=int(params['duration'] * power_multiplier))  # 5 seconds * power multiplier
+        logger.debug("Created barrier at (%s, %s)", target_position[0], target_position[1])
+        return True
+    
+    def _effect_player_barriers(self, params, power_multiplier, target_position):
+        """Create a barrier around each player that follows them."""
+        # Create barriers around each player
+        barrier_duration = int(params['duration'] * power_multiplier)  # 5 seconds (60 FPS) scaled by power
+        barrier_size = int(params['radius'] * power_multiplier)
+        
+        for player in self.players:
+            # Create a barrier element with the player's position
+            self.spawn(Barrier, (player.position[0] - barrier_size // 2, player.position[1] - barrier_size // 2),
+                       (barrier_size, barrier_size),
+                       duration=barrier_duration,
+                       player_id=id(player))  # Store the player ID to follow the player
+        return bool(self.players)
+    
+    def _effect_wave(self, params, power_multiplier, target_position):
+        """Push every enemy away from the Water wizard and damage it (Tidal Wave)."""
+        if not self.players:
+            return False
+        
+        damage = params['damage'] * power_multiplier
+        push_strength = params['push'] * power_multiplier
+        enemies = self.enemies
+        
+        # Get the position of the Water wizard to launch from
+        water_wizard = next((p for p in self.players if p.element == 'Water'), self.players[0])
+        center_x, center_y = water_wizard.position
+        
+        # Calculate direction from wave center to every enemy
+        xs, ys = enemies.live('x'), enemies.live('y')
+        distance = enemies.distances_to((center_x, center_y))
+        pushed = distance > 0  # Avoid division by zero
+        
+        # Push enemies along the unit direction vector and apply damage
+        scale = push_strength / distance[pushed]
+        new_xs = xs[pushed] + (xs[pushed] - center_x) * scale
+        new_ys = ys[pushed] + (ys[pushed] - center_y) * scale
+        enemies.live('health')[pushed] -= damage
+        
+        # Update positions that are not blocked
+        state_changed = self._move_enemies(np.flatnonzero(pushed), new_xs, new_ys)
+        
+        # Remove enemies with no health
+        enemies.remove_dead()
+        
+        # Add a visual effect
+        self.spawn(Effect, 'wave', (center_x, center_y),
+                   timer=60,  # 1 second
+                   color=(0, 100, 255),  # Blue
+                   radius=0,  # Start small
+                   max_radius=200)  # Grow to this size
+        return state_changed
+    
+    def _effect_quake(self, params, power_multiplier, target_position):
+        """Damage and stun every enemy (Earthquake)."""
+        if not self.players:
+            return False
+        
+        damage = params['damage'] * power_multiplier
+        stun_duration = int(params['duration'] * power_multiplier)  # 2 seconds at 60 FPS
+        enemies = self.enemies
+        state_changed = False
+        
+        if len(enemies):
+            # Apply damage
+            enemies.live('health')[:] -= damage
+            
+            # Remember the speed of enemies that are not stunned yet
+            stun_timer = enemies.live('stun_timer')
+            fresh = stun_timer <= 0
+            enemies.live('original_speed')[fresh] = enemies.live('speed')[fresh]
+            
+            # Stun the enemies and stop movement while stunned
+            stun_timer[:] = stun_duration
+            enemies.live('speed')[:] = 0
+            
+            state_changed = True
+        
+        # Remove enemies with no health
+        enemies.remove_dead()
+        
+        # Add a visual effect
+        self.spawn(Effect, 'earthquake', (400, 300),  # Center of screen
+                   timer=90,  # 1.5 seconds
+                   color=(139, 69, 19))  # Brown
+        return state_changed
+    
+    def _effect_tornado(self, params, power_multiplier, target_position):
+        """Summon a tornado at an Air-casting wizard that pulls and damages enemies."""
+        if not self.players:
+            return False
+        
+        # Get the position of an Air-casting wizard
+        air_wizard = next((p for p in self.players if p.casting_element == 'Air'), self.players[0])
+        center_x, center_y = air_wizard.position
+        
+        # Create the tornado element
+        self.spawn(Tornado, (center_x, center_y),
+                   radius=params['radius'] * power_multiplier,
+                   damage=params['damage'] * power_multiplier,  # Lower damage but continuous
+                   pull=params['pull'] * power_multiplier,
+                   timer=int(params['duration'] * power_multiplier),  # 3 seconds at 60 FPS
+                   color=(200, 200, 200))  # Light gray
+        return True
+    
+    def _effect_set_speed(self, params, power_multiplier, target_position):
+        """Set every enemy to the same speed (survival Steam)."""
+        self.enemies.live('speed')[:] = params['speed']  # Slowed
+        return False
+    
+    def _effect_damage_all(self, params, power_multiplier, target_position):
+        """Deal flat damage to every enemy (survival Lava)."""
+        self.enemies.live('health')[:] -= params['damage']
+        return self.enemies.remove_dead() > 0
+    
     def get_display_text(self):
         """
         Get text to display for this level.
@@ -1269,6 +1279,21 @@ class Level:
             texts.append(("COMPLETED!", (300, 20)))
             
         return texts
+    
+    # Effect name (SpellDefinition.effects) -> handler
+    SPELL_EFFECTS = {
+        'radial': _effect_radial,
+        'explosion': _effect_explosion,
+        'regroup': _effect_regroup,
+        'scatter': _effect_scatter,
+        'wall': _effect_wall,
+        'player_barriers': _effect_player_barriers,
+        'wave': _effect_wave,
+        'quake': _effect_quake,
+        'tornado': _effect_tornado,
+        'set_speed': _effect_set_speed,
+        'damage_all': _effect_damage_all,
+    }
         
 def create_levels():
     """
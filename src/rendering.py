@@ -1,39 +1,392 @@
 import pygame
+import json
 import os
 import math  # Add import for Python's math module
+from collections import OrderedDict
 
-# Load wizard sprites
-def load_wizard_sprites():
-    """Load all wizard sprite images."""
-    sprites = {}
-    
-    # Get the path to the images directory
-    sprites_dir = os.path.join(os.path.dirname(__file__), 'assets', 'images')
-    
-    # Try to load wizard sprites if they exist
-    try:
-        for element in ['fire', 'water', 'earth']:
-            # Regular sprite
-            sprite_path = os.path.join(sprites_dir, f"{element}_wizard.png")
-            if os.path.exists(sprite_path):
-                sprites[element] = pygame.image.load(sprite_path).convert_alpha()
-                
-            # Casting sprite
-            casting_path = os.path.join(sprites_dir, f"{element}_wizard_casting.png")
-            if os.path.exists(casting_path):
-                sprites[f"{element}_casting"] = pygame.image.load(casting_path).convert_alpha()
-    except Exception as e:
-        print(f"Error loading wizard sprites: {e}")
+# Sprite atlas written by assets/build_atlas.py
+ATLAS_IMAGE = os.path.join(os.path.dirname(__file__), 'assets', 'atlas.png')
+ATLAS_INDEX = os.path.join(os.path.dirname(__file__), 'assets', 'atlas.json')
+
+# Element colors used by the spell circle and the element orb sprites
+ELEMENT_COLORS = {
+    "Fire": (255, 60, 60),    # Red
+    "Water": (60, 60, 255),   # Blue
+    "Earth": (60, 255, 60),   # Green
+    "Air": (200, 200, 255)    # Light blue/white
+}
+
+# Radius of the element orbs in the spell circle
+ELEMENT_ORB_RADIUS = 14
+
+class SpriteAtlas:
+    """
+    Every sprite packed into one texture, with a name -> source rect index.
+    
+    Sprites are drawn by blitting a sub-rect of the single atlas surface, so
+    startup decodes one image instead of one per sprite, and blit_args()
+    entries can be handed to Surface.blits() in one batch.
+    
+    Attributes:
+        surface (pygame.Surface or None): The packed sprites (None if no atlas is loaded)
+        rects (dict): Sprite name -> pygame.Rect of the sprite in the surface
+    """
+    
+    def __init__(self, surface=None, rects=None):
+        """
+        Initialize an atlas.
+        
+        Args:
+            surface (pygame.Surface, optional): The packed sprites
+            rects (dict, optional): Sprite name -> (x, y, width, height) in the surface
+        """
+        self.surface = surface
+        self.rects = {name: pygame.Rect(rect) for name, rect in (rects or {}).items()}
+    
+    @classmethod
+    def load(cls, image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+        """
+        Load an atlas written by assets/build_atlas.py.
+        
+        Args:
+            image_path (str): Packed sprite image
+            index_path (str): JSON index of the sprite rects
+            
+        Returns:
+            SpriteAtlas: The atlas (empty if it could not be loaded, so callers fall back to drawing)
+        """
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            surface = pygame.image.load(image_path)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            return cls(surface, index['sprites'])
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"Error loading sprite atlas: {e}")
+            return cls()
+    
+    def __contains__(self, name):
+        return name in self.rects
+    
+    def get(self, name):
+        """
+        Get a sprite as a subsurface sharing the atlas pixels.
+        
+        Args:
+            name (str): Sprite name
+            
+        Returns:
+            pygame.Surface: The sprite (shared - do not draw on it)
+        """
+        return self.surface.subsurface(self.rects[name])
+    
+    def blit_args(self, name, dest):
+        """
+        Get the Surface.blits() entry that draws a sprite.
+        
+        Args:
+            name (str): Sprite name
+            dest (tuple): (x, y) top-left position on the target
+            
+        Returns:
+            tuple: (source, dest, area)
+        """
+        return (self.surface, dest, self.rects[name])
+    
+    def blit(self, target, name, dest):
+        """
+        Draw a sprite.
+        
+        Args:
+            target (pygame.Surface): Surface to draw on
+            name (str): Sprite name
+            dest (tuple): (x, y) top-left position on the target
+            
+        Returns:
+            pygame.Rect: Area of the target that was drawn on
+        """
+        return target.blit(self.surface, dest, self.rects[name])
+
+def element_orb_name(element):
+    """
+    Get the atlas name of an element's spell circle orb.
+    
+    Args:
+        element (str): Element name
+        
+    Returns:
+        str: Sprite name
+    """
+    return f"orb_{element.lower()}"
+
+def draw_element_orb(surface, position, color, radius=ELEMENT_ORB_RADIUS):
+    """
+    Draw an element orb: a colored disc with a highlight and a shadow arc.
+    
+    Args:
+        surface (pygame.Surface): The surface to draw on
+        position (tuple): (x, y) center of the orb
+        color (tuple): RGB orb color
+        radius (int): Orb radius
+    """
+    pygame.draw.circle(surface, color, position, radius)
+    
+    # Add a highlight/shadow effect
+    highlight_color = tuple(min(c + 50, 255) for c in color)
+    shadow_color = tuple(max(c - 50, 0) for c in color)
+    orb_rect = pygame.Rect(position[0] - radius, position[1] - radius, radius*2, radius*2)
+    
+    # Highlight (top-left)
+    pygame.draw.arc(surface, highlight_color, orb_rect, 3.14159/2, 3.14159*3/2, 2)
+    
+    # Shadow (bottom-right)
+    pygame.draw.arc(surface, shadow_color, orb_rect, 3.14159*3/2, 3.14159/2, 2)
+
+# Sprite atlas (loaded by init_rendering)
+atlas = SpriteAtlas()
+
+# Fonts by (name, size) - SysFont does a system font lookup on every call
+_font_cache = {}
+
+# Rendered text surfaces by (text, font name, size, color, antialias), least recently used first
+_text_cache = OrderedDict()
+TEXT_CACHE_SIZE = 256
+
+def get_font(name, size):
+    """
+    Get a system font, loading it only the first time it is requested.
+    
+    Args:
+        name (str or None): System font name (None for the default font)
+        size (int): Font size
+        
+    Returns:
+        pygame.font.Font: The font
+    """
+    key = (name, size)
+    font = _font_cache.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _font_cache[key] = font
+    return font
+
+def render_text(text, size, color, font_name=None, antialias=True):
+    """
+    Render text through an LRU cache so repeated labels cost nothing per frame.
+    
+    Args:
+        text (str): Text to render
+        size (int): Font size
+        color (tuple): RGB text color
+        font_name (str, optional): System font name (None for the default font)
+        antialias (bool): Whether to antialias the text
+        
+    Returns:
+        pygame.Surface: The rendered text (shared - do not draw on it)
+    """
+    key = (text, font_name, size, color, antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+    
+    surface = get_font(font_name, size).render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        # Evict the least recently used text
+        _text_cache.popitem(last=False)
+    return surface
+
+# Pre-baked per-pixel-alpha circles by (radius, color, width), least recently used first
+_circle_sprite_cache = OrderedDict()
+
+# Most sprites, and most pixel bytes, each sprite cache may hold (an area-of-effect
+# sprite can be 700 pixels square, 2 MB on its own, so the count alone is no bound)
+SPRITE_CACHE_SIZE = 128
+SPRITE_CACHE_BYTES = 32 * 1024 * 1024
+
+# Translucent sprites baked so far by kind (a steadily rising count means a cache is thrashing)
+_sprite_bake_counts = {'circle': 0, 'rect': 0}
+
+# Pixel bytes currently held by each sprite cache
+_sprite_cache_bytes = {'circle': 0, 'rect': 0}
+
+def _store_sprite(cache, kind, key, sprite):
+    """
+    Add a freshly baked sprite to a sprite cache.
+    
+    Evicts the least recently used sprites until the cache is back within
+    SPRITE_CACHE_SIZE sprites and SPRITE_CACHE_BYTES (the new sprite itself
+    is always kept).
+    
+    Args:
+        cache (OrderedDict): The sprite cache
+        kind (str): 'circle' or 'rect'
+        key (tuple): Cache key
+        sprite (pygame.Surface): The baked sprite
+    """
+    _sprite_bake_counts[kind] += 1
+    cache[key] = sprite
+    _sprite_cache_bytes[kind] += sprite.get_pitch() * sprite.get_height()
+    while len(cache) > 1 and (len(cache) > SPRITE_CACHE_SIZE or _sprite_cache_bytes[kind] > SPRITE_CACHE_BYTES):
+        # Evict the least recently used sprite
+        _, evicted = cache.popitem(last=False)
+        _sprite_cache_bytes[kind] -= evicted.get_pitch() * evicted.get_height()
+
+def get_circle_sprite(radius, color, width=0, cutout=0):
+    """
+    Get a translucent circle sprite, baking it only the first time it is requested.
+    
+    The sprite is (2 * radius) pixels square with the circle centered in it.
+    Callers should quantize radius and color (e.g. to ints, or large radii to
+    steps of several pixels) so pulsing effects and casts at nearby powers
+    reuse a small set of sprites instead of allocating new ones.
+    
+    Args:
+        radius (int): Circle radius in pixels (rounded down to an int)
+        color (tuple): RGBA circle color
+        width (int): Outline width (0 for a filled circle)
+        cutout (int): Width of a fully transparent ring cut out of the circle's edge
         
-    return sprites
+    Returns:
+        pygame.Surface: The cached sprite (shared - do not draw on it)
+    """
+    radius = int(radius)
+    key = (radius, tuple(color), width, cutout)
+    sprite = _circle_sprite_cache.get(key)
+    if sprite is not None:
+        _circle_sprite_cache.move_to_end(key)
+        return sprite
+    
+    sprite = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (radius, radius), radius, width)
+    if cutout:
+        # Drawing replaces pixels on an alpha surface, so this clears the ring
+        pygame.draw.circle(sprite, (0, 0, 0, 0), (radius, radius), radius, cutout)
+    _store_sprite(_circle_sprite_cache, 'circle', key, sprite)
+    return sprite
+
+# Pre-baked translucent rectangles by (size, color), least recently used first
+_rect_sprite_cache = OrderedDict()
+
+def get_rect_sprite(size, color):
+    """
+    Get a filled translucent rectangle sprite, baking it only the first time it is requested.
+
+    Args:
+        size (tuple): (width, height) in pixels
+        color (tuple): RGBA fill color
+
+    Returns:
+        pygame.Surface: The cached sprite (shared - do not draw on it)
+    """
+    key = (tuple(size), tuple(color))
+    sprite = _rect_sprite_cache.get(key)
+    if sprite is not None:
+        _rect_sprite_cache.move_to_end(key)
+        return sprite
+
+    sprite = pygame.Surface(size, pygame.SRCALPHA)
+    sprite.fill(color)
+    _store_sprite(_rect_sprite_cache, 'rect', key, sprite)
+    return sprite
+
+def alpha_surface_stats():
+    """
+    Count the per-pixel-alpha surfaces held by the sprite and text caches.
+    
+    Returns:
+        tuple: (live, baked) - surfaces currently cached, and translucent sprites baked since startup
+    """
+    live = len(_circle_sprite_cache) + len(_rect_sprite_cache) + len(_text_cache)
+    baked = _sprite_bake_counts['circle'] + _sprite_bake_counts['rect']
+    return live, baked
+
+# Draw list layers, back to front
+LAYER_LEVEL = 0           # Static layer and temporary walls
+LAYER_WIZARDS = 1         # Wizard sprites/bodies, auras, attunement beams, staffs
+LAYER_CHARGE_BARS = 2     # Charge bars and cast element labels above the wizards
+LAYER_PANEL = 3           # Objective panel
+LAYER_SPELL_CIRCLE = 4    # Spell circle disc, rings and timer
+LAYER_ORBS = 5            # Element orbs in the spell circle
+LAYER_ORB_LABELS = 6      # Element symbols, charge bars and the active spell name
+LAYER_SPELL_EFFECT = 7    # Area of effect of the active spell
+LAYER_CURSOR = 8          # Targeting cursor
+LAYER_OVERLAY = 9         # Notifications and messages on top of everything
+
+class DrawList:
+    """
+    Collects a frame's draw commands and submits them layer by layer.
+
+    Commands run in layer order, and in the order they were added within a
+    layer. Consecutive sprite blits, including runs that continue into the
+    next layer, go to the target in a single Surface.blits() call. Assigning
+    layers by kind (all wizard bodies, then all charge bars, ...) therefore
+    turns most of a frame's blits into a few batched calls instead of one
+    Python-to-C call per sprite.
+
+    Attributes:
+        layers (dict): Layer -> list of (func, args, kwargs) commands, func None for blits
+    """
+
+    def __init__(self):
+        """Initialize an empty draw list."""
+        self.layers = {}
+
+    def blit(self, layer, source, dest, area=None, special_flags=0):
+        """
+        Queue a sprite blit.
+
+        Args:
+            layer (int): Layer to draw in
+            source (pygame.Surface): Sprite (must not change before flush())
+            dest (tuple): (x, y) top-left position on the target
+            area (pygame.Rect, optional): Part of the source to draw
+            special_flags (int): Blend flags, as for Surface.blit()
+
+        Returns:
+            pygame.Rect: Area the sprite will cover (not clipped to the target)
+        """
+        self.layers.setdefault(layer, []).append((None, (source, dest, area, special_flags), None))
+        return pygame.Rect(dest, area.size if area is not None else source.get_size())
+
+    def draw(self, layer, func, *args, **kwargs):
+        """
+        Queue a primitive draw call, run as func(target, *args, **kwargs).
+
+        Args:
+            layer (int): Layer to draw in
+            func (callable): Drawing function taking the target surface first (e.g. pygame.draw.rect)
+            *args, **kwargs: The remaining arguments for func
+        """
+        self.layers.setdefault(layer, []).append((func, args, kwargs))
+
+    def flush(self, target):
+        """
+        Run every queued command on a surface and empty the list.
 
-# Initialize sprites dictionary
-wizard_sprites = {}
+        Args:
+            target (pygame.Surface): Surface to draw on
+        """
+        run = []  # Pending consecutive blits
+        for layer in sorted(self.layers):
+            for func, args, kwargs in self.layers[layer]:
+                if func is None:
+                    run.append(args)
+                    continue
+                if run:
+                    target.blits(run, doreturn=False)
+                    run = []
+                func(target, *args, **kwargs)
+        if run:
+            target.blits(run, doreturn=False)
+        self.layers.clear()
 
 def init_rendering():
     """Initialize rendering resources."""
-    global wizard_sprites
-    wizard_sprites = load_wizard_sprites()
+    global atlas
+    atlas = SpriteAtlas.load()
 
 def draw_wizard(screen, position, color):
     """
@@ -48,19 +401,28 @@ def draw_wizard(screen, position, color):
     wizard_size = 50
     pygame.draw.rect(screen, color, (position[0], position[1], wizard_size, wizard_size))
 
-def draw_player(screen, player):
+def draw_player(screen, player, draw_list=None):
     """
     Draw a player wizard on the screen based on their current state.
     
     Args:
         screen: Pygame surface to draw on
         player: Player object containing position and color information
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        pygame.Rect: Area of the screen the wizard may have drawn on
     """
+    # Queue into a local list if the caller is not batching a frame
+    flush = draw_list is None
+    if flush:
+        draw_list = DrawList()
+    
     # Standard wizard size - define at the top so it's available for the charge bar
     wizard_size = 50
     
     # Try to use sprites if available
-    sprite_key = player.element.lower()
+    sprite_key = f"{player.element.lower()}_wizard"
     if player.is_casting:
         sprite_key += "_casting"
     elif player.is_attuned:
@@ -68,21 +430,25 @@ def draw_player(screen, player):
     
     x, y = player.position
     
-    if sprite_key in wizard_sprites:
+    # Everything below stays within the element label above the charge bar, the
+    # staff glow on the right and the body at the bottom
+    touched = pygame.Rect(x - 2, y - 47, wizard_size + 32, wizard_size + 49)
+    
+    if sprite_key in atlas:
         # If we have sprites, use them
-        screen.blit(wizard_sprites[sprite_key], (x, y - 20))  # Adjust for hat height
+        touched.union_ip(draw_list.blit(LAYER_WIZARDS, *atlas.blit_args(sprite_key, (x, y - 20))))  # Adjust for hat height
     else:
         # Draw a more wizard-like shape instead of just a square
         color = player.get_display_color()
         
         # Draw wizard body (slightly rounded rectangle)
         body_rect = pygame.Rect(x, y, wizard_size, wizard_size)
-        pygame.draw.rect(screen, color, body_rect, border_radius=5)
+        draw_list.draw(LAYER_WIZARDS, pygame.draw.rect, color, body_rect, border_radius=5)
         
         # Draw wizard hat (triangle on top)
         hat_color = (min(color[0] + 20, 255), min(color[1] + 20, 255), min(color[2] + 20, 255))
         hat_points = [(x + wizard_size // 2, y - 20), (x + 10, y), (x + wizard_size - 10, y)]
-        pygame.draw.polygon(screen, hat_color, hat_points)
+        draw_list.draw(LAYER_WIZARDS, pygame.draw.polygon, hat_color, hat_points)
         
         # Draw attunement effect
         if player.is_attuned:
@@ -90,18 +456,15 @@ def draw_player(screen, player):
             aura_radius = wizard_size * 0.8
             aura_pulse = 0.2 + (math.sin(pygame.time.get_ticks() / 200) + 1) * 0.15  # 0.2-0.5 range
             
-            # Create a semi-transparent attunement aura
-            aura_surface = pygame.Surface((aura_radius*2, aura_radius*2), pygame.SRCALPHA)
+            # Get the semi-transparent attunement aura (radius and alpha are ints, so the pulse reuses ~30 sprites)
             base_color = player.color
             aura_color = (base_color[0], base_color[1], base_color[2], int(100 * aura_pulse))
+            aura_size = int(aura_radius * aura_pulse)
+            aura_surface = get_circle_sprite(aura_size, aura_color)
             
-            pygame.draw.circle(aura_surface, aura_color, 
-                              (int(aura_radius), int(aura_radius)), 
-                              int(aura_radius * aura_pulse))
-            
-            # Draw the aura
-            aura_pos = (x + wizard_size//2 - aura_radius, y + wizard_size//2 - aura_radius)
-            screen.blit(aura_surface, aura_pos, special_flags=pygame.BLEND_ALPHA_SDL2)
+            # Draw the aura centered on the wizard
+            aura_pos = (x + wizard_size//2 - aura_size, y + wizard_size//2 - aura_size)
+            draw_list.blit(LAYER_WIZARDS, aura_surface, aura_pos, None, pygame.BLEND_ALPHA_SDL2)
             
             # Draw attunement connections to other wizards
             for wizard_id in player.attuned_wizards:
@@ -134,7 +497,7 @@ def draw_player(screen, player):
                             )
                             
                             # Draw the beam
-                            pygame.draw.line(screen, color, player_center, other_center, width)
+                            draw_list.draw(LAYER_WIZARDS, pygame.draw.line, color, player_center, other_center, width)
                         break
         
         # Draw staff (if casting)
@@ -144,7 +507,7 @@ def draw_player(screen, player):
             staff_end = (x + wizard_size + 15, y + wizard_size - 25)
             
             # Draw staff (brown)
-            pygame.draw.line(screen, (139, 69, 19), staff_start, staff_end, 3)
+            draw_list.draw(LAYER_WIZARDS, pygame.draw.line, (139, 69, 19), staff_start, staff_end, 3)
             
             # Draw glowing tip
             tip_color = player.color
@@ -159,18 +522,17 @@ def draw_player(screen, player):
                 elif player.casting_element == "Air":
                     tip_color = (200, 200, 255)
             
-            pygame.draw.circle(screen, tip_color, staff_end, 5)
+            draw_list.draw(LAYER_WIZARDS, pygame.draw.circle, tip_color, staff_end, 5)
             
             # Draw glow around tip
             glow_radius = 8 + (player.cast_time % 5)
             glow_color = (tip_color[0], tip_color[1], tip_color[2], 150)  # Semi-transparent
             
-            # Create a surface for the glow effect
-            glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
+            # Get the pre-baked glow sprite
+            glow_surface = get_circle_sprite(glow_radius, glow_color)
             
             # Blit the glow to the screen
-            screen.blit(glow_surface, (staff_end[0] - glow_radius, staff_end[1] - glow_radius), special_flags=pygame.BLEND_ALPHA_SDL2)
+            draw_list.blit(LAYER_WIZARDS, glow_surface, (staff_end[0] - glow_radius, staff_end[1] - glow_radius), None, pygame.BLEND_ALPHA_SDL2)
 
     # Draw charge bar above the wizard when casting
     if player.is_casting or player.charge_level > 0:
@@ -181,7 +543,7 @@ def draw_player(screen, player):
         bar_y = y - 30  # Place it above the wizard and hat
         
         # Draw background (gray)
-        pygame.draw.rect(screen, (70, 70, 70), (bar_x, bar_y, bar_width, bar_height))
+        draw_list.draw(LAYER_CHARGE_BARS, pygame.draw.rect, (70, 70, 70), (bar_x, bar_y, bar_width, bar_height))
         
         # Draw charge level (colored based on element and charge)
         fill_width = int(bar_width * (player.charge_level / 100))
@@ -209,46 +571,57 @@ def draw_player(screen, player):
                 
             charge_color = tuple(min(c + int(player.charge_level/2), 255) for c in base_color)
         
-        pygame.draw.rect(screen, charge_color, (bar_x, bar_y, fill_width, bar_height))
+        draw_list.draw(LAYER_CHARGE_BARS, pygame.draw.rect, charge_color, (bar_x, bar_y, fill_width, bar_height))
         
         # Draw border
-        pygame.draw.rect(screen, (200, 200, 200), (bar_x, bar_y, bar_width, bar_height), 1)
+        draw_list.draw(LAYER_CHARGE_BARS, pygame.draw.rect, (200, 200, 200), (bar_x, bar_y, bar_width, bar_height), 1)
         
         # Draw 100% marker
         marker_x = bar_x + bar_width - 2
-        pygame.draw.line(screen, (255, 255, 255), (marker_x, bar_y), (marker_x, bar_y + bar_height), 1)
+        draw_list.draw(LAYER_CHARGE_BARS, pygame.draw.line, (255, 255, 255), (marker_x, bar_y), (marker_x, bar_y + bar_height), 1)
                 
         # Also display the element being cast for tertiary elements
         if player.casting_element and player.casting_element != player.element:
-            element_font = pygame.font.SysFont(None, 18)
-            element_text = element_font.render(player.casting_element, True, charge_color)
-            screen.blit(element_text, (bar_x, bar_y - 15))
+            element_text = render_text(player.casting_element, 18, charge_color)
+            touched.union_ip(draw_list.blit(LAYER_CHARGE_BARS, element_text, (bar_x, bar_y - 15)))
+    
+    if flush:
+        draw_list.flush(screen)
+    return touched
 
-def draw_spell_circle(screen, spell_circle):
+def draw_spell_circle(screen, spell_circle, draw_list=None):
     """
     Draw the spell circle showing active elements and timer.
     
     Args:
         screen: Pygame surface to draw on
         spell_circle: SpellCircle object containing elements and timer info
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        pygame.Rect: Area of the screen the spell circle covers
     """
+    # Queue into a local list if the caller is not batching a frame
+    flush = draw_list is None
+    if flush:
+        draw_list = DrawList()
+    
     # Spell circle dimensions and position
     center_x, center_y = screen.get_width() // 2, screen.get_height() - 100
     circle_radius = 60
     inner_radius = 40
     
     # Create a semi-transparent background for the spell circle
-    bg_surface = pygame.Surface((circle_radius*2 + 20, circle_radius*2 + 20), pygame.SRCALPHA)
-    pygame.draw.circle(bg_surface, (0, 0, 0, 100), (circle_radius + 10, circle_radius + 10), circle_radius + 10)
-    screen.blit(bg_surface, (center_x - circle_radius - 10, center_y - circle_radius - 10))
+    bg_surface = get_circle_sprite(circle_radius + 10, (0, 0, 0, 100))
+    draw_list.blit(LAYER_SPELL_CIRCLE, bg_surface, (center_x - circle_radius - 10, center_y - circle_radius - 10))
     
     # Draw the base circle (darker when empty, lighter when elements present)
     base_color = (100, 100, 120) if spell_circle.elements else (60, 60, 80)
-    pygame.draw.circle(screen, base_color, (center_x, center_y), circle_radius)
+    draw_list.draw(LAYER_SPELL_CIRCLE, pygame.draw.circle, base_color, (center_x, center_y), circle_radius)
     
     # Draw the inner circle (where the elements will appear)
     inner_color = (70, 70, 90) if spell_circle.elements else (40, 40, 60)
-    pygame.draw.circle(screen, inner_color, (center_x, center_y), inner_radius)
+    draw_list.draw(LAYER_SPELL_CIRCLE, pygame.draw.circle, inner_color, (center_x, center_y), inner_radius)
     
     # Draw timer ring if active
     if spell_circle.activation_timer > 0:
@@ -261,11 +634,9 @@ def draw_spell_circle(screen, spell_circle):
         # Convert to angle (0 degrees is right, going counterclockwise)
         angle = 360 * timer_percentage
         
-        # Create a surface for the timer arc
-        arc_surface = pygame.Surface((timer_radius*2, timer_radius*2), pygame.SRCALPHA)
-        
-        # Draw a full circle as background in darker color
-        pygame.draw.circle(arc_surface, (100, 100, 100, 100), (timer_radius, timer_radius), timer_radius, timer_width)
+        # Draw a full ring as background in darker color
+        ring_surface = get_circle_sprite(timer_radius, (100, 100, 100, 100), timer_width)
+        draw_list.blit(LAYER_SPELL_CIRCLE, ring_surface, (center_x - timer_radius, center_y - timer_radius))
         
         # Calculate start and end angles (pygame angles are in radians, counterclockwise from right)
         start_angle = 0  # Start from right (0 degrees)
@@ -274,25 +645,15 @@ def draw_spell_circle(screen, spell_circle):
         # Draw the arc segment as the timer
         if angle > 0:  # Only draw if there's time left
             # For the arc we need a rectangle that bounds the circle
-            rect = pygame.Rect(0, 0, timer_radius*2, timer_radius*2)
+            rect = pygame.Rect(center_x - timer_radius, center_y - timer_radius, timer_radius*2, timer_radius*2)
             
             # Bright color for the timer
             timer_color = (220, 220, 250)
             
-            # Draw the timer arc
-            pygame.draw.arc(arc_surface, timer_color, rect, start_angle, end_angle, timer_width)
-        
-        # Blit the arc to the screen
-        screen.blit(arc_surface, (center_x - timer_radius, center_y - timer_radius))
-    
-    # Element colors and names
-    element_colors = {
-        "Fire": (255, 60, 60),    # Red
-        "Water": (60, 60, 255),   # Blue
-        "Earth": (60, 255, 60),   # Green
-        "Air": (200, 200, 255)    # Light blue/white
-    }
+            # Draw the timer arc (opaque, so it can go straight onto the screen)
+            draw_list.draw(LAYER_SPELL_CIRCLE, pygame.draw.arc, timer_color, rect, start_angle, end_angle, timer_width)
     
+    # Element symbols
     element_symbols = {
         "Fire": "🔥",    # Fire emoji
         "Water": "💧",   # Water drop emoji
@@ -321,43 +682,28 @@ def draw_spell_circle(screen, spell_circle):
             if hasattr(spell_circle, 'element_charges') and i < len(spell_circle.element_charges):
                 charge_level = spell_circle.element_charges[i]
             
-            # Draw a colored circle for this element
-            element_radius = 14  # Base size of element indicator
+            # Draw a colored orb for this element
+            element_radius = ELEMENT_ORB_RADIUS
             element_pos = (int(center_x + x_offset), int(center_y + y_offset))
             
-            # Circle background with element color
-            element_bg_color = element_colors.get(element, (200, 200, 200))
-            pygame.draw.circle(screen, element_bg_color, element_pos, element_radius)
-            
-            # Add a highlight/shadow effect
-            highlight_color = tuple(min(c + 50, 255) for c in element_bg_color)
-            shadow_color = tuple(max(c - 50, 0) for c in element_bg_color)
-            
-            # Highlight (top-left)
-            pygame.draw.arc(screen, highlight_color, 
-                           pygame.Rect(element_pos[0] - element_radius, element_pos[1] - element_radius, 
-                                      element_radius*2, element_radius*2),
-                           3.14159/2, 3.14159*3/2, 2)
-            
-            # Shadow (bottom-right)
-            pygame.draw.arc(screen, shadow_color, 
-                           pygame.Rect(element_pos[0] - element_radius, element_pos[1] - element_radius, 
-                                      element_radius*2, element_radius*2),
-                           3.14159*3/2, 3.14159/2, 2)
+            orb_name = element_orb_name(element)
+            if orb_name in atlas:
+                # Pre-baked orb with its highlight and shadow (all orbs go out in one batch)
+                draw_list.blit(LAYER_ORBS, *atlas.blit_args(orb_name, (element_pos[0] - element_radius, element_pos[1] - element_radius)))
+            else:
+                draw_list.draw(LAYER_ORBS, draw_element_orb, element_pos, ELEMENT_COLORS.get(element, (200, 200, 200)), element_radius)
             
             # Try to render emoji symbol if font supports it, otherwise use text
             try:
                 symbol = element_symbols.get(element, "?")
-                symbol_font = pygame.font.SysFont("segoeuisymbol", 18)
-                symbol_text = symbol_font.render(symbol, True, (255, 255, 255))
+                symbol_text = render_text(symbol, 18, (255, 255, 255), "segoeuisymbol")
                 symbol_rect = symbol_text.get_rect(center=element_pos)
-                screen.blit(symbol_text, symbol_rect)
+                draw_list.blit(LAYER_ORB_LABELS, symbol_text, symbol_rect.topleft)
             except:
                 # Fallback to first letter if emoji doesn't work
-                fallback_font = pygame.font.SysFont(None, 22)
-                letter_text = fallback_font.render(element[0], True, (255, 255, 255))
+                letter_text = render_text(element[0], 22, (255, 255, 255))
                 letter_rect = letter_text.get_rect(center=element_pos)
-                screen.blit(letter_text, letter_rect)
+                draw_list.blit(LAYER_ORB_LABELS, letter_text, letter_rect.topleft)
             
             # Draw a small charge indicator bar below the element
             bar_width = element_radius * 2
@@ -366,7 +712,7 @@ def draw_spell_circle(screen, spell_circle):
             bar_y = element_pos[1] + element_radius + 2
             
             # Background bar (dark)
-            pygame.draw.rect(screen, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
+            draw_list.draw(LAYER_ORB_LABELS, pygame.draw.rect, (40, 40, 40), (bar_x, bar_y, bar_width, bar_height))
             
             # Filled bar based on charge
             fill_width = int(bar_width * (charge_level / 100))
@@ -379,24 +725,75 @@ def draw_spell_circle(screen, spell_circle):
             else:
                 charge_color = (60, 200, 60)  # Green for high charge
                 
-            pygame.draw.rect(screen, charge_color, (bar_x, bar_y, fill_width, bar_height))
+            draw_list.draw(LAYER_ORB_LABELS, pygame.draw.rect, charge_color, (bar_x, bar_y, fill_width, bar_height))
     
     # Draw the current spell name if active
     if spell_circle.active_spell:
-        font = pygame.font.SysFont(None, 22)
-        spell_text = font.render(spell_circle.active_spell, True, (255, 255, 255))
+        spell_text = render_text(spell_circle.active_spell, 22, (255, 255, 255))
         text_rect = spell_text.get_rect(center=(center_x, center_y))
-        screen.blit(spell_text, text_rect)
+        draw_list.blit(LAYER_ORB_LABELS, spell_text, text_rect.topleft)
+    
+    # The background disc encloses the ring, the elements and their charge bars
+    touched = pygame.Rect(center_x - circle_radius - 10, center_y - circle_radius - 10,
+                          circle_radius*2 + 20, circle_radius*2 + 20)
+    if spell_circle.active_spell:
+        touched.union_ip(text_rect)
+    
+    if flush:
+        draw_list.flush(screen)
+    return touched
 
-def draw_spell_effect(screen, spell_circle):
+# Area-of-effect radii are drawn in steps of this many pixels (see draw_spell_effect)
+EFFECT_RADIUS_STEP = 10
+
+# Width of the pulsing border ring around an area of effect
+EFFECT_RING_WIDTH = 3
+
+# The active effect's border ring by (radius, color): a private surface, outside the
+# sprite caches, since its surface alpha is changed every frame to pulse it
+_effect_ring_cache = {}
+
+def get_effect_ring(radius, color):
+    """
+    Get the border ring of an area of effect, baked at full alpha.
+    
+    Only draw_spell_effect uses the ring, one at a time, so it may set the
+    ring's surface alpha; the ring of the previous effect is dropped.
+    
+    Args:
+        radius (int): Effect radius in pixels
+        color (tuple): RGB ring color
+        
+    Returns:
+        pygame.Surface: The ring
+    """
+    key = (radius, tuple(color))
+    ring = _effect_ring_cache.get(key)
+    if ring is None:
+        _effect_ring_cache.clear()
+        ring = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        pygame.draw.circle(ring, tuple(color) + (255,), (radius, radius), radius, EFFECT_RING_WIDTH)
+        _effect_ring_cache[key] = ring
+    return ring
+
+def draw_spell_effect(screen, spell_circle, draw_list=None):
     """
     Draw any active spell effects on the screen.
     
     Args:
         screen (pygame.Surface): The screen to draw on
         spell_circle (SpellCircle): The spell circle to get effect information from
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        pygame.Rect or None: Area of the screen the effect covers, None if no spell is active
     """
     if spell_circle.active_spell:
+        # Queue into a local list if the caller is not batching a frame
+        flush = draw_list is None
+        if flush:
+            draw_list = DrawList()
+        
         # Get the spell name and target position
         spell_name = spell_circle.active_spell
         spell_power = spell_circle.active_spell_power
@@ -415,8 +812,9 @@ def draw_spell_effect(screen, spell_circle):
         elif spell_name == 'Barrier':
             radius = 60 * (0.5 + spell_power / 100)
             
-        # Draw a semi-transparent circle to represent the area of effect
-        aoe_surface = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+        # The effect radius stays fixed while a spell is active, so one sprite serves every
+        # frame; rounding it to EFFECT_RADIUS_STEP lets casts at nearby powers share sprites
+        radius = int(round(radius / EFFECT_RADIUS_STEP)) * EFFECT_RADIUS_STEP
         
         # Different colors for different spell types
         if 'Fire' in spell_name or 'Lava' in spell_name or spell_name == 'Fireball':
@@ -434,93 +832,244 @@ def draw_spell_effect(screen, spell_circle):
         else:
             color = (255, 255, 255, 100)  # White with alpha
             
-        # Draw the circle
-        pygame.draw.circle(aoe_surface, color, (radius, radius), radius)
+        # Get the semi-transparent circle that represents the area of effect
+        aoe_surface = get_circle_sprite(radius, color)
         
         # Calculate the position to draw the surface
         pos = (target_pos[0] - radius, target_pos[1] - radius)
         
-        # Draw the effect
-        screen.blit(aoe_surface, pos)
+        # Draw the effect twice for the layered look of the fill, except under the
+        # border ring: the second layer has the ring cut out, so the ring's pixels
+        # show a single layer of fill under the pulsing border
+        draw_list.blit(LAYER_SPELL_EFFECT, aoe_surface, pos)
+        draw_list.blit(LAYER_SPELL_EFFECT, get_circle_sprite(radius, color, cutout=EFFECT_RING_WIDTH), pos)
         
         # Draw a pulsing border around the AOE to make it more visible
         pulse = abs(((pygame.time.get_ticks() % 1000) - 500) / 500)  # 0-1 pulsing value
-        border_color = tuple(c for c in color[:3]) + (int(200 * pulse),)  # Pulsing alpha
-        pygame.draw.circle(aoe_surface, border_color, (radius, radius), radius, 3)
-        screen.blit(aoe_surface, pos)
+        border_surface = get_effect_ring(radius, color[:3])
+        border_surface.set_alpha(int(200 * pulse))  # Pulsing alpha (the ring is not a shared sprite)
+        draw_list.blit(LAYER_SPELL_EFFECT, border_surface, pos)
         
         # Draw the spell name above the effect
-        font = pygame.font.SysFont(None, 24)
-        text = font.render(spell_name, True, (255, 255, 255))
-        screen.blit(text, (target_pos[0] - text.get_width()//2, target_pos[1] - radius - 30))
+        text = render_text(spell_name, 24, (255, 255, 255))
+        text_rect = draw_list.blit(LAYER_SPELL_EFFECT, text, (target_pos[0] - text.get_width()//2, target_pos[1] - radius - 30))
+        
+        if flush:
+            draw_list.flush(screen)
+        return text_rect.union(pygame.Rect(pos[0] - 1, pos[1] - 1, radius*2 + 2, radius*2 + 2))
+    return None
 
-def draw_targeting_cursor(screen, position):
+def draw_targeting_cursor(screen, position, draw_list=None):
     """
     Draw a targeting cursor at the mouse position.
     
     Args:
         screen (pygame.Surface): The screen to draw on
         position (tuple): The (x, y) position to draw the cursor
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        pygame.Rect: Area of the screen the cursor covers
     """
+    # Queue into a local list if the caller is not batching a frame
+    flush = draw_list is None
+    if flush:
+        draw_list = DrawList()
+    
     # Draw crosshair
     cursor_size = 20
     cursor_color = (255, 255, 255)
     cursor_thickness = 2
     
     # Draw the crosshair lines
-    pygame.draw.line(screen, cursor_color, 
-                     (position[0] - cursor_size, position[1]),
-                     (position[0] + cursor_size, position[1]), 
-                     cursor_thickness)
-    pygame.draw.line(screen, cursor_color, 
-                     (position[0], position[1] - cursor_size),
-                     (position[0], position[1] + cursor_size), 
-                     cursor_thickness)
+    draw_list.draw(LAYER_CURSOR, pygame.draw.line, cursor_color,
+                   (position[0] - cursor_size, position[1]),
+                   (position[0] + cursor_size, position[1]),
+                   cursor_thickness)
+    draw_list.draw(LAYER_CURSOR, pygame.draw.line, cursor_color,
+                   (position[0], position[1] - cursor_size),
+                   (position[0], position[1] + cursor_size),
+                   cursor_thickness)
     
     # Draw a small circle in the center
-    pygame.draw.circle(screen, cursor_color, position, 3, 0)
+    draw_list.draw(LAYER_CURSOR, pygame.draw.circle, cursor_color, position, 3, 0)
+    
+    if flush:
+        draw_list.flush(screen)
+    return pygame.Rect(position[0] - cursor_size - cursor_thickness, position[1] - cursor_size - cursor_thickness,
+                       (cursor_size + cursor_thickness) * 2 + 1, (cursor_size + cursor_thickness) * 2 + 1)
+
+# Pre-rendered static level geometry: id(level) -> (level, static_version, size, surface)
+_static_layer_cache = {}
+
+def _draw_static_element(surface, element):
+    """
+    Draw a permanent wall or gap onto a surface.
+    
+    Args:
+        surface (pygame.Surface): The surface to draw on
+        element (Entity): A static level element (Wall or Gap)
+    """
+    rect = pygame.Rect(element.x, element.y, element.w, element.h)
+    
+    if element.type == 'gap':
+        # Gaps are areas that need to be filled
+        pygame.draw.rect(surface, (50, 50, 50), rect)
+        
+        # Draw dashed lines around the gap
+        dash_length = 5
+        dash_gap = 5
+        draw_dashed_rect(surface, (150, 150, 150), rect, dash_length, dash_gap)
+    else:
+        # Walls are solid obstacles
+        wall_color = (139, 69, 19)  # Brown for walls
+        pygame.draw.rect(surface, wall_color, rect)
+
+def get_static_layer(level, size):
+    """
+    Get a transparent surface with the level's permanent walls and gaps drawn on it.
+    
+    The surface is rendered once per level and only rebuilt when the level's
+    static_version changes.
+    
+    Args:
+        level (Level): The level to render
+        size (tuple): (width, height) of the layer
+        
+    Returns:
+        pygame.Surface: The cached static layer
+    """
+    cached = _static_layer_cache.get(id(level))
+    if cached and cached[0] is level and cached[1] == level.static_version and cached[2] == size:
+        return cached[3]
+    
+    layer = pygame.Surface(size, pygame.SRCALPHA)
+    for element in level.gaps + level.walls:
+        _draw_static_element(layer, element)
+    
+    # Match the display format for fast blits when a display is available
+    if pygame.display.get_surface() is not None:
+        layer = layer.convert_alpha()
+    
+    _static_layer_cache[id(level)] = (level, level.static_version, size, layer)
+    return layer
 
-def draw_level(screen, level):
+def draw_level(screen, level, include_static=True, draw_list=None):
     """
     Draw the level elements such as walls, gaps, enemies, etc.
     
+    Permanent walls and gaps come from a cached layer; only dynamic elements
+    are drawn individually.
+    
     Args:
         screen (pygame.Surface): The screen to draw on
         level (Level): The level to draw
+        include_static (bool): Whether to draw the static layer (False when it is
+            already part of the background, as with DirtyRectRenderer)
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        list: pygame.Rect areas of the dynamic elements that were drawn
     """
-    # Draw level elements
-    for element in level.elements:
-        element_type = element.get('type', 'unknown')
-        position = element.get('position', (0, 0))
+    # Queue into a local list if the caller is not batching a frame
+    flush = draw_list is None
+    if flush:
+        draw_list = DrawList()
+    
+    # Draw the pre-rendered static geometry in one blit
+    if include_static:
+        draw_list.blit(LAYER_LEVEL, get_static_layer(level, screen.get_size()), (0, 0))
+    
+    # Draw dynamic level elements on top
+    touched = []
+    for element in level.temp_walls:
+        position = element.position
         
-        if element_type == 'gap':
-            # Gaps are areas that need to be filled
-            pygame.draw.rect(screen, (50, 50, 50), pygame.Rect(position[0], position[1], 
-                                                               element['size'][0], element['size'][1]))
-            
-            # Draw dashed lines around the gap
-            dash_length = 5
-            dash_gap = 5
-            gap_rect = pygame.Rect(position[0], position[1], element['size'][0], element['size'][1])
-            draw_dashed_rect(screen, (150, 150, 150), gap_rect, dash_length, dash_gap)
-            
-        elif element_type == 'wall':
-            # Walls are solid obstacles
-            wall_color = (139, 69, 19)  # Brown for walls
-            
-            # If it's a temporary wall (barrier), make it translucent green
-            if element.get('temp', False):
-                # Create a semi-transparent surface
-                wall_surface = pygame.Surface((element['size'][0], element['size'][1]), pygame.SRCALPHA)
-                wall_surface.fill((0, 255, 0, 150))  # Semi-transparent green
-                screen.blit(wall_surface, position)
-                
-                # Draw a border
-                pygame.draw.rect(screen, (0, 200, 0), pygame.Rect(position[0], position[1], 
-                                                                 element['size'][0], element['size'][1]), 2)
-            else:
-                pygame.draw.rect(screen, wall_color, pygame.Rect(position[0], position[1], 
-                                                               element['size'][0], element['size'][1]))
+        # Temporary walls (barriers) are translucent green
+        wall_surface = get_rect_sprite((element.w, element.h), (0, 255, 0, 150))  # Semi-transparent green
+        touched.append(draw_list.blit(LAYER_LEVEL, wall_surface, position))
+        
+        # Draw a border
+        draw_list.draw(LAYER_LEVEL, pygame.draw.rect, (0, 200, 0), pygame.Rect(position[0], position[1], element.w, element.h), 2)
+    
+    if flush:
+        draw_list.flush(screen)
+    return touched
+
+class DirtyRectRenderer:
+    """
+    Pushes only the changed parts of the playing screen to the display.
+    
+    The background (black plus the level's static layer) is rendered once.
+    Each frame, begin() restores the areas drawn in the previous frame from
+    it, the draw_* functions redraw the dynamic parts and report the rects
+    they touched, and end() updates the display with the old and new rects
+    only.
+    
+    Attributes:
+        screen (pygame.Surface): The display surface
+        background (pygame.Surface): Cached background for the current level
+        previous (list): Rects drawn in the previous frame
+    """
+    
+    def __init__(self, screen):
+        """
+        Initialize the renderer.
+        
+        Args:
+            screen (pygame.Surface): The display surface
+        """
+        self.screen = screen
+        self.background = None
+        self._background_key = None
+        self.previous = []
+        self._full_redraw = True
+    
+    def invalidate(self):
+        """Force the next frame to redraw and push the whole screen (e.g. after another screen was shown)."""
+        self._full_redraw = True
+        self.previous = []
+    
+    def begin(self, level):
+        """
+        Prepare the screen for a frame: restore last frame's rects, or everything if needed.
+        
+        Args:
+            level (Level): The level being drawn
+        """
+        size = self.screen.get_size()
+        key = (id(level), level.static_version, size)
+        if key != self._background_key:
+            # Walls or gaps changed (or a new level) - rebuild the background
+            self.background = pygame.Surface(size)
+            self.background.blit(get_static_layer(level, size), (0, 0))
+            if pygame.display.get_surface() is not None:
+                self.background = self.background.convert()
+            self._background_key = key
+            self._full_redraw = True
+        
+        if self._full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+    
+    def end(self, rects):
+        """
+        Push the frame to the display.
+        
+        Args:
+            rects (list): pygame.Rect areas drawn this frame (None entries are ignored)
+        """
+        screen_rect = self.screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects if rect]
+        rects = [rect for rect in rects if rect]
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = rects
 
 def draw_level_text(screen, level):
     """
@@ -530,14 +1079,12 @@ def draw_level_text(screen, level):
         screen: Pygame surface to draw on
         level: Level object with text information
     """
-    font = pygame.font.SysFont(None, 28)
-    
     # Get all text items from the level
     text_items = level.get_display_text()
     
     # Draw each text item
     for text, position in text_items:
-        text_surface = font.render(text, True, (255, 255, 255))
+        text_surface = render_text(text, 28, (255, 255, 255))
         screen.blit(text_surface, position)
 
 def draw_level_transition(screen, level_num, total_levels):
@@ -551,48 +1098,89 @@ def draw_level_transition(screen, level_num, total_levels):
     """
     screen_width, screen_height = screen.get_width(), screen.get_height()
     
-    # Fill with a semi-transparent black
-    transition_surface = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-    pygame.draw.rect(transition_surface, (0, 0, 0, 200), (0, 0, screen_width, screen_height))
-    screen.blit(transition_surface, (0, 0))
+    # Fill with a semi-transparent black (cached like the other overlays)
+    screen.blit(get_rect_sprite((screen_width, screen_height), (0, 0, 0, 200)), (0, 0))
     
     # Draw level text
-    font_large = pygame.font.SysFont(None, 72)
-    font_small = pygame.font.SysFont(None, 36)
-    
-    level_text = font_large.render(f"Level {level_num}", True, (255, 255, 255))
+    level_text = render_text(f"Level {level_num}", 72, (255, 255, 255))
     screen.blit(level_text, (screen_width//2 - level_text.get_width()//2, screen_height//2 - 50))
     
-    progress_text = font_small.render(f"{level_num} of {total_levels}", True, (200, 200, 200))
+    progress_text = render_text(f"{level_num} of {total_levels}", 36, (200, 200, 200))
     screen.blit(progress_text, (screen_width//2 - progress_text.get_width()//2, screen_height//2 + 30))
     
-    instruction_text = font_small.render("Press SPACE to start", True, (200, 200, 200))
+    instruction_text = render_text("Press SPACE to start", 36, (200, 200, 200))
     screen.blit(instruction_text, (screen_width//2 - instruction_text.get_width()//2, screen_height//2 + 80))
 
-def draw_main_menu(screen, selected_option):
+# Pre-rendered main menu background (gradient, title and instructions) by screen size
+_menu_background_cache = {}
+
+def get_menu_background(size):
     """
-    Draw the main menu with selectable options.
+    Get the static part of the main menu, rendering it only once per screen size.
     
     Args:
-        screen: Pygame surface to draw on
-        selected_option: Index of the currently selected option
+        size (tuple): (width, height) of the screen
+        
+    Returns:
+        pygame.Surface: The cached menu background
     """
-    screen_width, screen_height = screen.get_width(), screen.get_height()
+    background = _menu_background_cache.get(size)
+    if background is not None:
+        return background
+    
+    screen_width, screen_height = size
+    background = pygame.Surface(size)
     
     # Fill background with a gradient
     for i in range(screen_height):
         # Create a dark blue to black gradient
         color = (0, 0, max(50 - i // 8, 0))
-        pygame.draw.line(screen, color, (0, i), (screen_width, i))
+        pygame.draw.line(background, color, (0, i), (screen_width, i))
     
     # Draw game title
-    title_font = pygame.font.SysFont(None, 90)
-    title_text = title_font.render("Wizards Casting Spells", True, (255, 255, 255))
-    screen.blit(title_text, (screen_width//2 - title_text.get_width()//2, 100))
+    title_text = render_text("Wizards Casting Spells", 90, (255, 255, 255))
+    background.blit(title_text, (screen_width//2 - title_text.get_width()//2, 100))
+    
+    # Draw instructions
+    instructions = [
+        "Use UP/DOWN arrows to select, ENTER to confirm",
+        "Movement: Player 1 (Fire) - WASD",
+        "          Player 2 (Water) - TFGH",
+        "          Player 3 (Earth) - IJKL",
+        "Casting: Press and HOLD 1, 4, or 7 to charge, release to cast"
+    ]
+    
+    # Draw a semi-transparent box for instructions
+    instruction_box = pygame.Surface((screen_width - 100, 140), pygame.SRCALPHA)
+    pygame.draw.rect(instruction_box, (0, 0, 0, 150), instruction_box.get_rect())
+    background.blit(instruction_box, (50, 440))
+    
+    for i, instruction in enumerate(instructions):
+        instr_text = render_text(instruction, 26, (200, 200, 200))
+        background.blit(instr_text, (screen_width//2 - instr_text.get_width()//2, 450 + i * 25))
+    
+    # Match the display format so the per-frame blit is a plain copy
+    if pygame.display.get_surface() is not None:
+        background = background.convert()
+    
+    _menu_background_cache[size] = background
+    return background
+
+def draw_main_menu(screen, selected_option):
+    """
+    Draw the main menu with selectable options.
+    
+    Args:
+        screen: Pygame surface to draw on
+        selected_option: Index of the currently selected option
+    """
+    screen_width = screen.get_width()
+    
+    # Draw the pre-rendered gradient, title and instructions in one blit
+    screen.blit(get_menu_background(screen.get_size()), (0, 0))
     
     # Menu options
     options = ["Start Game", "Exit"]
-    option_font = pygame.font.SysFont(None, 50)
     option_y = 300
     
     # Draw each option
@@ -607,96 +1195,197 @@ def draw_main_menu(screen, selected_option):
         else:
             color = (200, 200, 200)  # Gray for unselected
             
-        option_text = option_font.render(option, True, color)
+        option_text = render_text(option, 50, color)
         screen.blit(option_text, (screen_width//2 - option_text.get_width()//2, option_y + i * 60))
-    
-    # Draw instructions
-    instruction_font = pygame.font.SysFont(None, 26)
-    instructions = [
-        "Use UP/DOWN arrows to select, ENTER to confirm",
-        "Movement: Player 1 (Fire) - WASD",
-        "          Player 2 (Water) - TFGH",
-        "          Player 3 (Earth) - IJKL",
-        "Casting: Press and HOLD 1, 4, or 7 to charge, release to cast"
-    ]
-    
-    # Draw a semi-transparent box for instructions
-    instruction_box = pygame.Surface((screen_width - 100, 140), pygame.SRCALPHA)
-    pygame.draw.rect(instruction_box, (0, 0, 0, 150), instruction_box.get_rect())
-    screen.blit(instruction_box, (50, 440))
-    
-    for i, instruction in enumerate(instructions):
-        instr_text = instruction_font.render(instruction, True, (200, 200, 200))
-        screen.blit(instr_text, (screen_width//2 - instr_text.get_width()//2, 450 + i * 25))
 
-def draw_unlocked_spell(screen, spell_name):
+def draw_unlocked_spell(screen, spell_name, draw_list=None):
     """
     Draw a notification about unlocking a new spell.
     
     Args:
         screen: Pygame surface to draw on
         spell_name: Name of the unlocked spell
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        pygame.Rect: Area of the screen the notification covers
     """
+    # Queue into a local list if the caller is not batching a frame
+    flush = draw_list is None
+    if flush:
+        draw_list = DrawList()
+    
     screen_width, screen_height = screen.get_width(), screen.get_height()
     
-    # Create a transparent overlay
-    overlay = pygame.Surface((screen_width, 80), pygame.SRCALPHA)
-    pygame.draw.rect(overlay, (0, 0, 0, 180), (0, 0, screen_width, 80))
-    screen.blit(overlay, (0, screen_height - 80))
+    # Get the transparent overlay
+    overlay = get_rect_sprite((screen_width, 80), (0, 0, 0, 180))
+    touched = draw_list.blit(LAYER_OVERLAY, overlay, (0, screen_height - 80))
     
     # Draw the text
-    font = pygame.font.SysFont(None, 36)
-    text = font.render(f"New spell unlocked: {spell_name}!", True, (255, 255, 0))
-    screen.blit(text, (screen_width//2 - text.get_width()//2, screen_height - 60))
+    text = render_text(f"New spell unlocked: {spell_name}!", 36, (255, 255, 0))
+    touched.union_ip(draw_list.blit(LAYER_OVERLAY, text, (screen_width//2 - text.get_width()//2, screen_height - 60)))
+    
+    if flush:
+        draw_list.flush(screen)
+    return touched
 
-def draw_objective_panel(screen, level):
+def draw_objective_panel(screen, level, draw_list=None):
     """
     Draw a clean objective panel at the top of the screen.
     
     Args:
         screen: Pygame surface to draw on
         level: Level object with objective information
+        draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+        
+    Returns:
+        pygame.Rect: Area of the screen the panel covers
     """
+    # Queue into a local list if the caller is not batching a frame
+    flush = draw_list is None
+    if flush:
+        draw_list = DrawList()
+    
     screen_width = screen.get_width()
     
-    # Create a semi-transparent panel at the top
+    # Get the semi-transparent panel for the top
     panel_height = 50
-    panel = pygame.Surface((screen_width, panel_height), pygame.SRCALPHA)
-    pygame.draw.rect(panel, (0, 0, 0, 150), (0, 0, screen_width, panel_height))
-    screen.blit(panel, (0, 0))
+    panel = get_rect_sprite((screen_width, panel_height), (0, 0, 0, 150))
+    draw_list.blit(LAYER_PANEL, panel, (0, 0))
     
     # Draw a subtle border at the bottom of the panel
-    pygame.draw.line(screen, (100, 100, 100), (0, panel_height), (screen_width, panel_height), 1)
+    draw_list.draw(LAYER_PANEL, pygame.draw.line, (100, 100, 100), (0, panel_height), (screen_width, panel_height), 1)
     
     # Draw level name and objective
-    font = pygame.font.SysFont(None, 24)
-    
     # Level name on the left
-    level_text = font.render(f"Level: {level.name}", True, (255, 255, 255))
-    screen.blit(level_text, (20, 15))
+    level_text = render_text(f"Level: {level.name}", 24, (255, 255, 255))
+    draw_list.blit(LAYER_PANEL, level_text, (20, 15))
     
     # Objective in the center
-    objective_text = font.render(f"Objective: {level.objective}", True, (220, 220, 220))
+    objective_text = render_text(f"Objective: {level.objective}", 24, (220, 220, 220))
     objective_x = screen_width // 2 - objective_text.get_width() // 2
-    screen.blit(objective_text, (objective_x, 15))
+    draw_list.blit(LAYER_PANEL, objective_text, (objective_x, 15))
     
     # Additional info based on level type (right side)
     if level.level_type == 'survival':
         # Timer for survival levels
         seconds_left = level.timer // 60
-        timer_text = font.render(f"Time: {seconds_left}s", True, (255, 255, 0))
-        screen.blit(timer_text, (screen_width - timer_text.get_width() - 20, 15))
+        timer_text = render_text(f"Time: {seconds_left}s", 24, (255, 255, 0))
+        draw_list.blit(LAYER_PANEL, timer_text, (screen_width - timer_text.get_width() - 20, 15))
     elif level.level_type == 'combat':
         # Count enemies for combat levels
-        enemies_left = sum(1 for elem in level.elements if elem['type'] == 'enemy')
-        enemies_text = font.render(f"Enemies: {enemies_left}", True, (255, 100, 100))
-        screen.blit(enemies_text, (screen_width - enemies_text.get_width() - 20, 15))
+        enemies_left = len(level.enemies)
+        enemies_text = render_text(f"Enemies: {enemies_left}", 24, (255, 100, 100))
+        draw_list.blit(LAYER_PANEL, enemies_text, (screen_width - enemies_text.get_width() - 20, 15))
     
     # Completion status
     if level.is_completed:
-        complete_font = pygame.font.SysFont(None, 26)
-        complete_text = complete_font.render("COMPLETED!", True, (50, 255, 50))
-        screen.blit(complete_text, (screen_width - complete_text.get_width() - 20, 15))
+        complete_text = render_text("COMPLETED!", 26, (50, 255, 50))
+        draw_list.blit(LAYER_PANEL, complete_text, (screen_width - complete_text.get_width() - 20, 15))
+    
+    if flush:
+        draw_list.flush(screen)
+    
+    # The panel plus its bottom border line
+    return pygame.Rect(0, 0, screen_width, panel_height + 1)
+
+class PerfHud:
+    """
+    Toggleable performance overlay for the playing view.
+    
+    Shows the frame rate, frame time percentiles, where the frame time goes
+    (simulation, drawing, presenting, or waiting on the frame cap), the
+    level's entity counts and the translucent surfaces held by the caches.
+    The text is re-rendered every REFRESH_FRAMES frames into one surface
+    rather than through render_text(), so the ever-changing numbers neither
+    cost a text render per frame nor push labels out of the text cache.
+    
+    Attributes:
+        visible (bool): Whether the overlay is drawn
+        position (tuple): (x, y) top-left corner of the overlay
+        surface (pygame.Surface): The last rendered overlay (None until first drawn)
+    """
+    
+    # Frames between overlay refreshes (4 per second at 60 FPS)
+    REFRESH_FRAMES = 15
+    FONT_SIZE = 18
+    LINE_HEIGHT = 16
+    PADDING = 6
+    
+    def __init__(self, position=(10, 60)):
+        """
+        Initialize a hidden overlay.
+        
+        Args:
+            position (tuple): (x, y) top-left corner (default: just below the objective panel)
+        """
+        self.visible = False
+        self.position = position
+        self.surface = None
+        self._frames_until_refresh = 0
+        self._last_baked = None
+    
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.visible = not self.visible
+        self._frames_until_refresh = 0  # Show fresh numbers straight away
+    
+    def lines(self, stats, level):
+        """
+        Build the overlay's text.
+        
+        Args:
+            stats (framestats.FrameStats): Rolling frame timings
+            level: The current level
+            
+        Returns:
+            list: Lines of text
+        """
+        hist = stats.frame_times
+        live, baked = alpha_surface_stats()
+        new = baked - self._last_baked if self._last_baked is not None else 0
+        self._last_baked = baked
+        
+        counts = level.entity_counts()
+        return [
+            f"FPS {stats.fps:.1f}   frame p50 {hist.percentile(50):.2f}  p95 {hist.percentile(95):.2f}  p99 {hist.percentile(99):.2f} ms",
+            f"busy {stats.mean('busy'):.1f} ms (sim {stats.mean('sim'):.2f}, draw {stats.mean('draw'):.2f}, "
+            f"present {stats.mean('present'):.2f})   tick wait {stats.mean('wait'):.1f} ms",
+            f"bound by: {stats.bottleneck()}",
+            "entities: " + ", ".join(f"{kind} {count}" for kind, count in counts.items()),
+            f"alpha surfaces: {live} cached, {new} baked since last update",
+        ]
+    
+    def draw(self, screen, stats, level, draw_list=None):
+        """
+        Draw the overlay (refreshing its text if due).
+        
+        Args:
+            screen: Pygame surface to draw on
+            stats (framestats.FrameStats): Rolling frame timings
+            level: The current level
+            draw_list (DrawList, optional): Frame draw list to queue into (drawn immediately if None)
+            
+        Returns:
+            pygame.Rect: Area of the screen the overlay covers
+        """
+        if self.surface is None or self._frames_until_refresh <= 0:
+            font = get_font(None, self.FONT_SIZE)
+            texts = [font.render(line, True, (230, 230, 230)) for line in self.lines(stats, level)]
+            width = max(text.get_width() for text in texts) + self.PADDING * 2
+            height = self.LINE_HEIGHT * len(texts) + self.PADDING * 2
+            
+            # Text on a translucent box
+            self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.surface.fill((0, 0, 0, 170))
+            self.surface.blits([(text, (self.PADDING, self.PADDING + i * self.LINE_HEIGHT)) for i, text in enumerate(texts)],
+                               doreturn=False)
+            self._frames_until_refresh = self.REFRESH_FRAMES
+        self._frames_until_refresh -= 1
+        
+        if draw_list is None:
+            return screen.blit(self.surface, self.position)
+        return draw_list.blit(LAYER_OVERLAY, self.surface, self.position)
 
 def draw_dashed_rect(surface, color, rect, dash_length=10, gap_length=10):
     """
@@ -0,0 +1,242 @@
+"""
+Session recording and deterministic replay.
+
+A recording holds the simulation seed, the starting level and every input
+transition, target change and level advance keyed by the tick it happened on.
+Since all level randomness comes from generators derived from the seed,
+feeding the same log back into a fresh Simulation reproduces the session
+exactly, without a display and as fast as the simulation can step.
+
+Usage:
+    python src/replay.py replays/*.replay.gz
+"""
+import gzip
+import hashlib
+import json
+import time
+
+from simulation import Simulation, SimulationInput
+
+# Bumped whenever the recording layout changes
+REPLAY_VERSION = 1
+
+# Log entry kinds
+ENTRY_INPUT = 'input'
+ENTRY_NEXT_LEVEL = 'next_level'
+
+
+def state_digest(simulation):
+    """
+    Fingerprint the gameplay state of a simulation.
+
+    Two runs that stayed in sync produce the same digest, so comparing the
+    digest stored in a recording with the replayed one detects desyncs and
+    behaviour changes.
+
+    Args:
+        simulation (Simulation): The simulation to fingerprint
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha1()
+    digest.update(repr((
+        simulation.tick_count,
+        simulation.level_index,
+        [(p.position, p.charge_level, p.is_casting, p.is_attuned) for p in simulation.players],
+        simulation.spell_circle.elements,
+        simulation.spell_circle.active_spell,
+        [level.is_completed for level in simulation.levels],
+    )).encode())
+
+    # Enemy state of the current level, straight from the arrays
+    enemies = simulation.current_level.enemies
+    for field in enemies.FIELDS:
+        digest.update(enemies.live(field).tobytes())
+    return digest.hexdigest()
+
+
+class ReplayRecorder:
+    """
+    Records the inputs fed to a Simulation so the session can be replayed.
+
+    Call record_step() with the inputs right before every Simulation.step()
+    and record_next_level() whenever Simulation.next_level() is called.
+
+    Attributes:
+        simulation (Simulation): The simulation being recorded
+        seed (int): Seed of the recorded simulation
+        level_index (int): Level the recording starts on
+        entries (list): [tick, kind, data] log entries in the order they happened
+    """
+
+    def __init__(self, simulation):
+        """
+        Start recording a simulation.
+
+        Args:
+            simulation (Simulation): The simulation to record (normally freshly created)
+        """
+        self.simulation = simulation
+        self.seed = simulation.seed
+        self.level_index = simulation.level_index
+        self.start_tick = simulation.tick_count
+        self.entries = []
+        self._last_target = None
+
+    def record_step(self, inputs):
+        """
+        Record the inputs for the tick about to be stepped.
+
+        Ticks without transitions or a new target are not stored at all, which
+        keeps recordings small (most ticks have no input changes).
+
+        Args:
+            inputs (SimulationInput): Inputs about to be passed to Simulation.step()
+        """
+        target = inputs.target_position
+        if target is not None:
+            target = list(target)
+            if target == self._last_target:
+                target = None
+            else:
+                self._last_target = target
+
+        if inputs.transitions or target is not None:
+            transitions = [[player_index, action, arg, is_down]
+                           for (player_index, action, arg), is_down in inputs.transitions]
+            self.entries.append([self.simulation.tick_count, ENTRY_INPUT, [transitions, target]])
+
+    def record_next_level(self):
+        """Record that the simulation advanced to the next level."""
+        self.entries.append([self.simulation.tick_count, ENTRY_NEXT_LEVEL, None])
+
+    def to_dict(self):
+        """
+        Get the recording as a JSON-serializable dict.
+
+        Returns:
+            dict: The recording, including the final state digest
+        """
+        return {
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'level_index': self.level_index,
+            'start_tick': self.start_tick,
+            'ticks': self.simulation.tick_count - self.start_tick,
+            'entries': self.entries,
+            'digest': state_digest(self.simulation),
+        }
+
+    def save(self, path):
+        """
+        Write the recording as gzip-compressed JSON.
+
+        Args:
+            path (str): File to write
+        """
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+
+def load_replay(path):
+    """
+    Read a recording written by ReplayRecorder.save().
+
+    Args:
+        path (str): File to read
+
+    Returns:
+        dict: The recording
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        recording = json.load(f)
+    if recording.get('version') != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {recording.get('version')} in {path}")
+    return recording
+
+
+def replay(recording, ticks=None):
+    """
+    Re-run a recorded session headless.
+
+    Args:
+        recording (dict): Recording from load_replay() or ReplayRecorder.to_dict()
+        ticks (int, optional): Stop after this many ticks (defaults to the whole recording)
+
+    Returns:
+        Simulation: The simulation after replaying
+    """
+    simulation = Simulation(seed=recording['seed'])
+    simulation.level_index = recording['level_index']
+    simulation.tick_count = recording.get('start_tick', 0)
+
+    total = recording['ticks'] if ticks is None else min(ticks, recording['ticks'])
+    entries = recording['entries']
+    next_entry = 0
+    empty = SimulationInput()
+
+    for _ in range(total):
+        tick = simulation.tick_count
+        inputs = empty
+
+        # Apply everything that happened before this tick was stepped
+        while next_entry < len(entries) and entries[next_entry][0] == tick:
+            _, kind, data = entries[next_entry]
+            next_entry += 1
+            if kind == ENTRY_NEXT_LEVEL:
+                simulation.next_level()
+            elif kind == ENTRY_INPUT:
+                transitions, target = data
+                inputs = SimulationInput()
+                inputs.transitions = [((player_index, action, arg), is_down)
+                                      for player_index, action, arg, is_down in transitions]
+                if target is not None:
+                    inputs.target_position = tuple(target)
+
+        simulation.step(inputs)
+
+    # A level advance after the last tick (e.g. right before quitting)
+    while next_entry < len(entries) and entries[next_entry][1] == ENTRY_NEXT_LEVEL:
+        simulation.next_level()
+        next_entry += 1
+
+    return simulation
+
+
+def verify_replay(path):
+    """
+    Replay a recording and check that it ends in the recorded state.
+
+    Args:
+        path (str): Recording file
+
+    Returns:
+        tuple: (matches, ticks, seconds) - whether the digests match, ticks replayed and time taken
+    """
+    recording = load_replay(path)
+    start = time.perf_counter()
+    simulation = replay(recording)
+    elapsed = time.perf_counter() - start
+    return state_digest(simulation) == recording['digest'], recording['ticks'], elapsed
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Replay recorded sessions headless and check them for desyncs.")
+    parser.add_argument("paths", nargs="+", help="recording files")
+    args = parser.parse_args()
+
+    mismatches = 0
+    for path in args.paths:
+        matches, ticks, elapsed = verify_replay(path)
+        if not matches:
+            mismatches += 1
+        speedup = ticks / max(elapsed, 1e-9) / 60
+        print(f"{'OK  ' if matches else 'DIFF'} {path}: {ticks} ticks in {elapsed:.2f}s ({speedup:.0f}x real time)")
+
+    if mismatches:
+        print(f"{mismatches} of {len(args.paths)} replays diverged from their recording")
+        sys.exit(1)
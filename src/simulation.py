@@ -0,0 +1,328 @@
+"""
+Headless, fixed-timestep game simulation.
+
+The Simulation object owns the wizards, the spell circle and the levels and
+advances them one fixed tick at a time through step(). It never touches the
+display or the mixer, so it can be driven by main.py, by bots or by soak tests
+on machines without a window server.
+"""
+import itertools
+import random
+import time
+
+from game import Player, SpellCircle, create_levels, GameProgress
+import tracing
+
+# Playfield dimensions
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+
+# Fixed simulation rate - all game timers are expressed in ticks at this rate
+TICK_RATE = 60
+TICK_SECONDS = 1.0 / TICK_RATE
+
+# Default wizard line-up: (element, starting position, color)
+DEFAULT_WIZARDS = [
+    ("Fire", (100, 100), (255, 0, 0)),    # Red
+    ("Water", (200, 100), (0, 0, 255)),   # Blue
+    ("Earth", (300, 100), (0, 255, 0)),   # Green
+]
+
+# Player actions understood by the simulation
+ACTION_CAST = 'cast'       # arg: element being charged
+ACTION_ATTUNE = 'attune'   # arg: None
+ACTION_MOVE = 'move'       # arg: 'up', 'down', 'left' or 'right'
+
+
+class SimulationInput:
+    """
+    Input collected for the next simulation tick.
+
+    Inputs are recorded as press/release transitions rather than a snapshot of
+    held keys, so a key tapped and released between two ticks still counts.
+
+    Attributes:
+        transitions (list): List of ((player_index, action, arg), is_down) tuples in arrival order
+        target_position (tuple): Spell target (mouse) position, or None if unchanged
+    """
+
+    def __init__(self):
+        """Initialize an empty input frame."""
+        self.transitions = []
+        self.target_position = None
+
+    def press(self, player_index, action, arg=None):
+        """
+        Record that a player started an action.
+
+        Args:
+            player_index (int): Index of the player in Simulation.players
+            action (str): ACTION_CAST, ACTION_ATTUNE or ACTION_MOVE
+            arg: Element for casts, direction for movement, None for attunement
+        """
+        self.transitions.append(((player_index, action, arg), True))
+
+    def release(self, player_index, action, arg=None):
+        """
+        Record that a player stopped an action.
+
+        Args:
+            player_index (int): Index of the player in Simulation.players
+            action (str): ACTION_CAST, ACTION_ATTUNE or ACTION_MOVE
+            arg: Element for casts, direction for movement, None for attunement
+        """
+        self.transitions.append(((player_index, action, arg), False))
+
+    def clear(self):
+        """Forget all recorded transitions (call after they were stepped)."""
+        self.transitions = []
+        self.target_position = None
+
+
+class Simulation:
+    """
+    Runs the game rules one fixed tick at a time, without any rendering.
+
+    Attributes:
+        game_progress (GameProgress): Unlocked spells and completed levels
+        players (list): Player objects, indexed by the player_index used in inputs
+        spell_circle (SpellCircle): The shared spell circle
+        levels (list): Level objects
+        level_index (int): Index of the level being played
+        tick_count (int): Number of ticks simulated so far
+        held (set): (player_index, action, arg) tuples currently held down
+        width (int): Playfield width
+        height (int): Playfield height
+        seed (int): Seed the level random number generators were derived from
+    """
+
+    def __init__(self, wizards=None, levels=None, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, seed=None):
+        """
+        Initialize a new simulation.
+
+        Args:
+            wizards (list, optional): (element, position, color) tuples, defaults to DEFAULT_WIZARDS
+            levels (list, optional): Level objects, defaults to create_levels()
+            width (int): Playfield width
+            height (int): Playfield height
+            seed (int, optional): Seed for all level randomness (a random seed if not given)
+        """
+        self.game_progress = GameProgress()
+        self.players = [Player(element, position, color)
+                        for element, position, color in (wizards or DEFAULT_WIZARDS)]
+        self.spell_circle = SpellCircle(self.game_progress)
+        self.levels = levels if levels is not None else create_levels()
+        self.level_index = 0
+        self.tick_count = 0
+        self.held = set()
+        self.width = width
+        self.height = height
+
+        # Give every level its own generator derived from one seed, so a run can be replayed exactly
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        seeder = random.Random(self.seed)
+        for level in self.levels:
+            level.rng = random.Random(seeder.getrandbits(64))
+
+    @property
+    def current_level(self):
+        """The Level currently being played."""
+        return self.levels[self.level_index]
+
+    def next_level(self):
+        """Advance to the next level (wrapping around) with a fresh spell circle."""
+        self.level_index = (self.level_index + 1) % len(self.levels)
+
+        # Reset spell circle to clear any active spells
+        self.spell_circle = SpellCircle(self.game_progress)
+
+    def step(self, inputs=None):
+        """
+        Advance the simulation by exactly one tick.
+
+        Args:
+            inputs (SimulationInput, optional): Transitions since the previous tick
+
+        Returns:
+            list: Events produced this tick, as (event_type, data) tuples:
+                ('cast_started', (player_index, element))
+                ('element_cast', (player_index, element, charge_level))
+                ('spell', (spell_name, spell_power, target_position))
+                ('level_complete', level_index)
+                ('spell_unlocked', spell_name)
+        """
+        events = []
+        level = self.current_level
+
+        if inputs is not None:
+            tracing.begin('Simulation.apply_inputs')
+            for action, is_down in inputs.transitions:
+                self._apply_transition(action, is_down, events)
+            if inputs.target_position is not None:
+                self.spell_circle.set_target_position(inputs.target_position)
+            tracing.end()
+
+        # Make sure players are assigned to the level
+        level.players = self.players
+
+        # Attune every pair of wizards that are both holding their attunement key
+        attuning = [i for i in range(len(self.players)) if (i, ACTION_ATTUNE, None) in self.held]
+        for a, b in itertools.combinations(attuning, 2):
+            self.players[a].attune_with(id(self.players[b]))
+            self.players[b].attune_with(id(self.players[a]))
+
+        # Update all wizards, reverting moves into walls and keeping them on screen
+        for player in self.players:
+            tracing.begin('Player.update')
+            player.update()
+            tracing.end()
+
+            tracing.begin('collision_revert')
+            if level.is_position_blocked(player.position, player.size):
+                player.position = player.prev_position
+            player.keep_in_bounds(self.width, self.height)
+            tracing.end()
+
+        # Update the spell circle
+        tracing.begin('SpellCircle.update')
+        spell_result = self.spell_circle.update()
+        tracing.end()
+        was_completed = level.is_completed
+
+        # If a spell was activated, apply its effect to the level
+        if spell_result:
+            spell_name, spell_power, target_position = spell_result
+            events.append(('spell', spell_result))
+            tracing.begin('Level.apply_spell')
+            level.apply_spell(spell_name, spell_power, target_position)
+            tracing.end()
+
+        # Advance timers, spawns and enemies every tick, cast or not
+        tracing.begin('Level.tick')
+        level.tick()
+        tracing.end()
+
+        if level.is_completed and not was_completed:
+            events.append(('level_complete', self.level_index))
+
+            # Update game progress
+            if self.game_progress.complete_level(self.level_index):
+                # Report the newly unlocked spell for notification
+                events.append(('spell_unlocked', self.game_progress.get_new_unlocks()[0]))
+
+        self.tick_count += 1
+        return events
+
+    def _apply_transition(self, action, is_down, events):
+        """
+        Apply a single press or release to the matching player.
+
+        Args:
+            action (tuple): (player_index, action, arg)
+            is_down (bool): True for a press, False for a release
+            events (list): Event list to append to
+        """
+        player_index, kind, arg = action
+        if player_index >= len(self.players):
+            return
+        player = self.players[player_index]
+
+        if is_down:
+            if action in self.held:
+                return
+            self.held.add(action)
+
+            if kind == ACTION_CAST:
+                player.start_cast(arg)
+                events.append(('cast_started', (player_index, arg)))
+            elif kind == ACTION_ATTUNE:
+                player.start_attunement()
+            elif kind == ACTION_MOVE:
+                player.set_velocity(arg, True)
+        else:
+            # Releases only count for actions that were actually held
+            if action not in self.held:
+                return
+            self.held.discard(action)
+
+            if kind == ACTION_CAST:
+                charge_level = player.stop_cast()
+                self.spell_circle.add_element(arg, charge_level, wizard_id=id(player))
+                events.append(('element_cast', (player_index, arg, charge_level)))
+            elif kind == ACTION_ATTUNE:
+                player.stop_attunement()
+            elif kind == ACTION_MOVE:
+                player.set_velocity(arg, False)
+
+
+def random_inputs(simulation, rng, change_chance=0.05):
+    """
+    Generate bot inputs that press and release random actions.
+
+    Args:
+        simulation (Simulation): Simulation the inputs are meant for
+        rng (random.Random): Random number generator
+        change_chance (float): Chance per player per tick of toggling an action
+
+    Returns:
+        SimulationInput: Inputs for the next tick
+    """
+    inputs = SimulationInput()
+    for player_index in range(len(simulation.players)):
+        if rng.random() >= change_chance:
+            continue
+        kind = rng.choice((ACTION_CAST, ACTION_MOVE, ACTION_MOVE, ACTION_ATTUNE))
+        if kind == ACTION_CAST:
+            arg = rng.choice(("Fire", "Water", "Earth", "Air"))
+        elif kind == ACTION_MOVE:
+            arg = rng.choice(('up', 'down', 'left', 'right'))
+        else:
+            arg = None
+        action = (player_index, kind, arg)
+        if action in simulation.held:
+            inputs.release(*action)
+        else:
+            inputs.press(*action)
+    inputs.target_position = (rng.randint(0, simulation.width), rng.randint(0, simulation.height))
+    return inputs
+
+
+def run_headless(ticks, level_index=0, seed=None):
+    """
+    Run a bot-driven simulation without a display and report its speed.
+
+    Args:
+        ticks (int): Number of ticks to simulate
+        level_index (int): Level to start on
+        seed (int, optional): Random seed for the bot and the level spawns
+
+    Returns:
+        Simulation: The simulation after running
+    """
+    rng = random.Random(seed)
+
+    simulation = Simulation(seed=seed)
+    simulation.level_index = level_index % len(simulation.levels)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for event_type, _ in simulation.step(random_inputs(simulation, rng)):
+            if event_type == 'level_complete':
+                simulation.next_level()
+    elapsed = time.perf_counter() - start
+
+    print(f"Simulated {ticks} ticks in {elapsed:.2f}s "
+          f"({ticks / max(elapsed, 1e-9):.0f} ticks/s, level {simulation.level_index + 1})")
+    return simulation
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the game simulation headless with a random bot.")
+    parser.add_argument("--ticks", type=int, default=60 * 60, help="number of ticks to simulate")
+    parser.add_argument("--level", type=int, default=0, help="index of the level to start on")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    args = parser.parse_args()
+
+    run_headless(args.ticks, args.level, args.seed)
@@ -0,0 +1,146 @@
+"""
+Uniform-grid spatial hash for axis-aligned rectangles.
+
+Used by Level to answer "what is near this rectangle?" without walking every
+level element, so collision queries cost O(nearby objects).
+"""
+
+
+class SpatialHash:
+    """
+    Buckets rectangles into square grid cells for fast overlap queries.
+
+    Items can be any object (Level indexes its slotted entity objects), and
+    they are tracked by identity (id(item)) rather than by hash or equality.
+
+    Attributes:
+        cell_size (int): Width and height of a grid cell in pixels
+        cells (dict): (cell_x, cell_y) -> list of items touching that cell
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        Initialize an empty spatial hash.
+
+        Args:
+            cell_size (int): Width and height of a grid cell in pixels
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self._entries = {}  # id(item) -> [item, (x, y, w, h), cell keys]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return id(item) in self._entries
+
+    def _cell_keys(self, x, y, w, h):
+        """
+        Get the keys of every cell a rectangle touches.
+
+        Args:
+            x, y (float): Top-left corner of the rectangle
+            w, h (float): Width and height of the rectangle
+
+        Returns:
+            list: (cell_x, cell_y) tuples
+        """
+        cell_size = self.cell_size
+        x0, y0 = int(x // cell_size), int(y // cell_size)
+        x1, y1 = int((x + w) // cell_size), int((y + h) // cell_size)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def insert(self, item, x, y, w, h):
+        """
+        Add an item covering the given rectangle.
+
+        Args:
+            item: The object to index
+            x, y (float): Top-left corner of the item
+            w, h (float): Width and height of the item
+        """
+        if id(item) in self._entries:
+            self.move(item, x, y, w, h)
+            return
+
+        keys = self._cell_keys(x, y, w, h)
+        for key in keys:
+            self.cells.setdefault(key, []).append(item)
+        self._entries[id(item)] = [item, (x, y, w, h), keys]
+
+    def remove(self, item):
+        """
+        Remove an item from the index (no-op if it is not indexed).
+
+        Args:
+            item: The object to remove
+        """
+        entry = self._entries.pop(id(item), None)
+        if entry is None:
+            return
+
+        for key in entry[2]:
+            bucket = self.cells[key]
+            bucket.remove(item)
+            if not bucket:
+                del self.cells[key]
+
+    def move(self, item, x, y, w, h):
+        """
+        Update the rectangle of an indexed item, re-bucketing it only if it changed cells.
+
+        Args:
+            item: The object that moved
+            x, y (float): New top-left corner of the item
+            w, h (float): New width and height of the item
+        """
+        entry = self._entries.get(id(item))
+        if entry is None:
+            self.insert(item, x, y, w, h)
+            return
+
+        keys = self._cell_keys(x, y, w, h)
+        if keys != entry[2]:
+            self.remove(item)
+            self.insert(item, x, y, w, h)
+        else:
+            entry[1] = (x, y, w, h)
+
+    def query(self, x, y, w, h):
+        """
+        Find every indexed item whose rectangle overlaps the given one.
+
+        Args:
+            x, y (float): Top-left corner of the query rectangle
+            w, h (float): Width and height of the query rectangle
+
+        Returns:
+            list: Overlapping items, each listed once
+        """
+        found = []
+        seen = set()
+        entries = self._entries
+        cells = self.cells
+
+        # Walk the covered cells, or only the filled ones if the rectangle covers more
+        cell_size = self.cell_size
+        x0, y0 = int(x // cell_size), int(y // cell_size)
+        x1, y1 = int((x + w) // cell_size), int((y + h) // cell_size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            keys = [key for key in cells if x0 <= key[0] <= x1 and y0 <= key[1] <= y1]
+        else:
+            keys = self._cell_keys(x, y, w, h)
+
+        for key in keys:
+            for item in cells.get(key, ()):
+                item_id = id(item)
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+
+                # Simple AABB collision check against the stored rectangle
+                x2, y2, w2, h2 = entries[item_id][1]
+                if x < x2 + w2 and x + w > x2 and y < y2 + h2 and y + h > y2:
+                    found.append(item)
+        return found
@@ -0,0 +1,166 @@
+"""
+Spell registry.
+
+Every spell is described once by a SpellDefinition: the multiset of elements
+that casts it, its power multiplier and the stats its effect uses. Spells are
+looked up in O(1) by a precomputed combination key, and Level dispatches the
+effect by name through Level.SPELL_EFFECTS, so new spells can be added with
+register_spell() without touching SpellCircle or Level.update.
+"""
+
+
+def combination_key(elements):
+    """
+    Build the lookup key for a multiset of elements.
+
+    Args:
+        elements (iterable): Element names, in any order, repeats allowed
+
+    Returns:
+        tuple: The elements sorted alphabetically
+    """
+    return tuple(sorted(elements))
+
+
+class SpellDefinition:
+    """
+    Describes a single spell.
+
+    Attributes:
+        name (str): Spell name
+        elements (tuple): Elements that combine into this spell
+        key (tuple): Precomputed combination key of the elements
+        power_multiplier (float): Multiplier applied to the average element charge
+        radius (float): Base area of effect radius (or size/distance for utility spells)
+        damage (float): Base damage
+        slow (float): Base speed reduction
+        min_speed (float): Lowest speed the slow can reduce an enemy to
+        duration (int): Base duration in ticks for lasting effects
+        effects (dict): Level type -> name of the effect in Level.SPELL_EFFECTS
+        overrides (dict): Level type -> dict of stats that differ on that level type
+    """
+
+    def __init__(self, name, elements, power_multiplier=1.0, radius=0, damage=0, slow=0,
+                 min_speed=0, duration=0, effects=None, overrides=None):
+        """
+        Initialize a spell definition.
+
+        Args:
+            name (str): Spell name
+            elements (iterable): Elements that combine into this spell
+            power_multiplier (float): Multiplier applied to the average element charge
+            radius (float): Base area of effect radius
+            damage (float): Base damage
+            slow (float): Base speed reduction
+            min_speed (float): Lowest speed the slow can reduce an enemy to
+            duration (int): Base duration in ticks for lasting effects
+            effects (dict, optional): Level type -> effect name
+            overrides (dict, optional): Level type -> dict of stat overrides
+        """
+        self.name = name
+        self.elements = tuple(elements)
+        self.key = combination_key(self.elements)
+        self.power_multiplier = power_multiplier
+        self.radius = radius
+        self.damage = damage
+        self.slow = slow
+        self.min_speed = min_speed
+        self.duration = duration
+        self.effects = effects or {}
+        self.overrides = overrides or {}
+
+    def params_for(self, level_type):
+        """
+        Get the effect stats to use on a level type.
+
+        Args:
+            level_type (str): 'puzzle', 'combat' or 'survival'
+
+        Returns:
+            dict: radius, damage, slow, min_speed and duration plus any overrides
+        """
+        params = {
+            'radius': self.radius,
+            'damage': self.damage,
+            'slow': self.slow,
+            'min_speed': self.min_speed,
+            'duration': self.duration,
+        }
+        params.update(self.overrides.get(level_type, {}))
+        return params
+
+
+# Spell name -> SpellDefinition
+SPELLS = {}
+
+# Combination key -> SpellDefinition
+SPELLS_BY_KEY = {}
+
+
+def register_spell(spell):
+    """
+    Add a spell to the registry (replacing any spell with the same name or elements).
+
+    Args:
+        spell (SpellDefinition): The spell to register
+    """
+    previous = SPELLS.pop(spell.name, None)
+    if previous is not None:
+        SPELLS_BY_KEY.pop(previous.key, None)
+    SPELLS[spell.name] = spell
+    SPELLS_BY_KEY[spell.key] = spell
+
+
+def find_spell(key):
+    """
+    Look up the spell cast by a combination of elements.
+
+    Args:
+        key (tuple): Combination key from combination_key()
+
+    Returns:
+        SpellDefinition or None: The matching spell, if any
+    """
+    return SPELLS_BY_KEY.get(key)
+
+
+# Two-element combinations
+register_spell(SpellDefinition('Lava', ('Fire', 'Earth'), radius=100, damage=2,
+                               effects={'combat': 'radial', 'survival': 'damage_all'},
+                               overrides={'survival': {'damage': 1}}))
+register_spell(SpellDefinition('Steam', ('Fire', 'Water'), radius=120, slow=0.4, min_speed=0.2,
+                               effects={'combat': 'radial', 'survival': 'set_speed'},
+                               overrides={'survival': {'speed': 0.5}}))
+register_spell(SpellDefinition('Mud', ('Water', 'Earth'), radius=110, damage=1, slow=0.3, min_speed=0.1,
+                               effects={'combat': 'radial'}))
+register_spell(SpellDefinition('Breeze', ('Air', 'Fire')))
+register_spell(SpellDefinition('Sandstorm', ('Air', 'Earth')))
+register_spell(SpellDefinition('Typhoon', ('Air', 'Water')))
+
+# Three-element combinations
+register_spell(SpellDefinition('Storm', ('Fire', 'Water', 'Earth'), radius=200, damage=5,
+                               effects={'combat': 'radial'}))
+register_spell(SpellDefinition('Inferno', ('Air', 'Fire', 'Water'), power_multiplier=1.8))
+register_spell(SpellDefinition('Tsunami', ('Air', 'Earth', 'Water'), power_multiplier=1.8))
+register_spell(SpellDefinition('Volcano', ('Air', 'Earth', 'Fire'), power_multiplier=1.8))
+
+# Four-element combination - ultimate spell with all elements
+register_spell(SpellDefinition('Cataclysm', ('Air', 'Earth', 'Fire', 'Water'), power_multiplier=2.0))
+
+# Multi-cast spells (same element twice or more)
+register_spell(SpellDefinition('Fireball', ('Fire', 'Fire'), power_multiplier=1.5, radius=150, damage=10,
+                               effects={'combat': 'explosion'}))
+register_spell(SpellDefinition('Tidal Wave', ('Water', 'Water'), power_multiplier=1.5, damage=5,
+                               effects={'combat': 'wave'},
+                               overrides={'combat': {'push': 20}}))
+register_spell(SpellDefinition('Earthquake', ('Earth', 'Earth'), power_multiplier=1.5, damage=3, duration=120,
+                               effects={'combat': 'quake'}))
+register_spell(SpellDefinition('Tornado', ('Air', 'Air'), power_multiplier=1.5, radius=120, damage=1,
+                               duration=180, effects={'combat': 'tornado'},
+                               overrides={'combat': {'pull': 5}}))
+register_spell(SpellDefinition('Teleport', ('Air', 'Fire', 'Fire'), radius=40, duration=0,
+                               effects={'combat': 'regroup', 'survival': 'scatter'},
+                               overrides={'survival': {'radius': 150, 'damage': 10}}))
+register_spell(SpellDefinition('Barrier', ('Water', 'Earth', 'Water'), radius=60, duration=300,
+                               effects={'combat': 'wall', 'survival': 'player_barriers'},
+                               overrides={'survival': {'radius': 80}}))
@@ -0,0 +1,329 @@
+"""
+Procedural sound synthesis with a disk cache.
+
+Every sound is described by a recipe, a small JSON-style dict of synthesis
+parameters, instead of a hand-written generator function:
+
+    {'freq': 440, 'duration': 0.2, 'volume': 0.5, 'attack': 0.05, 'release': 0.05}
+
+Tone recipe keys:
+    freq (float or list): Frequency in Hz, or [start, end] for a glide
+    duration (float): Length in seconds
+    volume (float): Peak amplitude of the fundamental, 0 to 1 (default 0.5)
+    harmonics (list): [multiple, relative amplitude] overtones added to the fundamental
+    tremolo (list): [rate in Hz, depth] amplitude wobble
+    attack, release (float): Linear fade in/out times in seconds
+
+A recipe with a 'notes' list instead plays those tone recipes back to back.
+
+Rendered buffers are cached on disk as 16-bit PCM under a hash of the recipe,
+so a sound is only synthesized again when its recipe (or SYNTH_VERSION)
+changes. make_sound() turns a recipe straight into a pygame Sound without
+going through WAV files, and SoundLoader renders a batch of recipes on worker
+threads so a slow first render never blocks the game loop.
+
+Every spell in the spell registry also gets its own sound, composed by
+spell_recipe() from the elements that cast it.
+
+Usage:
+    python src/synth.py    # render every game and spell sound into the cache
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from spells import SPELLS
+
+# Bumped whenever render() changes its output for the same recipe
+SYNTH_VERSION = 1
+
+# Default sample rate (matches the mixer's default)
+SAMPLE_RATE = 44100
+
+# Where rendered buffers are cached
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'sounds', 'cache')
+
+# Recipes for the game's sound effects (these reproduce the WAVs written by assets/generate_sounds.py)
+SOUND_RECIPES = {
+    'cast': {'freq': 440, 'duration': 0.2, 'volume': 0.5, 'attack': 0.05, 'release': 0.05},
+    'spell': {'freq': [880, 440], 'duration': 0.5, 'volume': 0.5, 'attack': 0.05, 'release': 0.05},
+    'menu': {'freq': 660, 'duration': 0.1, 'volume': 0.5, 'attack': 0.05, 'release': 0.05},
+    'level_complete': {'notes': [
+        {'freq': 440, 'duration': 0.15, 'volume': 0.5, 'attack': 0.02, 'release': 0.02},
+        {'freq': 554, 'duration': 0.15, 'volume': 0.5, 'attack': 0.02, 'release': 0.02},
+        {'freq': 660, 'duration': 0.15, 'volume': 0.5, 'attack': 0.02, 'release': 0.02},
+    ]},
+}
+
+# Voice of each element in spell sounds (tone recipes without a duration)
+ELEMENT_VOICES = {
+    'Fire': {'freq': 330, 'volume': 0.3, 'harmonics': [[2, 0.5], [3, 0.3]]},  # Bright and crackly
+    'Water': {'freq': [294, 262], 'volume': 0.35, 'tremolo': [6, 0.3]},  # Falling and rippling
+    'Earth': {'freq': 147, 'volume': 0.4, 'harmonics': [[2, 0.4]]},  # Low and heavy
+    'Air': {'freq': 392, 'volume': 0.3, 'harmonics': [[3, 0.2]], 'tremolo': [14, 0.5]},  # High and fluttering
+}
+
+# Each note of a spell sound is this many semitones above the previous one
+SPELL_NOTE_STEP = 4
+
+
+def render_tone(tone, sample_rate=SAMPLE_RATE):
+    """
+    Synthesize a single tone recipe.
+
+    Args:
+        tone (dict): Tone recipe
+        sample_rate (int): Samples per second
+
+    Returns:
+        numpy.ndarray: Float samples
+    """
+    n = int(sample_rate * tone['duration'])
+    t = np.linspace(0, tone['duration'], n, False)
+
+    # Fundamental, optionally gliding from one frequency to another
+    freq = tone['freq']
+    if isinstance(freq, (list, tuple)):
+        freq = np.linspace(freq[0], freq[1], n)
+    samples = np.sin(2 * np.pi * freq * t)
+
+    # Overtones
+    for multiple, amplitude in tone.get('harmonics', ()):
+        samples += amplitude * np.sin(2 * np.pi * freq * multiple * t)
+
+    samples *= tone.get('volume', 0.5)
+
+    # Tremolo
+    if 'tremolo' in tone:
+        rate, depth = tone['tremolo']
+        samples *= 1 + depth * np.sin(2 * np.pi * rate * t)
+
+    # Linear fade in/out (skipped if the tone is shorter than the fade)
+    attack = int(sample_rate * tone.get('attack', 0))
+    release = int(sample_rate * tone.get('release', 0))
+    if 0 < attack < n:
+        samples[:attack] *= np.linspace(0, 1, attack)
+    if 0 < release < n:
+        samples[-release:] *= np.linspace(1, 0, release)
+
+    return samples
+
+
+def render(recipe, sample_rate=SAMPLE_RATE):
+    """
+    Synthesize a recipe.
+
+    Args:
+        recipe (dict): Tone recipe, or a recipe with a 'notes' list of tone recipes
+        sample_rate (int): Samples per second
+
+    Returns:
+        numpy.ndarray: Float samples in [-1, 1]
+    """
+    if 'notes' in recipe:
+        samples = np.concatenate([render_tone(note, sample_rate) for note in recipe['notes']])
+    else:
+        samples = render_tone(recipe, sample_rate)
+    return np.clip(samples, -1, 1)
+
+
+def spell_recipe(spell):
+    """
+    Compose the sound of a spell from the elements that cast it.
+
+    Each element plays one note in its ELEMENT_VOICES voice, rising by
+    SPELL_NOTE_STEP semitones per note, and the last note rings longer the
+    more powerful the spell is. Different element combinations therefore
+    always sound different.
+
+    Args:
+        spell (SpellDefinition): The spell
+
+    Returns:
+        dict: Sound recipe
+    """
+    notes = []
+    for i, element in enumerate(spell.elements):
+        note = dict(ELEMENT_VOICES[element])
+        pitch = 2 ** (i * SPELL_NOTE_STEP / 12)
+        if isinstance(note['freq'], list):
+            note['freq'] = [round(freq * pitch, 2) for freq in note['freq']]
+        else:
+            note['freq'] = round(note['freq'] * pitch, 2)
+
+        last = i == len(spell.elements) - 1
+        note['duration'] = round(0.25 * spell.power_multiplier, 3) if last else 0.12
+        note['attack'] = 0.01
+        note['release'] = 0.15 if last else 0.03
+        notes.append(note)
+    return {'notes': notes}
+
+
+def spell_recipes():
+    """
+    Get the sound recipe of every registered spell.
+
+    Returns:
+        dict: Spell name -> sound recipe
+    """
+    return {name: spell_recipe(spell) for name, spell in SPELLS.items()}
+
+
+def recipe_key(recipe, sample_rate=SAMPLE_RATE):
+    """
+    Get the cache key of a recipe.
+
+    Args:
+        recipe (dict): Sound recipe
+        sample_rate (int): Samples per second
+
+    Returns:
+        str: Hex digest of the recipe, sample rate and SYNTH_VERSION
+    """
+    text = json.dumps([SYNTH_VERSION, sample_rate, recipe], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def render_cached(recipe, sample_rate=SAMPLE_RATE, cache_dir=CACHE_DIR):
+    """
+    Get a recipe's 16-bit PCM samples, rendering them only on a cache miss.
+
+    Args:
+        recipe (dict): Sound recipe
+        sample_rate (int): Samples per second
+        cache_dir (str): Directory of cached buffers
+
+    Returns:
+        numpy.ndarray: Mono int16 samples
+    """
+    path = os.path.join(cache_dir, recipe_key(recipe, sample_rate) + '.npy')
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass  # Not cached yet (or a damaged file) - render it
+
+    pcm = (render(recipe, sample_rate) * 32767).astype(np.int16)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write under a temporary name first so a reader never sees half a file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.save(f, pcm)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not cache sound {path}: {e}")
+    return pcm
+
+
+def pcm_to_sound(pcm):
+    """
+    Wrap mono 16-bit samples in a pygame Sound, duplicated to the mixer's channels.
+
+    Args:
+        pcm (numpy.ndarray): Mono int16 samples at the mixer's sample rate
+
+    Returns:
+        pygame.mixer.Sound: The sound
+    """
+    import pygame
+
+    channels = pygame.mixer.get_init()[2]
+    if channels > 1:
+        pcm = np.repeat(pcm[:, np.newaxis], channels, axis=1)
+    return pygame.sndarray.make_sound(pcm)
+
+
+def make_sound(recipe, cache_dir=CACHE_DIR):
+    """
+    Build a pygame Sound from a recipe, using the cache.
+
+    The sound is rendered at the mixer's sample rate, so the mixer must
+    already be initialized.
+
+    Args:
+        recipe (dict): Sound recipe
+        cache_dir (str): Directory of cached buffers
+
+    Returns:
+        pygame.mixer.Sound: The sound
+    """
+    import pygame
+
+    return pcm_to_sound(render_cached(recipe, pygame.mixer.get_init()[0], cache_dir))
+
+
+class SoundLoader:
+    """
+    Renders a batch of recipes on a thread pool and hands over finished sounds.
+
+    Rendering and cache reads happen on the worker threads (NumPy releases the
+    GIL for the heavy lifting); the pygame Sounds are created on the thread
+    that calls poll(), so the mixer is only touched from the game loop.
+
+    Attributes:
+        pending (dict): Sound name -> Future of its int16 samples
+        failed (dict): Sound name -> exception for sounds that could not be rendered
+    """
+
+    def __init__(self, recipes, max_workers=None, cache_dir=CACHE_DIR):
+        """
+        Start rendering. The mixer must already be initialized.
+
+        Args:
+            recipes (dict): Sound name -> recipe
+            max_workers (int, optional): Worker threads (defaults to the executor's default)
+            cache_dir (str): Directory of cached buffers
+        """
+        import pygame
+
+        sample_rate = pygame.mixer.get_init()[0]
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='synth')
+        self.pending = {name: self.executor.submit(render_cached, recipe, sample_rate, cache_dir)
+                        for name, recipe in recipes.items()}
+        self.failed = {}
+
+    @property
+    def done(self):
+        """True once every sound has been handed over (or has failed)."""
+        return not self.pending
+
+    def poll(self):
+        """
+        Collect the sounds that finished rendering since the last call.
+
+        Never blocks.
+
+        Returns:
+            dict: Sound name -> pygame Sound
+        """
+        finished = {}
+        for name, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[name]
+            try:
+                finished[name] = pcm_to_sound(future.result())
+            except Exception as e:
+                self.failed[name] = e
+                print(f"Could not build sound {name}: {e}")
+
+        if not self.pending:
+            self.executor.shutdown(wait=False)
+        return finished
+
+    def shutdown(self):
+        """Stop rendering, dropping any sounds that have not started yet."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
+
+
+if __name__ == "__main__":
+    for name, recipe in {**SOUND_RECIPES, **spell_recipes()}.items():
+        key = recipe_key(recipe)
+        cached = os.path.exists(os.path.join(CACHE_DIR, key + '.npy'))
+        samples = render_cached(recipe)
+        print(f"{'cached  ' if cached else 'rendered'} {name}: {len(samples)} samples ({key[:12]})")
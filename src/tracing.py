@@ -0,0 +1,274 @@
+"""
+Lightweight frame instrumentation.
+
+Code marks the phases worth measuring with span():
+
+    with tracing.span('level.tick'):
+        level.tick()
+
+While tracing is disabled (the default) span() returns one shared no-op
+context manager, so instrumented code costs a function call per phase. Code
+that runs many times per frame (the simulation tick) uses the begin()/end()
+pair instead, which skips the context manager protocol and costs about a
+third as much (~0.1 us) while disabled:
+
+    tracing.begin('Player.update')
+    player.update()
+    tracing.end()
+
+Once enable() is called, every finished span is written to a fixed-size ring
+buffer holding the most recent spans. The buffer can be saved at any time as
+Chrome trace-event JSON and opened in chrome://tracing or ui.perfetto.dev.
+"""
+import json
+import os
+import threading
+import time
+
+# Spans kept by default (about a minute of frames at 60 FPS with ~30 spans per frame)
+DEFAULT_CAPACITY = 100000
+
+
+class _NullSpan:
+    """Context manager that does nothing (used while tracing is disabled)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Context manager that times one phase and records it in a Tracer."""
+
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Tracer:
+    """
+    Fixed-size ring buffer of timed spans.
+
+    Spans live in preallocated parallel lists; once the buffer is full each
+    new span overwrites the oldest one, so memory stays constant however long
+    the game runs.
+
+    Attributes:
+        capacity (int): Most spans kept
+        count (int): Spans currently in the buffer
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Initialize an empty buffer.
+
+        Args:
+            capacity (int): Most spans kept
+        """
+        self.capacity = capacity
+        self.names = [None] * capacity
+        self.starts = [0] * capacity
+        self.ends = [0] * capacity
+        self.threads = [0] * capacity
+        self.next = 0
+        self.count = 0
+        self._open = []  # (name, start_ns) of begin() spans not yet ended
+
+    def span(self, name):
+        """
+        Get a context manager that records a span.
+
+        Args:
+            name (str): Phase name
+
+        Returns:
+            Context manager timing the enclosed block
+        """
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        """
+        Store a finished span, overwriting the oldest one if the buffer is full.
+
+        Args:
+            name (str): Phase name
+            start_ns (int): time.perf_counter_ns() when the phase started
+            end_ns (int): time.perf_counter_ns() when the phase ended
+        """
+        i = self.next
+        self.names[i] = name
+        self.starts[i] = start_ns
+        self.ends[i] = end_ns
+        self.threads[i] = threading.get_ident()
+        self.next = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def begin(self, name):
+        """
+        Start a span that the next end() call finishes.
+
+        Args:
+            name (str): Phase name
+        """
+        self._open.append((name, time.perf_counter_ns()))
+
+    def end(self):
+        """Finish the most recently begun span (no-op if there is none)."""
+        if self._open:
+            name, start = self._open.pop()
+            self.record(name, start, time.perf_counter_ns())
+
+    def clear(self):
+        """Drop every recorded span."""
+        self.next = 0
+        self.count = 0
+        self._open.clear()
+
+    def spans(self):
+        """
+        Get the recorded spans, oldest first.
+
+        Returns:
+            list: (name, start_ns, end_ns, thread_id) tuples
+        """
+        first = (self.next - self.count) % self.capacity
+        order = [(first + k) % self.capacity for k in range(self.count)]
+        return [(self.names[i], self.starts[i], self.ends[i], self.threads[i]) for i in order]
+
+    def to_chrome_trace(self):
+        """
+        Get the recorded spans as Chrome trace-event data.
+
+        Returns:
+            dict: {'traceEvents': [...]} with one complete ('X') event per span
+        """
+        spans = self.spans()
+        origin = min((start for _, start, _, _ in spans), default=0)
+        thread_ids = {}
+        events = []
+        for name, start, end, thread in spans:
+            tid = thread_ids.setdefault(thread, len(thread_ids) + 1)
+            events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': (start - origin) / 1000,  # Microseconds
+                'dur': (end - start) / 1000,
+                'pid': 1,
+                'tid': tid,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, path):
+        """
+        Write the recorded spans as a Chrome trace-event JSON file.
+
+        Args:
+            path (str): File to write
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f, separators=(',', ':'))
+
+
+# The active tracer (None while tracing is disabled)
+_tracer = None
+
+
+def enable(capacity=DEFAULT_CAPACITY):
+    """
+    Start recording spans (keeps the current buffer if tracing is already on).
+
+    Args:
+        capacity (int): Most spans kept
+
+    Returns:
+        Tracer: The active tracer
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(capacity)
+    return _tracer
+
+
+def disable():
+    """
+    Stop recording spans.
+
+    Returns:
+        Tracer or None: The tracer that was active, with its recorded spans
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_enabled():
+    """
+    Check whether spans are being recorded.
+
+    Returns:
+        bool: True while tracing is enabled
+    """
+    return _tracer is not None
+
+
+def get_tracer():
+    """
+    Get the active tracer.
+
+    Returns:
+        Tracer or None: The active tracer (None while tracing is disabled)
+    """
+    return _tracer
+
+
+def span(name):
+    """
+    Time a phase of the frame.
+
+    Args:
+        name (str): Phase name
+
+    Returns:
+        Context manager timing the enclosed block (a shared no-op while disabled)
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name)
+
+
+def begin(name):
+    """
+    Start timing a phase; end() finishes it. Cheaper than span() while disabled.
+
+    Args:
+        name (str): Phase name
+    """
+    if _tracer is not None:
+        _tracer.begin(name)
+
+
+def end():
+    """Finish the phase started by the matching begin()."""
+    if _tracer is not None:
+        _tracer.end()